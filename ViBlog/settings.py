@@ -12,7 +12,7 @@ https://docs.djangoproject.com/en/3.1/ref/settings/
 
 import os
 from pathlib import Path
-from decouple import config
+from decouple import config, Csv
 from dj_database_url import parse as dburl
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -23,7 +23,7 @@ BASE_DIR = Path(__file__).resolve().parent.parent
 # See https://docs.djangoproject.com/en/3.1/howto/deployment/checklist/
 
 SECRET_KEY = config('SECRET_KEY')
-DEBUG = config('DEBUG')
+DEBUG = config('DEBUG', cast=bool)
 
 ALLOWED_HOSTS = ['viblogapi.herokuapp.com', '127.0.0.1']
 
@@ -50,7 +50,19 @@ INSTALLED_APPS = [
     'blogs',
 ]
 
+# Benchmark suite and its run_benchmarks command, which seeds synthetic
+# data, left out of production unless BENCHMARKS is set
+
+BENCHMARKS = config('BENCHMARKS', default=DEBUG, cast=bool)
+
+if BENCHMARKS:
+    INSTALLED_APPS.append('benchmarks')
+
 MIDDLEWARE = [
+    'core.middleware.ServerTimingMiddleware',
+    'core.profiling.ProfilerMiddleware',
+    'core.compression.CompressionMiddleware',
+    'core.replicas.ReplicaMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -90,6 +102,144 @@ DATABASES = {
     'default': config('DATABASE_URL', default=default_dburl, cast=dburl)
 }
 
+# Read replicas, as comma separated database URLs, serving the reads of
+# the safe requests of clients which did not write in the last pin
+# seconds. Tests read the replicas from the test database of the primary.
+
+DATABASE_REPLICAS = []
+for number, replica_url in enumerate(
+        config('REPLICA_DATABASE_URLS', default='', cast=Csv()), 1):
+    DATABASES['replica%d' % number] = dict(
+        dburl(replica_url),
+        TEST={'MIRROR': 'default'}
+    )
+    DATABASE_REPLICAS.append('replica%d' % number)
+
+DATABASE_ROUTERS = ['core.replicas.ReplicaRouter']
+REPLICA_PIN_SECONDS = config('REPLICA_PIN_SECONDS', default=5, cast=int)
+
+
+# Cache
+# https://docs.djangoproject.com/en/3.1/topics/cache/
+
+CACHES = {
+    'default': {
+        'BACKEND': config(
+            'CACHE_BACKEND',
+            default='django.core.cache.backends.locmem.LocMemCache'
+        ),
+        'LOCATION': config('CACHE_LOCATION', default='viblog'),
+        'TIMEOUT': config('CACHE_TIMEOUT', default=300, cast=int),
+        'OPTIONS': {
+            'MAX_ENTRIES': config('CACHE_MAX_ENTRIES', default=10000, cast=int),
+        },
+    }
+}
+
+REST_FRAMEWORK = {
+    # JSON is encoded and decoded with orjson when it is installed
+    'DEFAULT_RENDERER_CLASSES': [
+        'core.renderers.JSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'core.parsers.JSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
+}
+
+# Sessions are read from the cache and only fall back to the database
+SESSION_ENGINE = 'django.contrib.sessions.backends.cached_db'
+
+# In-process token to user cache of the API token authentication
+TOKEN_CACHE_MAX_SIZE = config('TOKEN_CACHE_MAX_SIZE', default=10000, cast=int)
+TOKEN_CACHE_TTL = config('TOKEN_CACHE_TTL', default=60, cast=int)
+
+
+# Request timing headers and sampled request log lines
+
+SERVER_TIMING_HEADERS = config(
+    'SERVER_TIMING_HEADERS',
+    default=True,
+    cast=bool
+)
+SERVER_TIMING_LOG_SAMPLE_RATE = config(
+    'SERVER_TIMING_LOG_SAMPLE_RATE',
+    default=0.0,
+    cast=float
+)
+
+# Compression of the JSON responses, with Brotli when it is installed
+
+COMPRESSION_MIN_SIZE = config('COMPRESSION_MIN_SIZE', default=1024, cast=int)
+COMPRESSION_GZIP_LEVEL = config('COMPRESSION_GZIP_LEVEL', default=6, cast=int)
+COMPRESSION_BROTLI_QUALITY = config(
+    'COMPRESSION_BROTLI_QUALITY',
+    default=5,
+    cast=int
+)
+
+# Profiling of the requests carrying a staff profile token
+
+PROFILER_TOKEN_MAX_AGE = config(
+    'PROFILER_TOKEN_MAX_AGE',
+    default=3600,
+    cast=int
+)
+PROFILER_SAMPLE_INTERVAL = config(
+    'PROFILER_SAMPLE_INTERVAL',
+    default=0.002,
+    cast=float
+)
+PROFILER_RING_SIZE = config('PROFILER_RING_SIZE', default=50, cast=int)
+
+# Blogs trending scores: an event weighs half a new one after the half
+# life, in seconds, and the epoch is rebased by rebase_trending_scores
+
+TRENDING_HALF_LIFE = config(
+    'TRENDING_HALF_LIFE',
+    default=60 * 60 * 24,
+    cast=int
+)
+TRENDING_LIKE_WEIGHT = config('TRENDING_LIKE_WEIGHT', default=1.0, cast=float)
+TRENDING_COMMENT_WEIGHT = config(
+    'TRENDING_COMMENT_WEIGHT',
+    default=3.0,
+    cast=float
+)
+
+# Tag autocomplete index, kept per process and rebuilt after the max age
+# in seconds even when no tag changed, to refresh the usage counts
+
+TAG_AUTOCOMPLETE_INDEX = config(
+    'TAG_AUTOCOMPLETE_INDEX',
+    default=True,
+    cast=bool
+)
+TAG_AUTOCOMPLETE_MAX_AGE = config(
+    'TAG_AUTOCOMPLETE_MAX_AGE',
+    default=300,
+    cast=int
+)
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+        },
+    },
+    'loggers': {
+        'viblog.requests': {
+            'handlers': ['console'],
+            'level': 'INFO',
+            'propagate': False,
+        },
+    },
+}
+
 
 # Password validation
 # https://docs.djangoproject.com/en/3.1/ref/settings/#auth-password-validators
@@ -21,6 +21,11 @@ schema_view = get_schema_view(
 
 
 urlpatterns = [
+    path(
+        'admin/profiles/',
+        include("core.urls")
+    ),
+
     path(
         'admin/',
         admin.site.urls
@@ -31,6 +36,11 @@ urlpatterns = [
         include("users.urls")
     ),
 
+    path(
+        'api/async/',
+        include("blogs.async_urls")
+    ),
+
     path(
         'api/',
         include("blogs.urls")
@@ -0,0 +1,151 @@
+"""
+Concurrency of the blog detail read under a slow database.
+
+Every query is delayed by --latency seconds, and --requests concurrent
+reads of a blog are served by:
+
+* wsgi: the sync view under --workers gunicorn sync workers, each one
+  serving a request at a time;
+* asgi-sync: the sync view under ASGI, which Django runs in a single
+  thread;
+* asgi-async: the async view under ASGI, which waits on the database
+  from --threads worker threads.
+
+Every request has its own URL, so none is served by the response cache.
+Run it from the project root, it seeds a throwaway test database:
+
+    python -m benchmarks.async_reads --requests 50 --latency 0.02
+"""
+import argparse
+import asyncio
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+def seed():
+    """Create a blog and the token of its author, return them"""
+    from django.contrib.auth import get_user_model
+    from rest_framework.authtoken.models import Token
+
+    from blogs.models import Blog, Comment, Tag
+
+    user = get_user_model().objects.create_user(
+        username='benchmark',
+        password='benchmark'
+    )
+    token = Token.objects.create(user=user)
+    blog = Blog.objects.create(
+        author=user,
+        title='Benchmark blog',
+        content='Lorem ipsum dolor sit amet'
+    )
+    blog.tags.add(Tag.objects.create(content='benchmark'))
+    blog.likes.add(user)
+    Comment.objects.create(author=user, blog=blog, content='Benchmark')
+
+    return blog, 'Token ' + token.key
+
+
+def slow_database(latency):
+    """Delay every query of every database connection by latency"""
+    from django.db import connections
+    from django.db.backends.signals import connection_created
+
+    def slow_query(execute, sql, params, many, context):
+        time.sleep(latency)
+        return execute(sql, params, many, context)
+
+    def install(connection, **kwargs):
+        if slow_query not in connection.execute_wrappers:
+            connection.execute_wrappers.append(slow_query)
+
+    for connection in connections.all():
+        install(connection)
+    connection_created.connect(install, weak=False)
+
+
+def run_wsgi(url, auth, requests, workers):
+    """Send the requests to the WSGI handler from the sync workers"""
+    from django.test import Client
+
+    def get(i):
+        return Client().get(
+            '%s?r=%d' % (url, i),
+            HTTP_AUTHORIZATION=auth
+        ).status_code
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(get, range(requests)))
+
+
+def run_asgi(url, auth, requests, threads):
+    """Send the requests concurrently to the ASGI handler"""
+    from django.test import AsyncClient
+
+    headers = [(b'host', b'testserver'), (b'authorization', auth.encode())]
+
+    async def get(i):
+        response = await AsyncClient().get(
+            '%s?r=%d' % (url, i),
+            headers=headers
+        )
+        return response.status_code
+
+    async def main():
+        loop = asyncio.get_event_loop()
+        loop.set_default_executor(ThreadPoolExecutor(max_workers=threads))
+
+        return await asyncio.gather(*(get(i) for i in range(requests)))
+
+    return asyncio.run(main())
+
+
+def report(name, statuses, elapsed):
+    failed = len([status for status in statuses if status != 200])
+    print('%-12s %6d %10.3f %10.1f %8d' % (
+        name, len(statuses), elapsed, len(statuses) / elapsed, failed
+    ))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--requests', type=int, default=50)
+    parser.add_argument('--latency', type=float, default=0.02)
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--threads', type=int, default=32)
+    args = parser.parse_args()
+
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'ViBlog.settings')
+
+    import django
+    django.setup()
+
+    from django.urls import reverse
+
+    from benchmarks.database import throwaway_database
+
+    with throwaway_database():
+        blog, auth = seed()
+        slow_database(args.latency)
+
+        sync_url = reverse('blogs:blog-detail', args=[blog.slug])
+        async_url = reverse('blogs-async:blog-detail', args=[blog.slug])
+
+        print('%-12s %6s %10s %10s %8s' % (
+            'path', 'reqs', 'seconds', 'req/s', 'failed'
+        ))
+
+        runs = (
+            ('wsgi', run_wsgi, sync_url, args.workers),
+            ('asgi-sync', run_asgi, sync_url, args.threads),
+            ('asgi-async', run_asgi, async_url, args.threads),
+        )
+        for name, run, url, concurrency in runs:
+            start = time.perf_counter()
+            statuses = run(url, auth, args.requests, concurrency)
+            report(name, statuses, time.perf_counter() - start)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,95 @@
+"""
+CPU cost against bytes saved of the compression of blog list payloads.
+
+Every run renders --pages pages of --page-size blogs of --words words
+of content, shaped like the blog list payloads, then compresses them
+with gzip and, when it is installed, Brotli, at several levels, and
+reports the bytes saved, the time per page and the time per page of a
+cached response, whose compressed bytes are read from the cache:
+
+    python -m benchmarks.compression --pages 50 --page-size 20
+"""
+import argparse
+import os
+import random
+import time
+
+
+GZIP_LEVELS = (1, 6, 9)
+BROTLI_QUALITIES = (1, 5, 11)
+
+
+def timed(function, pages):
+    """Return the results of function on the pages and their duration"""
+    start = time.perf_counter()
+    results = [function(page) for page in pages]
+
+    return results, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--pages', type=int, default=50)
+    parser.add_argument('--page-size', type=int, default=20)
+    parser.add_argument('--words', type=int, default=500)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'ViBlog.settings')
+
+    import django
+    django.setup()
+
+    from benchmarks.renderers import blog_page
+    from core import compression
+    from core.renderers import JSONRenderer
+
+    rng = random.Random(args.seed)
+    renderer = JSONRenderer()
+    pages = [
+        renderer.render(blog_page(rng, args.page_size, args.words))
+        for _ in range(args.pages)
+    ]
+    size = sum(len(page) for page in pages)
+
+    runs = [('gzip', compression.gzip_compress, level)
+            for level in GZIP_LEVELS]
+    if compression.brotli is not None:
+        runs += [('br', compression.brotli_compress, quality)
+                 for quality in BROTLI_QUALITIES]
+
+    print('%d pages of %.1f KB on average' % (
+        len(pages), size / len(pages) / 1e3
+    ))
+    print('%-8s %5s %9s %8s %10s %10s %10s' % (
+        'encoding', 'level', 'KB/page', 'saved', 'ms/page', 'MB/s',
+        'hit ms'
+    ))
+    for name, compress, level in runs:
+        compressed, duration = timed(
+            lambda page: compress(page, level), pages
+        )
+        compressed_size = sum(len(page) for page in compressed)
+
+        # A cached response digests its content and reads the cache
+        for page in pages:
+            compression.compress(page, name, compress, level, 'benchmark')
+        _, hit_duration = timed(
+            lambda page: compression.compress(
+                page, name, compress, level, 'benchmark'
+            ),
+            pages
+        )
+
+        print('%-8s %5d %9.1f %7.1f%% %10.3f %10.1f %10.3f' % (
+            name, level,
+            compressed_size / len(pages) / 1e3,
+            100 * (1 - compressed_size / size),
+            duration * 1e3 / len(pages),
+            size / 1e6 / duration,
+            hit_duration * 1e3 / len(pages),
+        ))
+
+
+if __name__ == '__main__':
+    main()
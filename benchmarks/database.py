@@ -0,0 +1,20 @@
+from contextlib import contextmanager
+
+from django.db import connection
+from django.test.utils import setup_test_environment, teardown_test_environment
+
+
+@contextmanager
+def throwaway_database():
+    """Run the benchmark on a new test database, destroyed afterwards"""
+    setup_test_environment()
+    old_name = connection.creation.create_test_db(
+        verbosity=0,
+        serialize=False
+    )
+
+    try:
+        yield
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        teardown_test_environment()
@@ -0,0 +1,153 @@
+import json
+import subprocess
+from contextlib import nullcontext
+
+import django
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from benchmarks.database import throwaway_database
+from benchmarks.routes import SCENARIOS, Context, uncovered_routes
+from benchmarks.runner import run_scenario
+from benchmarks.seed import seed_dataset
+
+
+def _commit():
+    """Return the checked out git commit, if any"""
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', 'HEAD'],
+            capture_output=True,
+            check=True,
+            text=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+class Command(BaseCommand):
+    """Benchmark every API route on a seeded dataset"""
+    help = (
+        "Seed a dataset and benchmark every route of the blogs and users "
+        "APIs, writing their latency percentiles, query counts and "
+        "response sizes as JSON"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=100)
+        parser.add_argument('--blogs', type=int, default=1000)
+        parser.add_argument('--tags', type=int, default=50)
+        parser.add_argument('--comments', type=int, default=5000)
+        parser.add_argument(
+            '--likes-per-user',
+            type=int,
+            default=50,
+            help="Blogs and comments liked by every user",
+        )
+        parser.add_argument(
+            '--like-skew',
+            type=float,
+            default=1.1,
+            help="Zipf exponent of the likes over blogs and comments",
+        )
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument(
+            '--iterations',
+            type=int,
+            default=50,
+            help="Requests timed per route and method",
+        )
+        parser.add_argument(
+            '--route',
+            help="Only benchmark the routes whose name contains this",
+        )
+        parser.add_argument(
+            '--cold',
+            action='store_true',
+            help="Clear the cache before every request",
+        )
+        parser.add_argument(
+            '--output',
+            help="File to write the JSON results to, instead of stdout",
+        )
+        parser.add_argument(
+            '--in-place',
+            action='store_true',
+            help=(
+                "Seed the configured database instead of a throwaway "
+                "test database, only with DEBUG on or --confirm-in-place"
+            ),
+        )
+        parser.add_argument(
+            '--confirm-in-place',
+            action='store_true',
+            help="Allow --in-place to seed the database with DEBUG off",
+        )
+
+    def handle(self, *args, **options):
+        if (options['in_place'] and not settings.DEBUG
+                and not options['confirm_in_place']):
+            raise CommandError(
+                "--in-place seeds synthetic data into the configured "
+                "database, pass --confirm-in-place to do it with DEBUG off"
+            )
+
+        uncovered = uncovered_routes()
+        if uncovered:
+            raise CommandError(
+                "Routes without a benchmark scenario: %s" % ', '.join(
+                    sorted(uncovered)
+                )
+            )
+
+        dataset_params = {
+            key: options[key] for key in (
+                'users', 'blogs', 'tags', 'comments', 'likes_per_user',
+                'like_skew', 'seed',
+            )
+        }
+        scenarios = [
+            (route, method, build) for route, method, build in SCENARIOS
+            if options['route'] is None or options['route'] in route
+        ]
+
+        database = nullcontext() if options['in_place'] else (
+            throwaway_database()
+        )
+        with database:
+            ctx = Context(seed_dataset(**dataset_params))
+
+            results = {}
+            for route, method, build in scenarios:
+                key = '%s %s' % (route, method.upper())
+                results[key] = run_scenario(
+                    ctx, method, build, options['iterations'], options['cold']
+                )
+                if options['output']:
+                    self.stdout.write("%-36s p50 %8.2fms  p99 %8.2fms" % (
+                        key, results[key]['p50_ms'], results[key]['p99_ms']
+                    ))
+
+        report = json.dumps({
+            'meta': {
+                'commit': _commit(),
+                'django': django.get_version(),
+                'dataset': dataset_params,
+                'iterations': options['iterations'],
+                'cold': options['cold'],
+            },
+            'routes': results,
+        }, indent=2, sort_keys=True)
+
+        if options['output'] is None:
+            self.stdout.write(report)
+            return
+
+        with open(options['output'], 'w') as output:
+            output.write(report + '\n')
+
+        self.stdout.write(self.style.SUCCESS(
+            "Wrote the results of %d routes to %s" % (
+                len(results), options['output']
+            )
+        ))
@@ -0,0 +1,98 @@
+"""
+Render time of large blog list payloads, by DRF JSONRenderer and by the
+orjson renderer of the API.
+
+Every run renders --pages pages of --page-size blogs of --words words
+of content, shaped like the blog list payloads, and checks both renders
+are the same:
+
+    python -m benchmarks.renderers --pages 100 --page-size 100
+"""
+import argparse
+import os
+import random
+import time
+
+
+def blog_page(rng, page_size, words):
+    """Return a blog list payload of page_size blogs"""
+    from benchmarks.seed import WORDS
+
+    return {
+        'next': 'http://testserver/api/blogs/?cursor=eyJwIjpbXX0',
+        'previous': None,
+        'results': [
+            {
+                'id': i,
+                'created_at': 'November 03, 2020',
+                'title': ' '.join(rng.choice(WORDS) for _ in range(8)),
+                'content': ' '.join(rng.choice(WORDS) for _ in range(words)),
+                'slug': 'benchmark-blog-%d' % i,
+                'author': 'benchmark',
+                'likes_count': rng.randrange(1000),
+                'user_has_liked': rng.random() < 0.5,
+                'tags': rng.sample(range(50), 3),
+            }
+            for i in range(page_size)
+        ],
+    }
+
+
+def run(renderer, pages):
+    """Return the renders of the pages and their duration"""
+    start = time.perf_counter()
+    renders = [renderer.render(page, 'application/json') for page in pages]
+
+    return renders, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--pages', type=int, default=100)
+    parser.add_argument('--page-size', type=int, default=100)
+    parser.add_argument('--words', type=int, default=500)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'ViBlog.settings')
+
+    import django
+    django.setup()
+
+    from rest_framework.renderers import JSONRenderer
+
+    from core import renderers
+
+    if renderers.orjson is None:
+        parser.error('orjson is not installed')
+
+    rng = random.Random(args.seed)
+    pages = [
+        blog_page(rng, args.page_size, args.words)
+        for _ in range(args.pages)
+    ]
+
+    stdlib_renders, stdlib_time = min(
+        (run(JSONRenderer(), pages) for _ in range(args.repeat)),
+        key=lambda result: result[1]
+    )
+    orjson_renders, orjson_time = min(
+        (run(renderers.JSONRenderer(), pages) for _ in range(args.repeat)),
+        key=lambda result: result[1]
+    )
+    size = sum(len(render) for render in orjson_renders)
+
+    print('%-8s %8s %10s %10s' % ('renderer', 'MB', 'seconds', 'MB/s'))
+    for name, duration in (('stdlib', stdlib_time), ('orjson', orjson_time)):
+        print('%-8s %8.1f %10.3f %10.1f' % (
+            name, size / 1e6, duration, size / 1e6 / duration
+        ))
+    print('speedup %.1fx, same renders: %s' % (
+        stdlib_time / orjson_time,
+        'yes' if stdlib_renders == orjson_renders else 'NO'
+    ))
+
+
+if __name__ == '__main__':
+    main()
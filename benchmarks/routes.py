@@ -0,0 +1,321 @@
+"""
+Benchmark scenarios of every route of blogs/urls.py and users/urls.py.
+
+A scenario builds the i-th request of a route and method out of the
+dataset, after any setup it needs, such as creating the blog to delete,
+which is not timed.
+"""
+from collections import namedtuple
+from importlib import import_module
+
+from django.contrib.auth import get_user_model
+from django.urls import URLResolver, reverse
+
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from blogs.models import Blog, Comment
+from benchmarks.seed import BENCHMARK_USER, PASSWORD
+
+
+URLCONFS = ('blogs.urls', 'users.urls')
+
+Request = namedtuple('Request', 'client path data')
+
+SCENARIOS = []
+
+
+class Context:
+    """The dataset of a benchmark run and its API clients"""
+
+    def __init__(self, dataset):
+        self.dataset = dataset
+        self.anonymous = APIClient()
+        self.user = self.client_for(dataset.token)
+        self.admin = self.client_for(dataset.admin_token)
+
+    @staticmethod
+    def client_for(token):
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION='Token ' + token)
+
+        return client
+
+    @staticmethod
+    def pick(values, i):
+        return values[i % len(values)]
+
+    def other_blog(self, i):
+        """Create a blog of the admin, which the user has not commented"""
+        return Blog.objects.create(
+            author=self.dataset.admin,
+            title='Benchmark blog %d' % i,
+            content='Benchmark content'
+        )
+
+
+def url(route, *args):
+    return reverse(route, args=args)
+
+
+def scenario(route, method):
+    """Register the request builder of a route and method"""
+    def register(build):
+        SCENARIOS.append((route, method, build))
+        return build
+
+    return register
+
+
+def _patterns(patterns):
+    for pattern in patterns:
+        if isinstance(pattern, URLResolver):
+            yield from _patterns(pattern.url_patterns)
+        else:
+            yield pattern
+
+
+def route_names():
+    """Return the namespaced names of the benchmarked URL confs routes"""
+    names = set()
+
+    for urlconf in URLCONFS:
+        module = import_module(urlconf)
+        names.update(
+            '%s:%s' % (module.app_name, pattern.name)
+            for pattern in _patterns(module.urlpatterns)
+            if pattern.name
+        )
+
+    return names
+
+
+def uncovered_routes():
+    """Return the routes without any scenario"""
+    return route_names() - {route for route, _, _ in SCENARIOS}
+
+
+@scenario('users:user-create', 'post')
+def user_create(ctx, i):
+    return Request(ctx.anonymous, url('users:user-create'), {
+        'username': 'created%d' % i,
+        'password': PASSWORD,
+    })
+
+
+@scenario('users:user-login', 'post')
+def user_login(ctx, i):
+    return Request(APIClient(), url('users:user-login'), {
+        'username': BENCHMARK_USER,
+        'password': PASSWORD,
+    })
+
+
+@scenario('users:user-logout', 'post')
+def user_logout(ctx, i):
+    user, _ = get_user_model().objects.get_or_create(
+        username='benchmark-logout'
+    )
+    token, _ = Token.objects.get_or_create(user=user)
+
+    return Request(ctx.client_for(token.key), url('users:user-logout'), None)
+
+
+@scenario('users:user-me', 'get')
+def user_me(ctx, i):
+    return Request(ctx.user, url('users:user-me'), None)
+
+
+@scenario('users:user-me', 'patch')
+def user_me_update(ctx, i):
+    return Request(ctx.user, url('users:user-me'), {
+        'biography': 'Benchmark biography %d' % i,
+    })
+
+
+@scenario('users:user-token-cache', 'get')
+def user_token_cache(ctx, i):
+    return Request(ctx.admin, url('users:user-token-cache'), None)
+
+
+@scenario('blogs:api-root', 'get')
+def api_root(ctx, i):
+    return Request(ctx.user, url('blogs:api-root'), None)
+
+
+@scenario('blogs:tag-list', 'get')
+def tag_list(ctx, i):
+    return Request(ctx.user, url('blogs:tag-list'), None)
+
+
+@scenario('blogs:tag-list', 'post')
+def tag_create(ctx, i):
+    return Request(ctx.user, url('blogs:tag-list'), {
+        'content': 'created-tag-%d' % i,
+    })
+
+
+@scenario('blogs:tag-autocomplete', 'get')
+def tag_autocomplete(ctx, i):
+    return Request(ctx.user, url('blogs:tag-autocomplete'), {
+        'prefix': ctx.pick(ctx.dataset.tags, i)[:4],
+    })
+
+
+@scenario('blogs:blog-list', 'get')
+def blog_list(ctx, i):
+    return Request(ctx.user, url('blogs:blog-list'), None)
+
+
+@scenario('blogs:blog-list', 'post')
+def blog_create(ctx, i):
+    return Request(ctx.user, url('blogs:blog-list'), {
+        'title': 'Created blog %d' % i,
+        'content': 'Created content',
+        'tag_names': ctx.dataset.tags[:3],
+    })
+
+
+@scenario('blogs:blog-detail', 'get')
+def blog_detail(ctx, i):
+    slug = ctx.pick(ctx.dataset.blog_slugs, i)
+
+    return Request(ctx.user, url('blogs:blog-detail', slug), None)
+
+
+@scenario('blogs:blog-detail', 'put')
+def blog_update(ctx, i):
+    slug = ctx.pick(ctx.dataset.own_blog_slugs, i)
+
+    return Request(ctx.user, url('blogs:blog-detail', slug), {
+        'title': 'Updated blog %d' % i,
+        'content': 'Updated content',
+        'tags': [],
+    })
+
+
+@scenario('blogs:blog-detail', 'patch')
+def blog_partial_update(ctx, i):
+    slug = ctx.pick(ctx.dataset.own_blog_slugs, i)
+
+    return Request(ctx.user, url('blogs:blog-detail', slug), {
+        'content': 'Patched content %d' % i,
+    })
+
+
+@scenario('blogs:blog-detail', 'delete')
+def blog_delete(ctx, i):
+    blog = Blog.objects.create(
+        author=ctx.dataset.user,
+        title='Deleted blog %d' % i,
+        content='Deleted content'
+    )
+
+    return Request(ctx.user, url('blogs:blog-detail', blog.slug), None)
+
+
+@scenario('blogs:blog-me', 'get')
+def blog_me(ctx, i):
+    return Request(ctx.user, url('blogs:blog-me'), None)
+
+
+@scenario('blogs:blog-me-stats', 'get')
+def blog_me_stats(ctx, i):
+    return Request(ctx.user, url('blogs:blog-me-stats'), None)
+
+
+@scenario('blogs:blog-search', 'get')
+def blog_search(ctx, i):
+    return Request(ctx.user, url('blogs:blog-search'), {'q': 'django cache'})
+
+
+@scenario('blogs:blog-trending', 'get')
+def blog_trending(ctx, i):
+    return Request(ctx.user, url('blogs:blog-trending'), None)
+
+
+@scenario('blogs:blog-export', 'get')
+def blog_export(ctx, i):
+    return Request(ctx.admin, url('blogs:blog-export'), None)
+
+
+@scenario('blogs:blog-tags', 'get')
+def blog_tags(ctx, i):
+    slug = ctx.pick(ctx.dataset.blog_slugs, i)
+
+    return Request(ctx.user, url('blogs:blog-tags', slug), None)
+
+
+@scenario('blogs:blog-like', 'post')
+def blog_like(ctx, i):
+    blog_id = ctx.pick(ctx.dataset.blog_ids, i)
+
+    return Request(ctx.user, url('blogs:blog-like', blog_id), None)
+
+
+@scenario('blogs:blog-like', 'delete')
+def blog_unlike(ctx, i):
+    blog_id = ctx.pick(ctx.dataset.blog_ids, i)
+
+    return Request(ctx.user, url('blogs:blog-like', blog_id), None)
+
+
+@scenario('blogs:comment-create', 'post')
+def comment_create(ctx, i):
+    blog = ctx.other_blog(i)
+
+    return Request(ctx.user, url('blogs:comment-create', blog.slug), {
+        'content': 'Created comment %d' % i,
+    })
+
+
+@scenario('blogs:comment-list', 'get')
+def comment_list(ctx, i):
+    slug = ctx.pick(ctx.dataset.blog_slugs, i)
+
+    return Request(ctx.user, url('blogs:comment-list', slug), None)
+
+
+@scenario('blogs:comment-detail', 'get')
+def comment_detail(ctx, i):
+    comment_id = ctx.pick(ctx.dataset.comment_ids, i)
+
+    return Request(ctx.user, url('blogs:comment-detail', comment_id), None)
+
+
+def _own_comment(ctx, i):
+    return Comment.objects.create(
+        author=ctx.dataset.user,
+        blog=ctx.other_blog(i),
+        content='Own comment %d' % i
+    )
+
+
+@scenario('blogs:comment-detail', 'patch')
+def comment_update(ctx, i):
+    comment = _own_comment(ctx, i)
+
+    return Request(ctx.user, url('blogs:comment-detail', comment.id), {
+        'content': 'Patched comment %d' % i,
+    })
+
+
+@scenario('blogs:comment-detail', 'delete')
+def comment_delete(ctx, i):
+    comment = _own_comment(ctx, i)
+
+    return Request(ctx.user, url('blogs:comment-detail', comment.id), None)
+
+
+@scenario('blogs:comment-like', 'post')
+def comment_like(ctx, i):
+    comment_id = ctx.pick(ctx.dataset.comment_ids, i)
+
+    return Request(ctx.user, url('blogs:comment-like', comment_id), None)
+
+
+@scenario('blogs:comment-like', 'delete')
+def comment_unlike(ctx, i):
+    comment_id = ctx.pick(ctx.dataset.comment_ids, i)
+
+    return Request(ctx.user, url('blogs:comment-like', comment_id), None)
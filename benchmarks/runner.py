@@ -0,0 +1,71 @@
+import math
+import statistics
+import time
+from collections import Counter
+
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+def percentile(values, percent):
+    """Return the nearest-rank percentile of the values"""
+    ordered = sorted(values)
+    rank = max(math.ceil(percent / 100 * len(ordered)), 1)
+
+    return ordered[rank - 1]
+
+
+def _send(request, method):
+    """Send a request and return its status and response size"""
+    if method == 'get':
+        response = request.client.get(request.path, request.data)
+    else:
+        response = getattr(request.client, method)(
+            request.path, request.data, format='json'
+        )
+
+    if response.streaming:
+        size = sum(len(chunk) for chunk in response.streaming_content)
+    else:
+        size = len(response.content)
+
+    return response.status_code, size
+
+
+def run_scenario(ctx, method, build, iterations, cold=False):
+    """
+    Send the requests of a scenario, after a warm-up one, and return
+    their latency percentiles, query count, size and statuses
+    """
+    timings, queries, sizes = [], [], []
+    statuses = Counter()
+
+    for i in range(iterations + 1):
+        request = build(ctx, i)
+        if cold:
+            cache.clear()
+
+        with CaptureQueriesContext(connection) as captured:
+            start = time.perf_counter()
+            status, size = _send(request, method)
+            elapsed = time.perf_counter() - start
+
+        if i == 0:
+            continue
+
+        timings.append(elapsed * 1000)
+        queries.append(len(captured))
+        sizes.append(size)
+        statuses[str(status)] += 1
+
+    return {
+        'requests': iterations,
+        'statuses': dict(sorted(statuses.items())),
+        'p50_ms': round(percentile(timings, 50), 3),
+        'p95_ms': round(percentile(timings, 95), 3),
+        'p99_ms': round(percentile(timings, 99), 3),
+        'queries': statistics.median_low(queries),
+        'max_queries': max(queries),
+        'bytes': statistics.median_low(sizes),
+    }
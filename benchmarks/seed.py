@@ -0,0 +1,145 @@
+"""
+Seeded benchmark dataset.
+
+The rows are written with the bulk importer and are the same for the
+same seed: users, tags, blogs by random authors with a few tags each,
+comments, and likes skewed toward a few popular blogs and comments,
+with the popularity of the n-th one proportional to 1 / n ** like_skew.
+"""
+import random
+from collections import namedtuple
+
+from django.contrib.auth import get_user_model
+from django.db.models import Max
+
+from rest_framework.authtoken.models import Token
+
+from core.utils import generate_slug
+from blogs.importer import Importer
+from blogs.models import Tag, Blog, Comment
+
+
+BENCHMARK_USER = 'benchmark'
+BENCHMARK_ADMIN = 'benchmark-admin'
+PASSWORD = 'benchmark-password'
+
+WORDS = (
+    'django', 'python', 'api', 'cache', 'query', 'index', 'blog', 'tag',
+    'comment', 'like', 'latency', 'throughput', 'database', 'cursor',
+    'search', 'token', 'async', 'stream', 'batch', 'profile',
+)
+
+Dataset = namedtuple('Dataset', [
+    'user', 'admin', 'token', 'admin_token', 'blog_slugs', 'blog_ids',
+    'own_blog_slugs', 'comment_ids', 'tags',
+])
+
+
+def _text(rng, words):
+    return ' '.join(rng.choice(WORDS) for _ in range(words))
+
+
+def _skewed_weights(count, skew):
+    return [1 / (rank ** skew) for rank in range(1, count + 1)]
+
+
+def dataset_records(users=100, blogs=1000, tags=50, comments=5000,
+                    likes_per_user=50, like_skew=1.1, seed=0):
+    """Yield the (type, record) of the seeded dataset"""
+    rng = random.Random(seed)
+    # Slugs end in a random string out of the random module
+    random.seed(seed)
+
+    usernames = [BENCHMARK_USER] + ['user%d' % i for i in range(users - 1)]
+    tag_names = ['tag%d' % i for i in range(tags)]
+    first_comment_id = (
+        Comment.objects.aggregate(last=Max('id'))['last'] or 0
+    ) + 1
+
+    for username in usernames:
+        yield 'user', {'username': username}
+
+    for tag in tag_names:
+        yield 'tag', {'content': tag}
+
+    slugs = []
+    for i in range(blogs):
+        title = _text(rng, 5)
+        slugs.append(generate_slug(title))
+        # The benchmark user writes every tenth blog
+        yield 'blog', {
+            'slug': slugs[-1],
+            'author': BENCHMARK_USER if i % 10 == 0 else rng.choice(usernames),
+            'title': title,
+            'content': _text(rng, 200),
+            'tags': rng.sample(tag_names, min(3, tags)),
+        }
+
+    # Authors comment a blog once, the benchmark user never does so that
+    # it can comment every blog during the benchmark
+    commenters = usernames[1:]
+    commented = set()
+    comment_ids = []
+    for _ in range(comments):
+        blog, author = rng.choice(slugs), rng.choice(commenters)
+        if (blog, author) in commented:
+            continue
+
+        commented.add((blog, author))
+        comment_ids.append(first_comment_id + len(comment_ids))
+        yield 'comment', {
+            'id': comment_ids[-1],
+            'blog': blog,
+            'author': author,
+            'content': _text(rng, 30),
+        }
+
+    blog_weights = _skewed_weights(len(slugs), like_skew)
+    comment_weights = _skewed_weights(len(comment_ids), like_skew)
+    for username in usernames[1:]:
+        for blog in rng.choices(slugs, blog_weights, k=likes_per_user):
+            yield 'blog_like', {'blog': blog, 'user': username}
+
+        if comment_ids:
+            for comment in rng.choices(
+                comment_ids, comment_weights, k=likes_per_user
+            ):
+                yield 'comment_like', {'comment': comment, 'user': username}
+
+
+def seed_dataset(batch_size=1000, **params):
+    """Write the seeded dataset and return what the benchmarks refer to"""
+    importer = Importer(batch_size)
+    for record_type, record in dataset_records(**params):
+        importer.add(record_type, record)
+    importer.finish()
+
+    User = get_user_model()
+    user = User.objects.get(username=BENCHMARK_USER)
+    user.set_password(PASSWORD)
+    user.save()
+
+    admin = User.objects.create_superuser(
+        username=BENCHMARK_ADMIN,
+        password=PASSWORD
+    )
+
+    blogs = Blog.objects.order_by('id')
+
+    return Dataset(
+        user=user,
+        admin=admin,
+        token=Token.objects.create(user=user).key,
+        admin_token=Token.objects.create(user=admin).key,
+        blog_slugs=list(blogs.values_list('slug', flat=True)),
+        blog_ids=list(blogs.values_list('id', flat=True)),
+        own_blog_slugs=list(
+            blogs.filter(author=user).values_list('slug', flat=True)
+        ),
+        comment_ids=list(
+            Comment.objects.order_by('id').values_list('id', flat=True)
+        ),
+        tags=list(
+            Tag.objects.order_by('id').values_list('content', flat=True)
+        ),
+    )
@@ -0,0 +1,123 @@
+"""
+Serialization time of the list endpoints rows, by the model serializers
+and by the values() serializers standing for them.
+
+Every run reads --rows blogs or comments, as the list endpoints read a
+page, then serializes them, timing both apart, and checks both outputs
+are the same. Run it from the project root, it seeds a throwaway test
+database:
+
+    python -m benchmarks.serializers --rows 10000
+"""
+import argparse
+import os
+import time
+from types import SimpleNamespace
+
+
+def blogs(user):
+    from blogs.models import Blog
+
+    return Blog.objects.with_likes(user).order_by('-created_at', '-id')
+
+
+def comments(user):
+    from blogs.models import Comment
+
+    return Comment.objects.with_likes(user).order_by('-created_at', '-id')
+
+
+# The blog slug of the comments, taken from the URL by the list endpoint
+CONTEXT = {'view': SimpleNamespace(kwargs={'slug': 'benchmark-blog'})}
+
+
+def run_model(serializer_class, queryset):
+    """Return the model serializer output, read and serialization times"""
+    start = time.perf_counter()
+    instances = list(queryset.all())
+    read = time.perf_counter()
+    data = serializer_class(instances, many=True, context=CONTEXT).data
+
+    return data, read - start, time.perf_counter() - read
+
+
+def run_values(serializer_class, queryset):
+    """Return the values serializer output, read and serialization times"""
+    start = time.perf_counter()
+    rows = list(
+        queryset.prefetch_related(None).values(*serializer_class.lookups())
+    )
+    serializer = serializer_class(rows, context=CONTEXT)
+    serializer.prepare(rows)
+    read = time.perf_counter()
+    data = [serializer.to_representation(row) for row in rows]
+
+    return data, read - start, time.perf_counter() - read
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--rows', type=int, default=10000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'ViBlog.settings')
+
+    import django
+    django.setup()
+
+    from blogs.serializers import (
+        BlogSerializer,
+        MyBlogSerializer,
+        CommentSerializer
+    )
+    from blogs.fast_serializers import (
+        BlogValuesSerializer,
+        MyBlogValuesSerializer,
+        CommentValuesSerializer
+    )
+    from benchmarks.database import throwaway_database
+    from benchmarks.seed import seed_dataset
+
+    with throwaway_database():
+        dataset = seed_dataset(
+            users=100,
+            blogs=args.rows,
+            comments=args.rows,
+            likes_per_user=50
+        )
+
+        print('%-10s %6s %9s %9s %9s %9s %8s %5s' % (
+            'serializer', 'rows', 'model rd', 'model ser', 'values rd',
+            'value ser', 'speedup', 'same'
+        ))
+
+        runs = (
+            ('blog', BlogSerializer, BlogValuesSerializer, blogs),
+            ('my-blog', MyBlogSerializer, MyBlogValuesSerializer, blogs),
+            ('comment', CommentSerializer, CommentValuesSerializer, comments),
+        )
+        for name, model_class, values_class, queryset in runs:
+            queryset = queryset(dataset.user)
+
+            model_runs, values_runs = [], []
+            for _ in range(args.repeat):
+                model_runs.append(run_model(model_class, queryset))
+                values_runs.append(run_values(values_class, queryset))
+
+            model_data, model_read, model_serialize = min(
+                model_runs, key=lambda run: run[2]
+            )
+            values_data, values_read, values_serialize = min(
+                values_runs, key=lambda run: run[2]
+            )
+            print('%-10s %6d %9.3f %9.3f %9.3f %9.3f %7.1fx %5s' % (
+                name, len(values_data), model_read, model_serialize,
+                values_read, values_serialize,
+                model_serialize / values_serialize,
+                'yes' if model_data == values_data else 'NO'
+            ))
+
+
+if __name__ == '__main__':
+    main()
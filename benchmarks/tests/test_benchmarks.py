@@ -0,0 +1,70 @@
+import json
+from io import StringIO
+from unittest import skipUnless
+
+from django.apps import apps
+from django.test import TestCase
+from django.core.management import call_command
+from django.contrib.auth import get_user_model
+from django.core.management.base import CommandError
+
+from benchmarks.routes import uncovered_routes
+from benchmarks.runner import percentile
+
+
+class BenchmarksTest(TestCase):
+    """Test the seeded API benchmark suite"""
+
+    def test_every_route_has_a_scenario(self):
+        """Test every blogs and users route is benchmarked"""
+        self.assertEqual(uncovered_routes(), set())
+
+    def test_percentile(self):
+        """Test percentiles are taken by nearest rank"""
+        values = list(range(1, 101))
+
+        self.assertEqual(percentile(values, 50), 50)
+        self.assertEqual(percentile(values, 99), 99)
+        self.assertEqual(percentile([3.0], 95), 3.0)
+
+
+@skipUnless(
+    apps.is_installed('benchmarks'),
+    'the benchmarks app is only installed with DEBUG or BENCHMARKS'
+)
+class RunBenchmarksCommandTest(TestCase):
+    """Test the run_benchmarks command"""
+
+    def test_run_benchmarks(self):
+        """Test the command benchmarks every route successfully"""
+        out = StringIO()
+        call_command(
+            'run_benchmarks',
+            '--in-place',
+            '--confirm-in-place',
+            '--users', '5',
+            '--blogs', '10',
+            '--comments', '20',
+            '--likes-per-user', '3',
+            '--iterations', '2',
+            stdout=out
+        )
+
+        report = json.loads(out.getvalue())
+        blog_list = report['routes']['blogs:blog-list GET']
+
+        self.assertEqual(report['meta']['dataset']['blogs'], 10)
+        self.assertEqual(blog_list['requests'], 2)
+        for key in ('p50_ms', 'p95_ms', 'p99_ms', 'queries', 'bytes'):
+            self.assertIn(key, blog_list)
+
+        for route, result in report['routes'].items():
+            for status in result['statuses']:
+                self.assertLess(int(status), 400, route)
+
+    def test_in_place_confirmed(self):
+        """Test seeding the configured database needs DEBUG or confirming"""
+        with self.assertRaisesMessage(CommandError, '--confirm-in-place'):
+            call_command('run_benchmarks', '--in-place', stdout=StringIO())
+
+        self.assertEqual(get_user_model().objects.count(), 0)
@@ -0,0 +1,32 @@
+from django.urls import path
+
+from blogs import async_views as AsyncBlogViews
+
+
+app_name = 'blogs-async'
+
+urlpatterns = [
+    path(
+        'blogs/',
+        AsyncBlogViews.blog_list,
+        name='blog-list'
+    ),
+
+    path(
+        'blogs/<slug:slug>/',
+        AsyncBlogViews.blog_detail,
+        name='blog-detail'
+    ),
+
+    path(
+        'blogs/<slug:slug>/comments/',
+        AsyncBlogViews.comment_list,
+        name='comment-list'
+    ),
+
+    path(
+        'tags/blog/<slug:slug>/',
+        AsyncBlogViews.blog_tags,
+        name='blog-tags'
+    ),
+]
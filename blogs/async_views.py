@@ -0,0 +1,39 @@
+"""
+Async read views of blogs, comments and blog tags, for ASGI servers.
+
+Django 3.1 has no async ORM and DRF no async views, so every view awaits
+the sync DRF read view in a worker thread of its own. Under ASGI the
+sync views all share one thread and wait on the database one request at
+a time, while these ones wait concurrently, with the same
+authentication, permissions, caching and payloads. They only do as long
+as every middleware is async capable, as the ones of core are: a sync
+middleware makes Django run the whole chain in the thread of sync code.
+"""
+from blogs.views import BlogViewSet, CommentListAPIView, ListBlogTagsAPIView
+from core.asynchronous import database_sync_to_async
+
+
+def async_view(view):
+    """Return an async view serving a sync DRF view in a worker thread"""
+    def serve(request, *args, **kwargs):
+        response = view(request, *args, **kwargs)
+
+        if callable(getattr(response, 'render', None)):
+            response = response.render()
+
+        return response
+
+    serve = database_sync_to_async(serve)
+
+    async def async_wrapper(request, *args, **kwargs):
+        return await serve(request, *args, **kwargs)
+
+    async_wrapper.csrf_exempt = True
+
+    return async_wrapper
+
+
+blog_list = async_view(BlogViewSet.as_view({'get': 'list'}))
+blog_detail = async_view(BlogViewSet.as_view({'get': 'retrieve'}))
+comment_list = async_view(CommentListAPIView.as_view())
+blog_tags = async_view(ListBlogTagsAPIView.as_view())
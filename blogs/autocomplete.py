@@ -0,0 +1,159 @@
+"""
+Tag autocomplete out of a per-process prefix index.
+
+The index keeps the contents of every tag sorted, with their ids and the
+number of blogs tagged with them, so the tags starting with a prefix are
+a contiguous range found by bisection, ranked by that usage.
+
+It is built lazily, on the first search after it was invalidated or
+became older than TAG_AUTOCOMPLETE_MAX_AGE seconds, which is how stale
+the usage counts can get. It is versioned with a generation counter in
+the default cache, bumped when tags are saved, deleted or created by a
+bulk upsert. Only a cache shared by the processes, such as Memcached
+or Redis, makes every process drop its copy right away; with the
+per-process LocMem cache, the other processes see new and deleted tags
+after TAG_AUTOCOMPLETE_MAX_AGE. Searches made while another thread
+builds a new version are answered by the database, with a
+LIKE 'prefix%' query on an index of the contents.
+"""
+import heapq
+import threading
+import time
+from bisect import bisect_left
+
+from django.conf import settings
+from django.db import connections
+from django.db.models import Count
+
+from blogs.cache import bump_generation, get_generation
+from blogs.models import Tag
+
+
+GENERATION_KEY = 'blogs:tags:autocomplete'
+
+# Greater than the next character of any content starting with a prefix
+MAX_CHAR = '\U0010ffff'
+
+_index = None
+_lock = threading.Lock()
+
+
+def is_enabled():
+    return getattr(settings, 'TAG_AUTOCOMPLETE_INDEX', True)
+
+
+def max_age():
+    """Return the seconds after which the index is rebuilt anyway"""
+    return getattr(settings, 'TAG_AUTOCOMPLETE_MAX_AGE', 300)
+
+
+class TagIndex:
+    """Tag contents in code point order with their ids and usage"""
+
+    def __init__(self, version, rows):
+        self.version = version
+        self.built_at = time.monotonic()
+        self.contents = [content for content, _, _ in rows]
+        self.ids = [tag_id for _, tag_id, _ in rows]
+        self.usages = [usage for _, _, usage in rows]
+
+    @classmethod
+    def build(cls, version):
+        """Return the index of the tags in the database"""
+        rows = Tag.objects.annotate(
+            usage=Count('tag_blogs')
+        ).values_list('content', 'id', 'usage')
+
+        # Sorted here, the database collation may not be code point order
+        return cls(version, sorted(rows))
+
+    def is_current(self, version):
+        return self.version == version
+
+    def is_fresh(self, version):
+        return (
+            self.is_current(version)
+            and time.monotonic() - self.built_at < max_age()
+        )
+
+    def search(self, prefix, limit):
+        """Return the most used tags starting with the prefix"""
+        start = bisect_left(self.contents, prefix)
+        end = bisect_left(self.contents, prefix + MAX_CHAR, start)
+
+        # nlargest is stable, so equally used tags stay in content order
+        positions = heapq.nlargest(
+            limit,
+            range(start, end),
+            key=self.usages.__getitem__
+        )
+
+        return [
+            {
+                'id': self.ids[position],
+                'content': self.contents[position],
+                'blogs_count': self.usages[position],
+            }
+            for position in positions
+        ]
+
+
+def get_index():
+    """
+    Return the index of the current version, building it when needed,
+    or None while another thread is building it
+    """
+    global _index
+
+    version = get_generation(GENERATION_KEY)
+    index = _index
+    if index is not None and index.is_fresh(version):
+        return index
+
+    if not _lock.acquire(blocking=False):
+        # An index which is only old still has every tag
+        if index is not None and index.is_current(version):
+            return index
+        return None
+
+    try:
+        _index = TagIndex.build(version)
+        return _index
+    finally:
+        _lock.release()
+
+
+def invalidate():
+    """Drop the index of the processes sharing the cache"""
+    bump_generation(GENERATION_KEY)
+
+
+def search_database(prefix, limit):
+    """Return the most used tags starting with the prefix, by a query"""
+    tags = Tag.objects.filter(content__startswith=prefix)
+
+    if connections[tags.db].vendor == 'sqlite':
+        # LIKE is case-insensitive on SQLite, so it cannot use the binary
+        # index of the contents, a range of them can
+        tags = tags.filter(content__gte=prefix, content__lt=prefix + MAX_CHAR)
+
+    return list(
+        tags.annotate(
+            blogs_count=Count('tag_blogs')
+        ).order_by('-blogs_count', 'content').values(
+            'id', 'content', 'blogs_count'
+        )[:limit]
+    )
+
+
+def autocomplete(prefix, limit):
+    """Return the most used tags starting with the prefix"""
+    # Tags are saved lowercased
+    prefix = prefix.lower()
+
+    if is_enabled():
+        index = get_index()
+        if index is not None:
+            return index.search(prefix, limit)
+
+    return search_database(prefix, limit)
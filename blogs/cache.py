@@ -0,0 +1,158 @@
+import hashlib
+import random
+
+from django.core.cache import cache
+from django.db import transaction
+
+from rest_framework import status
+from rest_framework.response import Response
+
+from blogs.models import Blog
+from core.replicas import primary_reads
+
+
+GLOBAL_GENERATION_KEY = 'blogs:generation'
+BLOG_GENERATION_KEY = 'blogs:generation:%s'
+BLOG_SLUG_KEY = 'blogs:slug:%s'
+RESPONSE_KEY = 'blogs:response:%s:%s:%s'
+
+
+def _new_generation():
+    """
+    Return a random starting generation, so a counter evicted from the
+    cache never comes back to a value used by old entries
+    """
+    return random.getrandbits(48)
+
+
+def get_generation(key):
+    """Return the current value of a generation counter"""
+    generation = cache.get(key)
+
+    if generation is None:
+        cache.add(key, _new_generation(), None)
+        generation = cache.get(key)
+
+    return generation
+
+
+def _bump(keys):
+    for key in keys:
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, _new_generation(), None)
+
+
+def bump_generations(blog_ids=(), global_generation=False):
+    """
+    Invalidate the cached responses of the blogs and, optionally, of
+    every blog list, by bumping their generation counters.
+
+    The counters are bumped right away and again on commit, so a
+    response cached by a reader in between is not kept.
+    """
+    keys = [BLOG_GENERATION_KEY % blog_id for blog_id in blog_ids]
+    if global_generation:
+        keys.append(GLOBAL_GENERATION_KEY)
+
+    _bump(keys)
+    transaction.on_commit(lambda: _bump(keys))
+
+
+def bump_generation(key):
+    """
+    Invalidate whatever is versioned with the generation counter of the
+    key, right away and again on commit
+    """
+    _bump([key])
+    transaction.on_commit(lambda: _bump([key]))
+
+
+def blog_id_for_slug(slug):
+    """Return the id of the blog with the slug, which never changes"""
+    key = BLOG_SLUG_KEY % slug
+    blog_id = cache.get(key)
+
+    if blog_id is None:
+        blog_id = Blog.objects.filter(
+            slug=slug
+        ).values_list('id', flat=True).first()
+
+        if blog_id is not None:
+            cache.set(key, blog_id)
+
+    return blog_id
+
+
+def response_key(scope, request, blog_id=None):
+    """
+    Return the cache key of a response, versioned with the generation
+    of the blog when given or with the global one otherwise
+    """
+    if blog_id is None:
+        generation = get_generation(GLOBAL_GENERATION_KEY)
+    else:
+        generation = get_generation(BLOG_GENERATION_KEY % blog_id)
+
+    url = hashlib.md5(request.build_absolute_uri().encode()).hexdigest()
+
+    return RESPONSE_KEY % (scope, generation, url)
+
+
+def overlay_user_has_liked(payload, model, user):
+    """Set the user_has_liked of the requesting user on a cached payload"""
+    items = payload['results'] if 'results' in payload else [payload]
+    items = [item for item in items if 'user_has_liked' in item]
+    if not items:
+        return payload
+
+    field = model.likes.field
+
+    liked = set(
+        model.likes.through.objects.filter(**{
+            field.m2m_reverse_name(): user.pk,
+            '%s__in' % field.m2m_column_name(): [
+                item['id'] for item in items
+            ],
+        }).values_list(field.m2m_column_name(), flat=True)
+    )
+
+    for item in items:
+        item['user_has_liked'] = item['id'] in liked
+
+    return payload
+
+
+def cached_response(request, key, build, liked_model=None):
+    """
+    Return the cached payload of the key, or build the response and
+    cache its payload when it is successful.
+
+    The per-user user_has_liked of the liked_model items is overlaid on
+    every cache hit, so the cached payload can be shared by all users.
+    The response is marked with the key, under which the compression
+    middleware keeps its compressed bytes.
+
+    Responses are built from the primary, as a lagging replica would
+    cache rows older than the generation of the key.
+    """
+    payload = cache.get(key)
+
+    if payload is None:
+        with primary_reads():
+            response = build()
+
+        if response.status_code == status.HTTP_200_OK:
+            cache.set(key, response.data)
+            response.compression_cache_key = key
+
+        return response
+
+    if liked_model is not None:
+        overlay_user_has_liked(payload, liked_model, request.user)
+
+    response = Response(payload)
+    response.compression_cache_key = key
+
+    return response
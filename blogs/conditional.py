@@ -0,0 +1,71 @@
+from django.db.models import Count, Max
+
+from blogs.models import Blog, Comment
+from blogs.cache import (
+    GLOBAL_GENERATION_KEY,
+    BLOG_GENERATION_KEY,
+    blog_id_for_slug,
+    get_generation
+)
+
+
+def blog_list_validators(request, *args, **kwargs):
+    """
+    Return the blogs last modification time, read from the updated_at
+    index, and the generation of their cached responses, which creating,
+    deleting or liking any blog bumps, so no count of them is needed
+    """
+    modified_at = Blog.objects.aggregate(
+        modified_at=Max('updated_at')
+    )['modified_at']
+
+    return (
+        (modified_at, get_generation(GLOBAL_GENERATION_KEY)),
+        modified_at
+    )
+
+
+def blog_detail_validators(request, *args, **kwargs):
+    """
+    Return the blog id, last modification time and the generation of
+    its cached responses
+    """
+    blog = Blog.objects.filter(
+        slug=kwargs.get('slug')
+    ).values('id', 'updated_at').first()
+
+    if blog is None:
+        return None, None
+
+    return (
+        (
+            blog['id'],
+            blog['updated_at'],
+            get_generation(BLOG_GENERATION_KEY % blog['id']),
+        ),
+        blog['updated_at']
+    )
+
+
+def comment_list_validators(request, *args, **kwargs):
+    """
+    Return the blog comments count, last modification time and the
+    generation of the blog cached responses
+    """
+    slug = kwargs.get('slug')
+    aggregate = Comment.objects.filter(
+        blog__slug=slug
+    ).aggregate(
+        count=Count('id'),
+        modified_at=Max('updated_at')
+    )
+
+    blog_id = blog_id_for_slug(slug)
+    generation = None if blog_id is None else get_generation(
+        BLOG_GENERATION_KEY % blog_id
+    )
+
+    return (
+        (aggregate['count'], aggregate['modified_at'], generation),
+        aggregate['modified_at']
+    )
@@ -0,0 +1,79 @@
+"""
+Newline-delimited JSON export of the blogs with their tags and comments.
+
+Blogs are read with QuerySet.iterator(), which ignores prefetches, so
+the tags and comments of every chunk of blogs are prefetched by hand.
+Only one chunk is held in memory at a time, whatever the table size.
+"""
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Prefetch, prefetch_related_objects
+
+from blogs.models import Blog, Comment
+
+
+CHUNK_SIZE = 500
+
+
+def export_queryset():
+    """Return the blogs to export, oldest first"""
+    return Blog.objects.select_related('author').order_by('id')
+
+
+def iter_chunks(queryset, chunk_size=CHUNK_SIZE):
+    """Yield lists of chunk_size blogs with their tags and comments"""
+    comments = Prefetch(
+        'comments',
+        queryset=Comment.objects.select_related(
+            'author'
+        ).order_by('created_at', 'id')
+    )
+
+    chunk = []
+    for blog in queryset.iterator(chunk_size=chunk_size):
+        chunk.append(blog)
+
+        if len(chunk) == chunk_size:
+            prefetch_related_objects(chunk, 'tags', comments)
+            yield chunk
+            chunk = []
+
+    if chunk:
+        prefetch_related_objects(chunk, 'tags', comments)
+        yield chunk
+
+
+def blog_record(blog):
+    """Return the exported record of a blog with tags and comments"""
+    return {
+        'id': blog.id,
+        'slug': blog.slug,
+        'author': blog.author.username,
+        'created_at': blog.created_at,
+        'updated_at': blog.updated_at,
+        'title': blog.title,
+        'content': blog.content,
+        'likes_count': blog.likes_count,
+        'tags': [tag.content for tag in blog.tags.all()],
+        'comments': [
+            {
+                'id': comment.id,
+                'author': comment.author.username,
+                'created_at': comment.created_at,
+                'content': comment.content,
+                'likes_count': comment.likes_count,
+            }
+            for comment in blog.comments.all()
+        ],
+    }
+
+
+def export_lines(queryset=None, chunk_size=CHUNK_SIZE):
+    """Yield the JSON line of every blog"""
+    if queryset is None:
+        queryset = export_queryset()
+
+    for chunk in iter_chunks(queryset, chunk_size):
+        for blog in chunk:
+            yield json.dumps(blog_record(blog), cls=DjangoJSONEncoder) + '\n'
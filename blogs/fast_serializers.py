@@ -0,0 +1,180 @@
+"""
+Read-only serializers of values() rows for the list endpoints.
+
+They give the same output as the model serializers they stand for, in
+the same field order, out of a plan of (field name, values() lookup,
+conversion) built once from the readable fields of that serializer,
+instead of going through the fields machinery for every value of every
+row. Dates, formatted by strftime() in the model serializers, are
+formatted once per day.
+"""
+from functools import lru_cache
+
+from django.core.exceptions import ImproperlyConfigured
+
+from core.middleware import timed_serialization
+from blogs.models import Blog
+from blogs.serializers import (
+    BlogSerializer,
+    MyBlogSerializer,
+    CommentSerializer,
+    readable_fields
+)
+
+
+@lru_cache(maxsize=4096)
+def _format_date(date):
+    return date.strftime("%B %d, %Y")
+
+
+def format_date(value):
+    """Return the date of a datetime as the model serializers format it"""
+    return _format_date(value.date())
+
+
+class ValuesSerializer:
+    """
+    Serialize values() rows like the readable fields of serializer_class.
+
+    sources maps every readable field to its values() lookup, and
+    converters some of them to the conversion of their values. The
+    prepared lookups are not read by values() but set on the rows by
+    prepare(). Like SparseFieldsMixin, only the given fields are output
+    when they are given, and the context is the serializer context of the
+    view.
+    """
+    serializer_class = None
+    sources = {}
+    converters = {}
+    prepared = ()
+
+    def __init__(self, rows, fields=None, context=None):
+        self.rows = rows
+        self.fields_plan = self.plan(fields)
+        self.context = context or {}
+
+    @classmethod
+    def plan(cls, fields=None):
+        """Return the (name, lookup, conversion) of the output fields"""
+        if '_plan' not in cls.__dict__:
+            plan = []
+            for name in readable_fields(cls.serializer_class):
+                if name not in cls.sources:
+                    raise ImproperlyConfigured(
+                        "%s has no source for the %s field" % (
+                            cls.__name__, name
+                        )
+                    )
+                plan.append(
+                    (name, cls.sources[name], cls.converters.get(name))
+                )
+
+            cls._plan = tuple(plan)
+
+        if fields is None:
+            return cls._plan
+
+        return tuple(
+            (name, lookup, convert) for name, lookup, convert in cls._plan
+            if name in fields
+        )
+
+    @classmethod
+    def lookups(cls, fields=None):
+        """Return the values() lookups of the rows to serialize"""
+        return tuple(dict.fromkeys(
+            lookup for _, lookup, _ in cls.plan(fields)
+            if lookup not in cls.prepared
+        ))
+
+    def outputs(self, lookup):
+        """Return if a lookup is read by an output field"""
+        return any(source == lookup for _, source, _ in self.fields_plan)
+
+    def prepare(self, rows):
+        """Load what the rows need besides their values"""
+
+    def to_representation(self, row):
+        return {
+            name: row[lookup] if convert is None else convert(row[lookup])
+            for name, lookup, convert in self.fields_plan
+        }
+
+    @property
+    def data(self):
+        rows = list(self.rows)
+
+        with timed_serialization():
+            self.prepare(rows)
+            return [self.to_representation(row) for row in rows]
+
+
+class TaggedValuesSerializer(ValuesSerializer):
+    """Values serializer of blogs with their tag ids, in id order"""
+    prepared = ('tags',)
+
+    def prepare(self, rows):
+        """Load the tag ids of all the rows in one query, when output"""
+        if not self.outputs('tags'):
+            return
+
+        tags = {row['id']: [] for row in rows}
+
+        for blog_id, tag_id in Blog.tags.through.objects.filter(
+            blog_id__in=tags
+        ).order_by('tag_id').values_list('blog_id', 'tag_id'):
+            tags[blog_id].append(tag_id)
+
+        for row in rows:
+            row['tags'] = tags[row['id']]
+
+
+class BlogValuesSerializer(TaggedValuesSerializer):
+    """Values serializer standing for BlogSerializer"""
+    serializer_class = BlogSerializer
+    sources = {
+        'id': 'id',
+        'created_at': 'created_at',
+        'title': 'title',
+        'content': 'content',
+        'excerpt': 'excerpt',
+        'slug': 'slug',
+        'author': 'author__username',
+        'likes_count': 'likes_count',
+        'user_has_liked': 'user_has_liked',
+        'tags': 'tags',
+    }
+    converters = {'created_at': format_date}
+
+
+class MyBlogValuesSerializer(BlogValuesSerializer):
+    """Values serializer standing for MyBlogSerializer"""
+    serializer_class = MyBlogSerializer
+
+
+class CommentValuesSerializer(ValuesSerializer):
+    """
+    Values serializer standing for CommentSerializer, of the comments of
+    the blog of the view
+    """
+    serializer_class = CommentSerializer
+    prepared = ('blog_slug',)
+    sources = {
+        'id': 'id',
+        'created_at': 'created_at',
+        'content': 'content',
+        'author': 'author__username',
+        'likes_count': 'likes_count',
+        'user_has_liked': 'user_has_liked',
+        'blog_slug': 'blog_slug',
+    }
+    converters = {'created_at': format_date}
+
+    def prepare(self, rows):
+        """Set the blog slug of the rows from the URL, without a join"""
+        if not self.outputs('blog_slug'):
+            return
+
+        blog_slug = self.context['view'].kwargs['slug']
+        for row in rows:
+            row['blog_slug'] = blog_slug
@@ -0,0 +1,506 @@
+"""
+Bulk import of users, tags, blogs, comments and likes.
+
+Records are buffered by type and written with bulk_create, in batches,
+parents before children, so a record can refer to any record read
+before it. Nothing goes through save(), so what the signals would do is
+done here instead: blog slugs and excerpts are generated up front, tags
+and likes are written straight into the through tables, likes counters
+and trending scores are rebuilt, blogs are indexed for search and
+cached responses invalidated.
+
+Users are referred to by username, blogs by id or slug and comments by
+id. Records referring to missing rows are skipped, and so are the ones
+which would conflict with an existing row or a record read before them,
+along with their tags. bulk_create does not tell which rows it ignored,
+so the ids of the blogs and comments are read back after the insert and
+only the rows found are counted as imported.
+"""
+import csv
+import json
+import os
+from collections import Counter
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import identify_hasher, make_password
+from django.core.management.color import no_style
+from django.db import connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from core.utils import generate_excerpt, generate_slug
+from blogs.models import Tag, Blog, Comment
+from blogs.likes import sync_likes_count
+from blogs.cache import bump_generations
+from blogs import search, trending
+
+
+# Record types in the order their batches are written
+RECORD_TYPES = ('user', 'tag', 'blog', 'comment', 'blog_like', 'comment_like')
+
+BATCH_SIZE = 1000
+
+# Separator of the tags of a blog in a CSV column
+CSV_TAGS_SEPARATOR = '|'
+
+TIMESTAMP_FIELDS = ('created_at', 'updated_at')
+
+
+class InvalidImport(Exception):
+    """A file or record can not be imported"""
+
+
+def record_type_for_path(path):
+    """Return the record type of a CSV file named after it, e.g. blogs.csv"""
+    name = os.path.splitext(os.path.basename(path))[0]
+    record_type = name[:-1] if name.endswith('s') else name
+
+    if record_type not in RECORD_TYPES:
+        raise InvalidImport(
+            "Can not tell the record type of %s, expected one of: %s" % (
+                path, ', '.join(RECORD_TYPES)
+            )
+        )
+
+    return record_type
+
+
+def _csv_record(row):
+    """Return a CSV row as a record, with its ids and tags parsed"""
+    record = {key: value for key, value in row.items() if value != ''}
+
+    for key in ('id', 'comment', 'age'):
+        if key in record:
+            record[key] = int(record[key])
+
+    if record.get('blog', '').isdigit():
+        record['blog'] = int(record['blog'])
+
+    if 'tags' in record:
+        record['tags'] = record['tags'].split(CSV_TAGS_SEPARATOR)
+
+    return record
+
+
+def read_records(path, record_type=None):
+    """
+    Yield the (type, record) of every line of a newline-delimited JSON
+    file, whose records hold their type, or of every row of a CSV file
+    of a single type
+    """
+    if path.endswith('.csv'):
+        record_type = record_type or record_type_for_path(path)
+
+        with open(path, newline='') as rows:
+            for row in csv.DictReader(rows):
+                yield record_type, _csv_record(row)
+        return
+
+    with open(path) as lines:
+        for number, line in enumerate(lines, 1):
+            if not line.strip():
+                continue
+
+            try:
+                record = json.loads(line)
+            except ValueError:
+                raise InvalidImport("%s:%d is not valid JSON" % (path, number))
+
+            yield record.pop('type', record_type), record
+
+
+def _timestamps(record, now):
+    """Return the created_at and updated_at of a record"""
+    timestamps = {}
+
+    for key in TIMESTAMP_FIELDS:
+        value = record.get(key)
+        value = parse_datetime(value) if value else now
+
+        if timezone.is_naive(value):
+            value = timezone.make_aware(value, timezone.utc)
+
+        timestamps[key] = value
+
+    return timestamps
+
+
+def _set_timestamps(model, rows):
+    """
+    Write the (object, timestamps) of the rows over the created_at and
+    updated_at that bulk_create took from auto_now and auto_now_add
+    """
+    for obj, timestamps in rows:
+        for key, value in timestamps.items():
+            setattr(obj, key, value)
+
+    model.objects.bulk_update(
+        [obj for obj, _ in rows],
+        TIMESTAMP_FIELDS
+    )
+
+
+def _password(value):
+    """Return the password of a record, hashing it unless it is a hash"""
+    if not value:
+        return make_password(None)
+
+    try:
+        identify_hasher(value)
+    except ValueError:
+        return make_password(value)
+
+    return value
+
+
+class Importer:
+    """Buffer records by type and write them in batches"""
+
+    def __init__(self, batch_size=BATCH_SIZE, progress=None):
+        self.batch_size = batch_size
+        self.progress = progress
+        self.buffers = {record_type: [] for record_type in RECORD_TYPES}
+        self.imported = Counter()
+        self.skipped = Counter()
+        self.touched_blog_ids = set()
+        self.explicit_ids = False
+
+    def add(self, record_type, record):
+        """Buffer a record, writing every buffer once one of them is full"""
+        if record_type not in self.buffers:
+            raise InvalidImport("Unknown record type %r" % record_type)
+
+        self.buffers[record_type].append(record)
+
+        if len(self.buffers[record_type]) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        """Write the buffered records, parents before children"""
+        self.touched_blog_ids = set()
+
+        with transaction.atomic():
+            for record_type in RECORD_TYPES:
+                records = self.buffers[record_type]
+                if records:
+                    self.buffers[record_type] = []
+                    getattr(self, 'import_%ss' % record_type)(records)
+
+            if self.touched_blog_ids:
+                trending.rebuild_scores(
+                    Blog.objects.filter(id__in=self.touched_blog_ids)
+                )
+                bump_generations(self.touched_blog_ids, global_generation=True)
+
+        if self.progress is not None:
+            self.progress(sum(self.imported.values()))
+
+    def finish(self):
+        """
+        Write the remaining records and move the id sequences past the
+        ids given by the records
+        """
+        self.flush()
+
+        if self.explicit_ids:
+            statements = connection.ops.sequence_reset_sql(
+                no_style(),
+                [Blog, Comment]
+            )
+            with connection.cursor() as cursor:
+                for sql in statements:
+                    cursor.execute(sql)
+
+    def _skip(self, record_type, count=1):
+        self.skipped[record_type] += count
+
+    def _user_ids(self, usernames):
+        """Return the ids of the users by username"""
+        return dict(get_user_model().objects.filter(
+            username__in=set(usernames)
+        ).values_list('username', 'id'))
+
+    def _blog_ids(self, references):
+        """Return the ids of the blogs by id or slug reference"""
+        references = set(references)
+        ids = {ref for ref in references if isinstance(ref, int)}
+        slugs = references - ids
+
+        blog_ids = {}
+        for id, slug in Blog.objects.filter(
+            Q(id__in=ids) | Q(slug__in=slugs)
+        ).values_list('id', 'slug'):
+            blog_ids[id] = blog_ids[slug] = id
+
+        return blog_ids
+
+    def _new_likes(self, record_type, through, owner_field, likes):
+        """
+        Return the likes of the (owner id, user id) pairs which are not
+        liked yet, skipping the others
+        """
+        owner_ids = {owner_id for owner_id, _ in likes}
+        user_ids = {user_id for _, user_id in likes}
+        taken = set(through.objects.filter(**{
+            owner_field + '__in': owner_ids,
+            'vibloguser_id__in': user_ids,
+        }).values_list(owner_field, 'vibloguser_id'))
+
+        new_likes = []
+        for owner_id, user_id in likes:
+            if (owner_id, user_id) in taken:
+                self._skip(record_type)
+                continue
+
+            taken.add((owner_id, user_id))
+            new_likes.append(through(
+                **{owner_field: owner_id, 'vibloguser_id': user_id}
+            ))
+
+        through.objects.bulk_create(new_likes, ignore_conflicts=True)
+        self.imported[record_type] += len(new_likes)
+
+        return new_likes
+
+    def import_users(self, records):
+        User = get_user_model()
+        taken = set(User.objects.filter(
+            username__in={record['username'] for record in records}
+        ).values_list('username', flat=True))
+
+        users = []
+        for record in records:
+            if record['username'] in taken:
+                self._skip('user')
+                continue
+
+            taken.add(record['username'])
+            users.append(User(
+                username=record['username'],
+                email=record.get('email', ''),
+                first_name=record.get('first_name', ''),
+                last_name=record.get('last_name', ''),
+                password=_password(record.get('password')),
+                age=record.get('age'),
+                biography=record.get('biography'),
+            ))
+
+        User.objects.bulk_create(users, ignore_conflicts=True)
+        self.imported['user'] += len(users)
+
+    def import_tags(self, records):
+        contents = {record['content'].lower() for record in records}
+        existing = Tag.objects.filter(content__in=contents).count()
+
+        Tag.objects.upsert_ids(contents)
+        self.imported['tag'] += len(contents) - existing
+        self._skip('tag', len(records) - len(contents) + existing)
+
+    def import_blogs(self, records):
+        author_ids = self._user_ids(record['author'] for record in records)
+        now = timezone.now()
+
+        slugs = [
+            record.get('slug') or generate_slug(record['title'])
+            for record in records
+        ]
+        taken_ids = set()
+        taken_slugs = set()
+        for id, slug in Blog.objects.filter(
+            Q(id__in={record.get('id') for record in records} - {None})
+            | Q(slug__in=slugs)
+        ).values_list('id', 'slug'):
+            taken_ids.add(id)
+            taken_slugs.add(slug)
+
+        blogs = []
+        timestamps = {}
+        tag_names = {}
+        for record, slug in zip(records, slugs):
+            author_id = author_ids.get(record['author'])
+            id = record.get('id')
+            if (author_id is None or slug in taken_slugs
+                    or id is not None and id in taken_ids):
+                self._skip('blog')
+                continue
+
+            taken_ids.add(id)
+            taken_slugs.add(slug)
+            blogs.append(Blog(
+                id=id,
+                author_id=author_id,
+                title=record['title'],
+                content=record['content'],
+                excerpt=generate_excerpt(record['content']),
+                slug=slug,
+            ))
+            self.explicit_ids |= id is not None
+            timestamps[slug] = _timestamps(record, now)
+            tag_names[slug] = record.get('tags', [])
+
+        Blog.objects.bulk_create(blogs, ignore_conflicts=True)
+
+        # bulk_create does not set the ids on every backend, nor tell the
+        # rows it ignored, which are the ones not written as given
+        rows = {
+            slug: (id, author_id, title)
+            for slug, id, author_id, title in Blog.objects.filter(
+                slug__in=[blog.slug for blog in blogs]
+            ).values_list('slug', 'id', 'author_id', 'title')
+        }
+        inserted = []
+        for blog in blogs:
+            id, author_id, title = rows.get(blog.slug, (None, None, None))
+            if (author_id != blog.author_id or title != blog.title
+                    or blog.id not in (None, id)):
+                self._skip('blog')
+                continue
+
+            blog.id = id
+            inserted.append(blog)
+        blogs = inserted
+
+        _set_timestamps(
+            Blog,
+            [(blog, timestamps[blog.slug]) for blog in blogs]
+        )
+
+        tag_ids = Tag.objects.upsert_ids(
+            name for blog in blogs for name in tag_names[blog.slug]
+        )
+        Blog.tags.through.objects.bulk_create([
+            Blog.tags.through(blog_id=blog.id, tag_id=tag_ids[name.lower()])
+            for blog in blogs
+            for name in set(tag_names[blog.slug])
+        ], ignore_conflicts=True)
+
+        search.index_blogs(blogs)
+        self.touched_blog_ids.update(blog.id for blog in blogs)
+        self.imported['blog'] += len(blogs)
+
+    def import_comments(self, records):
+        author_ids = self._user_ids(record['author'] for record in records)
+        blog_ids = self._blog_ids(record['blog'] for record in records)
+        now = timezone.now()
+
+        existing = Comment.objects.filter(
+            Q(id__in={record.get('id') for record in records} - {None})
+            | Q(
+                blog_id__in=set(blog_ids.values()),
+                author_id__in=set(author_ids.values())
+            )
+        ).values_list('id', 'blog_id', 'author_id')
+        taken_ids = set()
+        taken_pairs = set()
+        for id, blog_id, author_id in existing:
+            taken_ids.add(id)
+            taken_pairs.add((blog_id, author_id))
+
+        comments = []
+        timestamps = {}
+        for record in records:
+            author_id = author_ids.get(record['author'])
+            blog_id = blog_ids.get(record['blog'])
+            id = record.get('id')
+            if (author_id is None or blog_id is None
+                    or id is not None and id in taken_ids
+                    or (blog_id, author_id) in taken_pairs):
+                self._skip('comment')
+                continue
+
+            taken_ids.add(id)
+            taken_pairs.add((blog_id, author_id))
+            comments.append(Comment(
+                id=id,
+                author_id=author_id,
+                blog_id=blog_id,
+                content=record['content'],
+            ))
+            self.explicit_ids |= id is not None
+            timestamps[blog_id, author_id] = _timestamps(record, now)
+
+        Comment.objects.bulk_create(comments, ignore_conflicts=True)
+
+        # Read back like the blogs, by the one comment of an author on a blog
+        rows = {
+            (blog_id, author_id): (id, content)
+            for id, blog_id, author_id, content in Comment.objects.filter(
+                blog_id__in={comment.blog_id for comment in comments},
+                author_id__in={comment.author_id for comment in comments}
+            ).values_list('id', 'blog_id', 'author_id', 'content')
+        }
+        inserted = []
+        for comment in comments:
+            id, content = rows.get(
+                (comment.blog_id, comment.author_id),
+                (None, None)
+            )
+            if content != comment.content or comment.id not in (None, id):
+                self._skip('comment')
+                continue
+
+            comment.id = id
+            inserted.append(comment)
+        comments = inserted
+
+        _set_timestamps(Comment, [
+            (comment, timestamps[comment.blog_id, comment.author_id])
+            for comment in comments
+        ])
+
+        self.touched_blog_ids.update(comment.blog_id for comment in comments)
+        self.imported['comment'] += len(comments)
+
+    def import_blog_likes(self, records):
+        user_ids = self._user_ids(record['user'] for record in records)
+        blog_ids = self._blog_ids(record['blog'] for record in records)
+
+        likes = []
+        for record in records:
+            user_id = user_ids.get(record['user'])
+            blog_id = blog_ids.get(record['blog'])
+            if user_id is None or blog_id is None:
+                self._skip('blog_like')
+                continue
+
+            likes.append((blog_id, user_id))
+
+        likes = self._new_likes(
+            'blog_like',
+            Blog.likes.through,
+            'blog_id',
+            likes
+        )
+
+        liked_ids = {like.blog_id for like in likes}
+        sync_likes_count(Blog.objects.filter(id__in=liked_ids))
+        self.touched_blog_ids.update(liked_ids)
+
+    def import_comment_likes(self, records):
+        user_ids = self._user_ids(record['user'] for record in records)
+        comment_blog_ids = dict(Comment.objects.filter(
+            id__in={record['comment'] for record in records}
+        ).values_list('id', 'blog_id'))
+
+        likes = []
+        for record in records:
+            user_id = user_ids.get(record['user'])
+            if user_id is None or record['comment'] not in comment_blog_ids:
+                self._skip('comment_like')
+                continue
+
+            likes.append((record['comment'], user_id))
+
+        likes = self._new_likes(
+            'comment_like',
+            Comment.likes.through,
+            'comment_id',
+            likes
+        )
+
+        liked_ids = {like.comment_id for like in likes}
+        sync_likes_count(Comment.objects.filter(id__in=liked_ids))
+        self.touched_blog_ids.update(
+            comment_blog_ids[id] for id in liked_ids
+        )
@@ -0,0 +1,150 @@
+from django.core.exceptions import FieldDoesNotExist
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.db.models import Count, F, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+from django.dispatch import Signal
+from django.utils import timezone
+
+from blogs import trending
+
+
+# Sent with the model, object_id and user when a like is added or
+# removed without the related managers, which send m2m_changed instead
+like_changed = Signal()
+
+
+def _like_filter(model, object_id, user_id):
+    """Return the lookup of a like row in the model likes table"""
+    field = model.likes.field
+
+    return {
+        field.m2m_column_name(): object_id,
+        field.m2m_reverse_name(): user_id,
+    }
+
+
+def _is_dated(through):
+    """Return if the likes table keeps when the likes were added"""
+    try:
+        through._meta.get_field('created_at')
+    except FieldDoesNotExist:
+        return False
+
+    return True
+
+
+def _insert_like(model, object_id, user_id, using, now):
+    """
+    Insert the like row, dated now when the likes table keeps it, when
+    the object exists and the row does not, in one statement, and return
+    if it was inserted
+    """
+    connection = connections[using]
+    ops = connection.ops
+    through = model.likes.through
+
+    values = _like_filter(model, object_id, user_id)
+    if _is_dated(through):
+        values['created_at'] = ops.adapt_datetimefield_value(now)
+    columns = ', '.join(ops.quote_name(column) for column in values)
+    placeholders = ', '.join(['%s'] * len(values))
+
+    sql = "%s %s (%s) SELECT %s WHERE EXISTS (" \
+        "SELECT 1 FROM %s WHERE %s = %%s) %s" % (
+            ops.insert_statement(ignore_conflicts=True),
+            ops.quote_name(through._meta.db_table),
+            columns,
+            placeholders,
+            ops.quote_name(model._meta.db_table),
+            ops.quote_name(model._meta.pk.column),
+            ops.ignore_conflicts_suffix_sql(ignore_conflicts=True),
+        )
+
+    with connection.cursor() as cursor:
+        cursor.execute(sql, list(values.values()) + [object_id])
+        return cursor.rowcount > 0
+
+
+def _likes_count(model, object_id, using):
+    """Return the likes counter of the object, or None when it is missing"""
+    return model.objects.using(using).filter(
+        pk=object_id
+    ).values_list('likes_count', flat=True).first()
+
+
+def add_like(model, object_id, user, using=DEFAULT_DB_ALIAS):
+    """
+    Like a blog or comment with a single insert-or-ignore of the like
+    row, and increase its likes counter and trending score in the same
+    transaction only when the row was actually inserted.
+
+    Return the likes counter, or None when the object does not exist.
+    """
+    now = timezone.now()
+
+    with transaction.atomic(using=using):
+        if _insert_like(model, object_id, user.pk, using, now):
+            model.objects.using(using).filter(pk=object_id).update(
+                likes_count=F('likes_count') + 1,
+                updated_at=now,
+                **trending.like_updates(model, 1, now)
+            )
+            like_changed.send(sender=model, object_id=object_id, user=user)
+
+        return _likes_count(model, object_id, using)
+
+
+def remove_like(model, object_id, user, using=DEFAULT_DB_ALIAS):
+    """
+    Unlike a blog or comment with a single delete of the like row, and
+    decrease its likes counter and trending score in the same
+    transaction only when the row was actually deleted, taking back the
+    score the like gave when it was added.
+
+    Return the likes counter, or None when the object does not exist.
+    """
+    through = model.likes.through
+
+    with transaction.atomic(using=using):
+        likes = through.objects.using(using).filter(
+            **_like_filter(model, object_id, user.pk)
+        )
+        liked_at = trending.liked_at(model, likes)
+        deleted, _ = likes.delete()
+
+        if deleted:
+            model.objects.using(using).filter(pk=object_id).update(
+                likes_count=F('likes_count') - deleted,
+                updated_at=timezone.now(),
+                **trending.like_updates(model, -deleted, liked_at)
+            )
+            like_changed.send(sender=model, object_id=object_id, user=user)
+
+        return _likes_count(model, object_id, using)
+
+
+def counted_likes(model):
+    """Return an expression counting each row likes in the likes table"""
+    field = model.likes.field
+    source = field.m2m_field_name()
+
+    likes = model.likes.through.objects.filter(
+        **{source: OuterRef('pk')}
+    ).order_by().values(source).annotate(count=Count('pk')).values('count')
+
+    return Coalesce(Subquery(likes), Value(0))
+
+
+def sync_likes_count(queryset):
+    """Rebuild the likes counter of the queryset rows from the likes table"""
+    return queryset.update(
+        likes_count=counted_likes(queryset.model),
+        updated_at=timezone.now()
+    )
+
+
+def drifted_likes_count(queryset):
+    """Return the rows whose likes counter differs from the likes table"""
+    return queryset.annotate(
+        counted_likes=counted_likes(queryset.model)
+    ).exclude(likes_count=F('counted_likes'))
@@ -0,0 +1,47 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from blogs.export import CHUNK_SIZE, export_lines
+
+
+class Command(BaseCommand):
+    """Export every blog as newline-delimited JSON"""
+    help = (
+        "Export every blog with its tags, comments and likes count as "
+        "newline-delimited JSON"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=CHUNK_SIZE,
+            help="Number of blogs read and prefetched per chunk",
+        )
+        parser.add_argument(
+            '--output',
+            help="File to write the export to, instead of stdout",
+        )
+
+    def handle(self, *args, **options):
+        lines = export_lines(chunk_size=options['chunk_size'])
+
+        if options['output'] is None:
+            for line in lines:
+                self.stdout.write(line, ending='')
+            return
+
+        start = time.monotonic()
+        exported = 0
+
+        with open(options['output'], 'w') as output:
+            for line in lines:
+                output.write(line)
+                exported += 1
+
+        self.stdout.write(self.style.SUCCESS(
+            "Exported %d blogs in %.1fs" % (
+                exported, time.monotonic() - start
+            )
+        ))
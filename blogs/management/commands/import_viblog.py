@@ -0,0 +1,75 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from blogs.importer import (
+    BATCH_SIZE,
+    RECORD_TYPES,
+    InvalidImport,
+    Importer,
+    read_records
+)
+
+
+class Command(BaseCommand):
+    """Import users, tags, blogs, comments and likes in bulk"""
+    help = (
+        "Import users, tags, blogs, comments and likes from newline-"
+        "delimited JSON files, whose records hold their type, or from CSV "
+        "files of a single type named after it, e.g. blogs.csv"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'paths',
+            nargs='+',
+            help="Files to import, parents before children",
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=BATCH_SIZE,
+            help="Number of records of a type written per batch",
+        )
+        parser.add_argument(
+            '--type',
+            choices=RECORD_TYPES,
+            help="Record type of the CSV files or of untyped JSON records",
+        )
+
+    def handle(self, *args, **options):
+        start = time.monotonic()
+
+        def rate(rows):
+            return rows / max(time.monotonic() - start, 1e-6)
+
+        def progress(imported):
+            self.stdout.write("Imported %d rows (%.0f rows/s)" % (
+                imported, rate(imported)
+            ))
+
+        importer = Importer(options['batch_size'], progress)
+
+        try:
+            for path in options['paths']:
+                for record_type, record in read_records(path, options['type']):
+                    importer.add(record_type, record)
+
+            importer.finish()
+        except (InvalidImport, KeyError, ValueError) as error:
+            raise CommandError("Import failed: %r" % error)
+
+        for record_type in RECORD_TYPES:
+            if importer.imported[record_type] or importer.skipped[record_type]:
+                self.stdout.write("%s: %d imported, %d skipped" % (
+                    record_type,
+                    importer.imported[record_type],
+                    importer.skipped[record_type]
+                ))
+
+        imported = sum(importer.imported.values())
+        self.stdout.write(self.style.SUCCESS(
+            "Imported %d rows in %.1fs (%.0f rows/s)" % (
+                imported, time.monotonic() - start, rate(imported)
+            )
+        ))
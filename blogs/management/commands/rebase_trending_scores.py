@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand
+
+from blogs.models import Blog
+from blogs import trending
+
+
+class Command(BaseCommand):
+    """Rebase the blogs trending scores on the current time"""
+    help = (
+        "Move the epoch of the blogs trending scores to now and scale the "
+        "scores down to it, so they never overflow. Run it periodically, "
+        "e.g. daily"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--rebuild',
+            action='store_true',
+            help=(
+                "Also recompute every score from the comments and likes "
+                "counters, e.g. to fill them in on existing blogs"
+            ),
+        )
+
+    def handle(self, *args, **options):
+        factor = trending.rebase()
+        self.stdout.write(self.style.SUCCESS(
+            "Trending scores rebased, scaled by %g" % factor
+        ))
+
+        if options['rebuild']:
+            rebuilt = trending.rebuild_scores(Blog.objects.all())
+            self.stdout.write(self.style.SUCCESS(
+                "%d trending scores rebuilt" % rebuilt
+            ))
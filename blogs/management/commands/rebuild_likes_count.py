@@ -0,0 +1,51 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from blogs.models import Blog, Comment
+from blogs.likes import drifted_likes_count, sync_likes_count
+
+
+class Command(BaseCommand):
+    """Rebuild the blogs and comments likes counters"""
+    help = (
+        "Rebuild the likes_count of blogs and comments from their likes "
+        "tables and report the counters that had drifted"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help="Only report the drift, without fixing the counters",
+        )
+
+    def handle(self, *args, **options):
+        for model in (Blog, Comment):
+            with transaction.atomic():
+                drifted = list(
+                    drifted_likes_count(model.objects.all()).values_list(
+                        'pk', 'likes_count', 'counted_likes'
+                    )
+                )
+
+                for pk, stored, counted in drifted:
+                    self.stdout.write(
+                        "%s %s: stored %s, counted %s" % (
+                            model.__name__, pk, stored, counted
+                        )
+                    )
+
+                if drifted and not options['dry_run']:
+                    sync_likes_count(
+                        model.objects.filter(
+                            pk__in=[pk for pk, _, _ in drifted]
+                        )
+                    )
+
+            self.stdout.write(self.style.SUCCESS(
+                "%s: %d drifted counters%s" % (
+                    model.__name__,
+                    len(drifted),
+                    '' if options['dry_run'] else ' rebuilt',
+                )
+            ))
@@ -0,0 +1,50 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from blogs import search
+from blogs.models import Blog
+
+
+class Command(BaseCommand):
+    """Rebuild the blogs full-text search index"""
+    help = "Rebuild the full-text search index from every blog"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help="Number of blogs indexed per batch",
+        )
+
+    def handle(self, *args, **options):
+        if not search.is_supported():
+            raise CommandError(
+                "The database backend has no full-text search index"
+            )
+
+        batch_size = options['batch_size']
+        blogs = Blog.objects.only('id', 'title', 'content').order_by('id')
+        start = time.monotonic()
+        indexed = 0
+
+        with transaction.atomic():
+            search.clear_index()
+
+            batch = []
+            for blog in blogs.iterator(chunk_size=batch_size):
+                batch.append(blog)
+                if len(batch) == batch_size:
+                    search.index_blogs(batch)
+                    indexed += len(batch)
+                    batch = []
+                    self.stdout.write("Indexed %d blogs" % indexed)
+
+            search.index_blogs(batch)
+            indexed += len(batch)
+
+        self.stdout.write(self.style.SUCCESS(
+            "Indexed %d blogs in %.1fs" % (indexed, time.monotonic() - start)
+        ))
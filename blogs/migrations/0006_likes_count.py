@@ -0,0 +1,41 @@
+# Generated by Django 3.1.2 on 2026-10-17 13:04
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def count_likes(apps, schema_editor):
+    """Fill the likes counters from the existing likes"""
+    for model_name, source in (('Blog', 'blog'), ('Comment', 'comment')):
+        model = apps.get_model('blogs', model_name)
+        likes = model.likes.through.objects.filter(
+            **{source: OuterRef('pk')}
+        ).order_by().values(source).annotate(
+            count=Count('pk')
+        ).values('count')
+
+        model.objects.update(
+            likes_count=Coalesce(Subquery(likes), Value(0))
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blogs', '0005_auto_20201109_1846'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='blog',
+            name='likes_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='comment',
+            name='likes_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(count_likes, migrations.RunPython.noop),
+    ]
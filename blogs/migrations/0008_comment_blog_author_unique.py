@@ -0,0 +1,17 @@
+# Generated by Django 3.1.2 on 2026-10-17 13:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blogs', '0008_merge_duplicate_comments'),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name='comment',
+            constraint=models.UniqueConstraint(fields=('blog', 'author'), name='comment_blog_author_unique'),
+        ),
+    ]
@@ -0,0 +1,57 @@
+# Generated by Django 3.1.2 on 2026-10-17 13:06
+
+from django.db import migrations
+from django.db.models import Count, Min
+
+
+def merge_duplicate_comments(apps, schema_editor):
+    """
+    Keep the first comment of each author on a blog, moving the likes of
+    the other ones to it, so the one comment per author constraint holds
+    """
+    comment_model = apps.get_model('blogs', 'Comment')
+    through = comment_model.likes.through
+    using = schema_editor.connection.alias
+    comments = comment_model.objects.using(using)
+
+    duplicated = comments.values('blog_id', 'author_id').annotate(
+        count=Count('id'),
+        first_id=Min('id')
+    ).filter(count__gt=1)
+
+    for group in duplicated.iterator():
+        first_id = group['first_id']
+        others = comments.filter(
+            blog_id=group['blog_id'],
+            author_id=group['author_id']
+        ).exclude(id=first_id)
+
+        through.objects.using(using).bulk_create(
+            [
+                through(comment_id=first_id, vibloguser_id=user_id)
+                for user_id in through.objects.using(using).filter(
+                    comment__in=others
+                ).values_list('vibloguser_id', flat=True)
+            ],
+            ignore_conflicts=True
+        )
+        others.delete()
+        comments.filter(id=first_id).update(
+            likes_count=through.objects.using(using).filter(
+                comment_id=first_id
+            ).count()
+        )
+
+
+# Apart from the constraint of 0008_comment_blog_author_unique: on
+# PostgreSQL the deletes leave deferred foreign key checks pending, and
+# an ALTER TABLE of the same transaction fails with pending trigger events
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blogs', '0007_keyset_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(merge_duplicate_comments, migrations.RunPython.noop),
+    ]
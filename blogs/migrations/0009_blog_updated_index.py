@@ -0,0 +1,17 @@
+# Generated by Django 3.1.2 on 2026-10-17 13:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blogs', '0008_comment_blog_author_unique'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='blog',
+            index=models.Index(fields=['updated_at'], name='blog_updated_idx'),
+        ),
+    ]
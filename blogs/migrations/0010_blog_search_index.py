@@ -0,0 +1,42 @@
+from django.db import migrations
+
+from blogs import search
+
+
+BATCH_SIZE = 1000
+
+
+def create_search_index(apps, schema_editor):
+    """Create the full-text search index and fill it with the blogs"""
+    search.create_index(schema_editor)
+
+    blog_model = apps.get_model('blogs', 'Blog')
+    using = schema_editor.connection.alias
+    blogs = blog_model.objects.using(using).only(
+        'id', 'title', 'content'
+    ).order_by('id')
+
+    batch = []
+    for blog in blogs.iterator(chunk_size=BATCH_SIZE):
+        batch.append(blog)
+        if len(batch) == BATCH_SIZE:
+            search.index_blogs(batch, using=using)
+            batch = []
+
+    search.index_blogs(batch, using=using)
+
+
+def drop_search_index(apps, schema_editor):
+    """Drop the full-text search index"""
+    search.drop_index(schema_editor)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blogs', '0009_blog_updated_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
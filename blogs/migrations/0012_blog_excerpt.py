@@ -0,0 +1,43 @@
+# Generated by Django 3.1.2 on 2026-10-17 13:41
+
+from django.db import migrations, models
+
+from core.utils import generate_excerpt
+
+
+BATCH_SIZE = 1000
+
+
+def fill_excerpts(apps, schema_editor):
+    """Generate the excerpts of the existing blogs"""
+    blog_model = apps.get_model('blogs', 'Blog')
+    using = schema_editor.connection.alias
+    blogs = blog_model.objects.using(using).only(
+        'id', 'content'
+    ).order_by('id')
+
+    batch = []
+    for blog in blogs.iterator(chunk_size=BATCH_SIZE):
+        blog.excerpt = generate_excerpt(blog.content)
+        batch.append(blog)
+        if len(batch) == BATCH_SIZE:
+            blog_model.objects.using(using).bulk_update(batch, ['excerpt'])
+            batch = []
+
+    blog_model.objects.using(using).bulk_update(batch, ['excerpt'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blogs', '0011_trending_score'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='blog',
+            name='excerpt',
+            field=models.CharField(blank=True, default='', max_length=255),
+        ),
+        migrations.RunPython(fill_excerpts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,33 @@
+from django.db import migrations
+
+
+PREFIX_INDEX = 'tag_content_prefix_idx'
+
+
+def create_prefix_index(apps, schema_editor):
+    """
+    Index the tag contents for prefix LIKE lookups on PostgreSQL, whose
+    unique index only serves them under the C collation. SQLite ranges
+    over the unique index instead.
+    """
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(
+            "CREATE INDEX %s ON blogs_tag "
+            "(content varchar_pattern_ops)" % PREFIX_INDEX
+        )
+
+
+def drop_prefix_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute("DROP INDEX IF EXISTS %s" % PREFIX_INDEX)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blogs', '0012_blog_excerpt'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_prefix_index, drop_prefix_index),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 3.1.2 on 2026-10-17 16:05
+
+from django.db import migrations, models
+
+
+def fill_epoch_timestamps(apps, schema_editor):
+    """Set the timestamp of the existing epoch"""
+    state_model = apps.get_model('blogs', 'TrendingState')
+    using = schema_editor.connection.alias
+
+    for state in state_model.objects.using(using).all():
+        state.epoch_timestamp = state.epoch.timestamp()
+        state.save(update_fields=['epoch_timestamp'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blogs', '0013_tag_prefix_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='trendingstate',
+            name='epoch_timestamp',
+            field=models.FloatField(default=0),
+        ),
+        migrations.RunPython(fill_epoch_timestamps, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 3.1.2 on 2026-10-18 10:12
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('blogs', '0014_trendingstate_epoch_timestamp'),
+    ]
+
+    operations = [
+        # The likes table of the blogs is kept, only its model is declared
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.CreateModel(
+                    name='BlogLike',
+                    fields=[
+                        ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                        ('blog', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='blogs.blog')),
+                        ('vibloguser', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+                    ],
+                    options={
+                        'db_table': 'blogs_blog_likes',
+                        'unique_together': {('blog', 'vibloguser')},
+                    },
+                ),
+                migrations.AlterField(
+                    model_name='blog',
+                    name='likes',
+                    field=models.ManyToManyField(related_name='liked_blogs', through='blogs.BlogLike', to=settings.AUTH_USER_MODEL),
+                ),
+            ],
+        ),
+        migrations.AddField(
+            model_name='bloglike',
+            name='created_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
@@ -1,11 +1,55 @@
 from django.db import models
+from django.db.models import Exists, OuterRef, Prefetch
 from django.conf import settings
+from django.dispatch import Signal
+
+
+# Sent with the contents of the tags created by the bulk upserts, which
+# bypass the Tag signals
+tags_created = Signal()
+
+
+class TagQuerySet(models.QuerySet):
+    """Queryset to write tags in bulk"""
+
+    def upsert(self, contents):
+        """
+        Create the missing tags out of the given contents, lowercased
+        like Tag.save does, and return the ids of all of them
+        """
+        return list(self.upsert_ids(contents).values())
+
+    def upsert_ids(self, contents):
+        """
+        Create the missing tags out of the given contents and return
+        the ids of all of them by their lowercased content, sending
+        tags_created when any was missing
+        """
+        contents = {content.lower() for content in contents}
+        ids = dict(
+            self.filter(content__in=contents).values_list('content', 'id')
+        )
+
+        missing = contents - ids.keys()
+        if missing:
+            self.bulk_create(
+                [self.model(content=content) for content in missing],
+                ignore_conflicts=True
+            )
+            ids.update(
+                self.filter(content__in=missing).values_list('content', 'id')
+            )
+            tags_created.send(sender=self.model, contents=missing)
+
+        return ids
 
 
 class Tag(models.Model):
     """Tag to be used to clasify blogs"""
     content = models.CharField(max_length=25, unique=True)
 
+    objects = TagQuerySet.as_manager()
+
     def save(self, *args, **kwargs):
         self.content = self.content.lower()
         return super(Tag, self).save(*args, **kwargs)
@@ -14,25 +58,94 @@ class Tag(models.Model):
         return self.content
 
 
+class BlogQuerySet(models.QuerySet):
+    """Queryset with the lookups needed to serialize blogs"""
+
+    def with_likes(self, user):
+        """
+        Select the author, prefetch the tags in id order and annotate if
+        the user has liked each blog, so a page of blogs is serialized
+        in a constant number of queries
+        """
+        user_likes = self.model.likes.through.objects.filter(
+            blog=OuterRef('pk'),
+            vibloguser=user.pk
+        )
+
+        return self.select_related('author').prefetch_related(
+            Prefetch('tags', queryset=Tag.objects.order_by('id'))
+        ).annotate(user_has_liked=Exists(user_likes))
+
+
 class Blog(models.Model):
     """Blog object"""
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     title = models.CharField(max_length=240)
     content = models.TextField()
+    excerpt = models.CharField(max_length=255, blank=True, default='')
     slug = models.SlugField(max_length=255, unique=True)
     author = models.ForeignKey(settings.AUTH_USER_MODEL,
                                on_delete=models.CASCADE,
                                related_name="blogs")
     likes = models.ManyToManyField(settings.AUTH_USER_MODEL,
+                                   through='BlogLike',
                                    related_name="liked_blogs")
+    likes_count = models.PositiveIntegerField(default=0)
+    trending_score = models.FloatField(default=0)
     tags = models.ManyToManyField('Tag',
                                   related_name="tag_blogs")
 
+    objects = BlogQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['created_at', 'id'],
+                         name='blog_created_idx'),
+            models.Index(fields=['author', 'created_at', 'id'],
+                         name='blog_author_created_idx'),
+            models.Index(fields=['updated_at'],
+                         name='blog_updated_idx'),
+            models.Index(fields=['-trending_score', '-id'],
+                         name='blog_trending_idx'),
+        ]
+
     def __str__(self):
         return self.title
 
 
+class BlogLike(models.Model):
+    """Like of a blog, dated for the trending scores"""
+    blog = models.ForeignKey(Blog, on_delete=models.CASCADE)
+    vibloguser = models.ForeignKey(settings.AUTH_USER_MODEL,
+                                   on_delete=models.CASCADE)
+    # Unknown for the likes added before they were dated, and the ones
+    # added by the related manager or the importer
+    created_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = 'blogs_blog_likes'
+        unique_together = [['blog', 'vibloguser']]
+
+
+class CommentQuerySet(models.QuerySet):
+    """Queryset with the lookups needed to serialize comments"""
+
+    def with_likes(self, user):
+        """
+        Select the author and annotate if the user has liked each
+        comment
+        """
+        user_likes = self.model.likes.through.objects.filter(
+            comment=OuterRef('pk'),
+            vibloguser=user.pk
+        )
+
+        return self.select_related('author').annotate(
+            user_has_liked=Exists(user_likes)
+        )
+
+
 class Comment(models.Model):
     """Blogs comments"""
     created_at = models.DateTimeField(auto_now_add=True)
@@ -43,9 +156,36 @@ class Comment(models.Model):
                                related_name="comments")
     likes = models.ManyToManyField(settings.AUTH_USER_MODEL,
                                    related_name="liked_comments")
+    likes_count = models.PositiveIntegerField(default=0)
     blog = models.ForeignKey(Blog,
                              on_delete=models.CASCADE,
                              related_name="comments")
 
+    objects = CommentQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['blog', 'created_at', 'id'],
+                         name='comment_blog_created_idx'),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=['blog', 'author'],
+                                    name='comment_blog_author_unique'),
+        ]
+
     def __str__(self):
         return self.content
+
+
+class TrendingState(models.Model):
+    """Epoch the blogs trending scores are relative to"""
+    epoch = models.DateTimeField()
+    # The epoch as a POSIX timestamp, for the scoring queries
+    epoch_timestamp = models.FloatField(default=0)
+
+    def save(self, *args, **kwargs):
+        self.epoch_timestamp = self.epoch.timestamp()
+        return super(TrendingState, self).save(*args, **kwargs)
+
+    def __str__(self):
+        return str(self.epoch)
@@ -0,0 +1,200 @@
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from binascii import Error as Base64Error
+
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import CursorPagination
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(CursorPagination):
+    """
+    Cursor pagination keyed on (created_at, id).
+
+    The cursor holds the key of the last row seen, so every page is a
+    range scan over the (created_at, id) indexes and deep pages cost
+    the same as the first one, unlike OFFSET.
+    """
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    ordering = ('-created_at', '-id')
+
+    def paginate_queryset(self, queryset, request, view=None):
+        """Return the page of rows after or before the cursor position"""
+        self.page_size = self.get_page_size(request)
+        self.base_url = request.build_absolute_uri()
+        self.position, self.reverse = self.decode_cursor(request)
+
+        descending = self.ordering[0].startswith('-') != self.reverse
+        if self.reverse:
+            ordering = [self._invert(field) for field in self.ordering]
+        else:
+            ordering = self.ordering
+
+        queryset = queryset.order_by(*ordering)
+
+        if self.position is not None:
+            queryset = queryset.filter(
+                self._after_position(self.position, descending)
+            )
+
+        return self.set_page(list(queryset[:self.page_size + 1]))
+
+    def set_page(self, results):
+        """
+        Keep the page out of the page_size + 1 rows read after the
+        cursor position, and whether there are pages around it
+        """
+        has_more = len(results) > self.page_size
+        self.page = results[:self.page_size]
+
+        if self.reverse:
+            self.page.reverse()
+            self.has_next = self.position is not None
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = self.position is not None
+
+        if self.page:
+            self.next_position = self.get_position(self.page[-1])
+            self.previous_position = self.get_position(self.page[0])
+        else:
+            self.next_position = self.previous_position = self.position
+
+        if (self.has_previous or self.has_next) and self.template is not None:
+            self.display_page_controls = True
+
+        return self.page
+
+    def get_next_link(self):
+        if not self.has_next or self.next_position is None:
+            return None
+
+        return self.encode_cursor(self.next_position, reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous or self.previous_position is None:
+            return None
+
+        if not self.page and not self.reverse:
+            # Past the last row the cursor itself is still a valid
+            # position to go back from.
+            return self.encode_cursor(self.position, reverse=True)
+
+        return self.encode_cursor(self.previous_position, reverse=True)
+
+    def get_position(self, row):
+        """Return the (created_at, id) key of a row or a values() dict"""
+        fields = [field.lstrip('-') for field in self.ordering]
+
+        if isinstance(row, dict):
+            return tuple(row[field] for field in fields)
+
+        return tuple(getattr(row, field) for field in fields)
+
+    def decode_cursor(self, request):
+        """Return the position and direction held in the cursor"""
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None, False
+
+        try:
+            cursor = json.loads(urlsafe_b64decode(encoded.encode('ascii')))
+            position = self.decode_position(cursor['p'])
+            reverse = bool(cursor.get('r'))
+        except (Base64Error, TypeError, ValueError, KeyError, IndexError):
+            raise NotFound(self.invalid_cursor_message)
+
+        return position, reverse
+
+    def decode_position(self, values):
+        """Return the (created_at, id) position kept in a cursor"""
+        created_at = parse_datetime(values[0])
+        if created_at is None:
+            raise ValueError(values[0])
+
+        return created_at, int(values[1])
+
+    def encode_position(self, position):
+        """Return the (created_at, id) position to keep in a cursor"""
+        created_at, id = position
+        return [created_at.isoformat(), id]
+
+    def encode_cursor(self, position, reverse):
+        """Return the URL of the page after or before the position"""
+        cursor = {'p': self.encode_position(position)}
+        if reverse:
+            cursor['r'] = 1
+
+        encoded = urlsafe_b64encode(
+            json.dumps(cursor, separators=(',', ':')).encode('ascii')
+        ).decode('ascii')
+
+        return replace_query_param(
+            self.base_url, self.cursor_query_param, encoded
+        )
+
+    def _after_position(self, position, descending):
+        """Return the filter of the rows following the position"""
+        created_field, id_field = [
+            field.lstrip('-') for field in self.ordering
+        ]
+        created_at, id = position
+        lookup = 'lt' if descending else 'gt'
+
+        return Q(**{'%s__%s' % (created_field, lookup): created_at}) | Q(
+            **{
+                created_field: created_at,
+                '%s__%s' % (id_field, lookup): id
+            }
+        )
+
+    @staticmethod
+    def _invert(field):
+        return field[1:] if field.startswith('-') else '-' + field
+
+
+class OldestFirstKeysetPagination(KeysetPagination):
+    """Keyset pagination from the oldest rows to the newest ones"""
+    ordering = ('created_at', 'id')
+
+
+class SearchPagination(KeysetPagination):
+    """
+    Keyset pagination of full-text search matches, keyed on their
+    (score, id), from the best match to the worst one
+    """
+    ordering = ('search_score', 'id')
+
+    def paginate_search(self, search, queryset, request, view=None):
+        """
+        Return the page of blogs matched by search(limit, position,
+        reverse), which returns (id, score) rows, read from queryset
+        """
+        self.page_size = self.get_page_size(request)
+        self.base_url = request.build_absolute_uri()
+        self.position, self.reverse = self.decode_cursor(request)
+
+        matches = search(self.page_size + 1, self.position, self.reverse)
+        objects = queryset.in_bulk([id for id, _ in matches])
+
+        results = []
+        for id, score in matches:
+            if id in objects:
+                objects[id].search_score = score
+                results.append(objects[id])
+
+        return self.set_page(results)
+
+    def decode_position(self, values):
+        """Return the (score, id) position kept in a cursor"""
+        return float(values[0]), int(values[1])
+
+    def encode_position(self, position):
+        """Return the (score, id) position to keep in a cursor"""
+        return list(position)
@@ -0,0 +1,175 @@
+"""
+Full-text search over the blogs title and content.
+
+SQLite keeps the index in a FTS5 virtual table whose rowid is the blog
+id, PostgreSQL in a side table of weighted tsvector documents with a GIN
+index. Both rank the matches with a score where lower is better, bm25()
+on SQLite and the negated ts_rank() on PostgreSQL, so a page of results
+is read after a (score, id) position.
+"""
+from django.db import DEFAULT_DB_ALIAS, connections
+
+
+FTS_TABLE = 'blogs_blog_fts'
+SEARCH_TABLE = 'blogs_blog_search'
+
+# Title matches weigh more than content matches
+TITLE_WEIGHT = 10.0
+CONTENT_WEIGHT = 1.0
+
+
+class SearchNotSupported(Exception):
+    """The database backend has no full-text search index"""
+
+
+def is_supported(using=DEFAULT_DB_ALIAS):
+    """Return if the database backend has a full-text search index"""
+    return connections[using].vendor in ('sqlite', 'postgresql')
+
+
+def create_index(schema_editor):
+    """Create the full-text search index structures"""
+    vendor = schema_editor.connection.vendor
+
+    if vendor == 'sqlite':
+        schema_editor.execute(
+            "CREATE VIRTUAL TABLE %s USING fts5("
+            "title, content, tokenize = 'porter unicode61')" % FTS_TABLE
+        )
+    elif vendor == 'postgresql':
+        schema_editor.execute(
+            "CREATE TABLE %s ("
+            "blog_id integer PRIMARY KEY "
+            "REFERENCES blogs_blog (id) ON DELETE CASCADE "
+            "DEFERRABLE INITIALLY DEFERRED, "
+            "document tsvector NOT NULL)" % SEARCH_TABLE
+        )
+        schema_editor.execute(
+            "CREATE INDEX %s_document_idx ON %s USING gin (document)" % (
+                SEARCH_TABLE, SEARCH_TABLE
+            )
+        )
+
+
+def drop_index(schema_editor):
+    """Drop the full-text search index structures"""
+    vendor = schema_editor.connection.vendor
+
+    if vendor == 'sqlite':
+        schema_editor.execute("DROP TABLE IF EXISTS %s" % FTS_TABLE)
+    elif vendor == 'postgresql':
+        schema_editor.execute("DROP TABLE IF EXISTS %s" % SEARCH_TABLE)
+
+
+def index_blogs(blogs, using=DEFAULT_DB_ALIAS):
+    """Add or replace the blogs (id, title, content) in the index"""
+    rows = [(blog.id, blog.title, blog.content) for blog in blogs]
+    if not rows or not is_supported(using):
+        return
+
+    connection = connections[using]
+    with connection.cursor() as cursor:
+        if connection.vendor == 'sqlite':
+            cursor.executemany(
+                "DELETE FROM %s WHERE rowid = %%s" % FTS_TABLE,
+                [(id,) for id, _, _ in rows]
+            )
+            cursor.executemany(
+                "INSERT INTO %s (rowid, title, content) "
+                "VALUES (%%s, %%s, %%s)" % FTS_TABLE,
+                rows
+            )
+        else:
+            cursor.executemany(
+                "INSERT INTO %s (blog_id, document) VALUES (%%s, "
+                "setweight(to_tsvector('english', %%s), 'A') || "
+                "setweight(to_tsvector('english', %%s), 'B')) "
+                "ON CONFLICT (blog_id) DO UPDATE "
+                "SET document = EXCLUDED.document" % SEARCH_TABLE,
+                rows
+            )
+
+
+def remove_blogs(blog_ids, using=DEFAULT_DB_ALIAS):
+    """Remove the blogs from the index"""
+    if not blog_ids or not is_supported(using):
+        return
+
+    connection = connections[using]
+    table, column = {
+        'sqlite': (FTS_TABLE, 'rowid'),
+        'postgresql': (SEARCH_TABLE, 'blog_id'),
+    }[connection.vendor]
+
+    with connection.cursor() as cursor:
+        cursor.executemany(
+            "DELETE FROM %s WHERE %s = %%s" % (table, column),
+            [(id,) for id in blog_ids]
+        )
+
+
+def clear_index(using=DEFAULT_DB_ALIAS):
+    """Remove every blog from the index"""
+    if not is_supported(using):
+        return
+
+    connection = connections[using]
+    table = FTS_TABLE if connection.vendor == 'sqlite' else SEARCH_TABLE
+
+    with connection.cursor() as cursor:
+        cursor.execute("DELETE FROM %s" % table)
+
+
+def _fts5_query(query):
+    """Quote every term, so user input is never read as FTS5 syntax"""
+    return ' '.join(
+        '"%s"' % term.replace('"', '""') for term in query.split()
+    )
+
+
+def search(query, limit, position=None, reverse=False,
+           using=DEFAULT_DB_ALIAS):
+    """
+    Return up to limit (blog id, score) matches of the query, ordered by
+    score and id, after the (score, id) position or before it when
+    reverse is set
+    """
+    connection = connections[using]
+    if not is_supported(using):
+        raise SearchNotSupported(connection.vendor)
+
+    if connection.vendor == 'sqlite':
+        matches = (
+            "SELECT rowid AS id, bm25(%s, %s, %s) AS score "
+            "FROM %s WHERE %s MATCH %%s" % (
+                FTS_TABLE, TITLE_WEIGHT, CONTENT_WEIGHT, FTS_TABLE, FTS_TABLE
+            )
+        )
+        params = [_fts5_query(query)]
+    else:
+        matches = (
+            "SELECT blog_id AS id, "
+            "-ts_rank('{%s, %s, %s, %s}', document, query) AS score "
+            "FROM %s, plainto_tsquery('english', %%s) query "
+            "WHERE document @@ query" % (
+                0.1, 0.2, CONTENT_WEIGHT / TITLE_WEIGHT, 1.0, SEARCH_TABLE
+            )
+        )
+        params = [query]
+
+    sql = "SELECT id, score FROM (%s) matches" % matches
+
+    if position is not None:
+        lookup = '<' if reverse else '>'
+        sql += " WHERE score %s %%s OR (score = %%s AND id %s %%s)" % (
+            lookup, lookup
+        )
+        params += [position[0], position[0], position[1]]
+
+    direction = 'DESC' if reverse else 'ASC'
+    sql += " ORDER BY score %s, id %s LIMIT %%s" % (direction, direction)
+    params.append(limit)
+
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return cursor.fetchall()
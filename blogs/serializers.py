@@ -1,54 +1,181 @@
+from functools import lru_cache
+
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import transaction
+
 from rest_framework import serializers
+from rest_framework.relations import MANY_RELATION_KWARGS
 
+from core.serializers import TimedSerializerMixin, TimedListSerializer
 from blogs.models import Tag, Blog, Comment
 
 
-class TagSerializer(serializers.ModelSerializer):
+class BatchedManyRelatedField(serializers.ManyRelatedField):
+    """Many related field validating every primary key in one query"""
+
+    def to_internal_value(self, data):
+        if isinstance(data, str) or not hasattr(data, '__iter__'):
+            self.fail('not_a_list', input_type=type(data).__name__)
+        if not self.allow_empty and len(data) == 0:
+            self.fail('empty')
+
+        child = self.child_relation
+        queryset = child.get_queryset()
+        pk_field = queryset.model._meta.pk
+
+        pks = []
+        for item in data:
+            try:
+                pks.append(pk_field.to_python(item))
+            except (TypeError, ValueError, DjangoValidationError):
+                child.fail('incorrect_type', data_type=type(item).__name__)
+
+        objects = queryset.in_bulk(pks)
+
+        for pk in pks:
+            if pk not in objects:
+                child.fail('does_not_exist', pk_value=pk)
+
+        return [objects[pk] for pk in dict.fromkeys(pks)]
+
+
+class BatchedPrimaryKeyRelatedField(serializers.PrimaryKeyRelatedField):
+    """Primary key related field validated in one query when many=True"""
+
+    @classmethod
+    def many_init(cls, *args, **kwargs):
+        list_kwargs = {'child_relation': cls(*args, **kwargs)}
+        for key in kwargs:
+            if key in MANY_RELATION_KWARGS:
+                list_kwargs[key] = kwargs[key]
+
+        return BatchedManyRelatedField(**list_kwargs)
+
+
+@lru_cache(maxsize=None)
+def readable_fields(serializer_class):
+    """Return the names of the fields output by the serializer class"""
+    return tuple(
+        name for name, field in serializer_class().fields.items()
+        if not field.write_only
+    )
+
+
+class SparseFieldsMixin:
+    """Serializer only outputting the given fields, when they are given"""
+
+    def __init__(self, *args, fields=None, **kwargs):
+        super().__init__(*args, **kwargs)
+
+        if fields is not None:
+            for name in readable_fields(type(self)):
+                if name not in fields:
+                    self.fields.pop(name)
+
+
+class TagSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     """Serializer for Tag objects"""
 
     class Meta:
         model = Tag
         fields = ('id', 'content')
         read_only_fields = ('id',)
+        list_serializer_class = TimedListSerializer
 
 
-class BlogSerializer(serializers.ModelSerializer):
+class BlogSerializer(SparseFieldsMixin, TimedSerializerMixin,
+                     serializers.ModelSerializer):
     """Serializer for Blog objects"""
     author = serializers.StringRelatedField()
     created_at = serializers.SerializerMethodField()
     slug = serializers.SlugField(read_only=True)
-    likes_count = serializers.SerializerMethodField()
+    likes_count = serializers.IntegerField(read_only=True)
     user_has_liked = serializers.SerializerMethodField()
-    tags = serializers.PrimaryKeyRelatedField(
+    tags = BatchedPrimaryKeyRelatedField(
         many=True,
+        required=False,
         queryset=Tag.objects.all()
     )
+    tag_names = serializers.ListField(
+        child=serializers.CharField(max_length=25),
+        write_only=True,
+        required=False
+    )
 
     class Meta:
         model = Blog
-        exclude = ['updated_at', 'likes']
-        read_only_fields = ['id', 'author']
+        exclude = ['updated_at', 'likes', 'trending_score']
+        read_only_fields = ['id', 'author', 'excerpt']
+        list_serializer_class = TimedListSerializer
+
+    def create(self, validated_data):
+        """Create a blog and write its tags in bulk"""
+        tags = validated_data.pop('tags', [])
+        tag_names = validated_data.pop('tag_names', [])
+
+        with transaction.atomic():
+            blog = super().create(validated_data)
+            self.set_tags(blog, tags, tag_names, created=True)
+
+        return blog
+
+    def update(self, instance, validated_data):
+        """Update a blog and write its tags in bulk when they are given"""
+        tags = validated_data.pop('tags', None)
+        tag_names = validated_data.pop('tag_names', None)
+
+        with transaction.atomic():
+            blog = super().update(instance, validated_data)
+            if tags is not None or tag_names is not None:
+                self.set_tags(blog, tags or [], tag_names or [])
+
+        return blog
+
+    def set_tags(self, blog, tags, tag_names, created=False):
+        """
+        Set the blog tags from tag objects and tag names, upserting the
+        names and writing the new tag rows in a single insert
+        """
+        tag_ids = {tag.id for tag in tags}
+        if tag_names:
+            tag_ids.update(Tag.objects.upsert(tag_names))
+
+        through = Blog.tags.through
+        current_ids = set() if created else set(
+            through.objects.filter(blog=blog).values_list('tag_id', flat=True)
+        )
+
+        if current_ids - tag_ids:
+            through.objects.filter(
+                blog=blog,
+                tag_id__in=current_ids - tag_ids
+            ).delete()
+
+        through.objects.bulk_create([
+            through(blog_id=blog.id, tag_id=tag_id)
+            for tag_id in tag_ids - current_ids
+        ])
 
     def get_created_at(self, instance):
         """Return correctly date format"""
         return instance.created_at.strftime("%B %d, %Y")
 
-    def get_likes_count(self, instance):
-        """Return the blog's like count"""
-        return instance.likes.count()
-
     def get_user_has_liked(self, instance):
         """Return if user has liked the blog or not"""
+        if hasattr(instance, 'user_has_liked'):
+            return instance.user_has_liked
+
         request = self.context.get("request")
         return instance.likes.filter(pk=request.user.pk).exists()
 
 
-class MyBlogSerializer(serializers.ModelSerializer):
+class MyBlogSerializer(SparseFieldsMixin, TimedSerializerMixin,
+                       serializers.ModelSerializer):
     """Serializer for retrieve only user blogs"""
     author = serializers.StringRelatedField()
     created_at = serializers.SerializerMethodField()
     slug = serializers.SlugField(read_only=True)
-    likes_count = serializers.SerializerMethodField()
+    likes_count = serializers.IntegerField(read_only=True)
     tags = serializers.PrimaryKeyRelatedField(
         many=True,
         queryset=Tag.objects.all()
@@ -56,23 +183,21 @@ class MyBlogSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Blog
-        exclude = ['updated_at', 'likes']
-        read_only_fields = ['id', 'author']
+        exclude = ['updated_at', 'likes', 'trending_score']
+        read_only_fields = ['id', 'author', 'excerpt']
+        list_serializer_class = TimedListSerializer
 
     def get_created_at(self, instance):
         """Return correctly date format"""
         return instance.created_at.strftime("%B %d, %Y")
 
-    def get_likes_count(self, instance):
-        """Return the blog's like count"""
-        return instance.likes.count()
-
 
-class CommentSerializer(serializers.ModelSerializer):
+class CommentSerializer(SparseFieldsMixin, TimedSerializerMixin,
+                        serializers.ModelSerializer):
     """Serializer for blog comments"""
     author = serializers.StringRelatedField()
     created_at = serializers.SerializerMethodField()
-    likes_count = serializers.SerializerMethodField()
+    likes_count = serializers.IntegerField(read_only=True)
     user_has_liked = serializers.SerializerMethodField()
     blog_slug = serializers.SerializerMethodField()
 
@@ -80,20 +205,23 @@ class CommentSerializer(serializers.ModelSerializer):
         model = Comment
         exclude = ['updated_at', 'likes', 'blog']
         read_only_fields = ['id', 'author']
+        list_serializer_class = TimedListSerializer
 
     def get_created_at(self, instance):
         """Return correctly date format"""
         return instance.created_at.strftime("%B %d, %Y")
 
-    def get_likes_count(self, instance):
-        """Return the blog's like count"""
-        return instance.likes.count()
-
     def get_user_has_liked(self, instance):
         """Return if user has liked the blog or not"""
+        if hasattr(instance, 'user_has_liked'):
+            return instance.user_has_liked
+
         request = self.context.get("request")
         return instance.likes.filter(pk=request.user.pk).exists()
 
     def get_blog_slug(self, instance):
-        """Return slug blog"""
-        return instance.blog.slug
+        """Return slug blog, taken from the URL when it is there"""
+        view = self.context.get("view")
+        kwarg_slug = view.kwargs.get("slug") if view else None
+
+        return kwarg_slug or instance.blog.slug
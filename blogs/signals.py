@@ -1,9 +1,20 @@
-from django.db.models.signals import pre_save
+from django.db.models.signals import (
+    pre_save,
+    post_save,
+    pre_delete,
+    post_delete,
+    m2m_changed
+)
+from django.db.models import F
 from django.dispatch import receiver
-from django.utils.text import slugify
+from django.contrib.auth import get_user_model
+from django.utils import timezone
 
-from core.utils import generate_random_string
-from blogs.models import Blog
+from core.utils import generate_excerpt, generate_slug
+from blogs.models import Tag, Blog, Comment, tags_created
+from blogs.likes import like_changed, sync_likes_count
+from blogs.cache import bump_generations
+from blogs import autocomplete, search, trending
 
 
 @receiver(pre_save, sender=Blog)
@@ -13,6 +24,236 @@ def add_slug_to_blog(sender, instance, *args, **kwargs):
     before create the Blog object
     """
     if instance and not instance.slug:
-        slug = slugify(instance.title)
-        random_string = generate_random_string()
-        instance.slug = slug + "-" + random_string
+        instance.slug = generate_slug(instance.title)
+
+
+@receiver(pre_save, sender=Blog)
+def add_excerpt_to_blog(sender, instance, *args, **kwargs):
+    """Signal keeps the blog excerpt, shown by lists, out of its content"""
+    instance.excerpt = generate_excerpt(instance.content)
+
+
+RELATION_FIELDS = {
+    Blog.likes.through: Blog.likes.field,
+    Blog.tags.through: Blog.tags.field,
+    Comment.likes.through: Comment.likes.field,
+}
+
+
+@receiver(m2m_changed, sender=Blog.likes.through)
+@receiver(m2m_changed, sender=Blog.tags.through)
+@receiver(m2m_changed, sender=Comment.likes.through)
+def collect_cleared_ids(sender, instance, action, reverse, *args, **kwargs):
+    """
+    Signal keeps the blogs or comments related to the instance before
+    a reverse clear, which does not tell them after it
+    """
+    if action == 'pre_clear' and reverse:
+        field = RELATION_FIELDS[sender]
+        instance._cleared_ids = list(
+            sender.objects.filter(
+                **{field.m2m_reverse_field_name(): instance}
+            ).values_list(field.m2m_column_name(), flat=True)
+        )
+
+
+def changed_ids(instance, action, reverse, pk_set):
+    """Return the ids of the blogs or comments changed by a m2m change"""
+    if not reverse:
+        return [instance.pk]
+
+    if action == 'post_clear':
+        return instance._cleared_ids
+
+    return pk_set
+
+
+@receiver(m2m_changed, sender=Blog.likes.through)
+@receiver(m2m_changed, sender=Comment.likes.through)
+def update_likes_count(sender, instance, action, reverse, model, pk_set,
+                       *args, **kwargs):
+    """
+    Signal keeps the likes counter in sync when the likes are changed
+    through the related managers, e.g. blog.likes.add(user)
+    """
+    if reverse:
+        liked_model = model
+        liked = model.objects.filter(pk__in=pk_set or ())
+    else:
+        liked_model = type(instance)
+        liked = liked_model.objects.filter(pk=instance.pk)
+
+    if action == 'post_add':
+        # pk_set only holds the likes that were actually inserted
+        step = 1 if reverse else len(pk_set)
+        liked.update(
+            likes_count=F('likes_count') + step,
+            updated_at=timezone.now()
+        )
+    elif action == 'post_remove':
+        sync_likes_count(liked)
+    elif action == 'post_clear' and reverse:
+        sync_likes_count(
+            liked_model.objects.filter(pk__in=instance._cleared_ids)
+        )
+    elif action == 'post_clear':
+        liked.update(likes_count=0, updated_at=timezone.now())
+
+
+@receiver(m2m_changed, sender=Blog.tags.through)
+def touch_tagged_blogs(sender, instance, action, reverse, pk_set,
+                       *args, **kwargs):
+    """
+    Signal updates the blogs updated_at when their tags change, as it
+    is the validator of their conditional requests
+    """
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        Blog.objects.filter(
+            pk__in=changed_ids(instance, action, reverse, pk_set)
+        ).update(updated_at=timezone.now())
+
+
+@receiver(post_save, sender=Blog)
+def index_blog(sender, instance, *args, **kwargs):
+    """Signal keeps the blog in the full-text search index"""
+    search.index_blogs([instance])
+
+
+@receiver(post_delete, sender=Blog)
+def unindex_blog(sender, instance, *args, **kwargs):
+    """Signal removes the blog from the full-text search index"""
+    search.remove_blogs([instance.pk])
+
+
+@receiver(post_save, sender=Blog)
+@receiver(post_delete, sender=Blog)
+def invalidate_blog_cache(sender, instance, *args, **kwargs):
+    """Signal invalidates the cached responses of a changed blog"""
+    bump_generations([instance.pk], global_generation=True)
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def invalidate_comment_cache(sender, instance, *args, **kwargs):
+    """Signal invalidates the cached responses of a commented blog"""
+    bump_generations([instance.blog_id])
+
+
+@receiver(post_save, sender=Comment)
+def score_comment(sender, instance, created, *args, **kwargs):
+    """Signal adds a new comment to the trending score of its blog"""
+    if created:
+        trending.add_comment(instance)
+
+
+@receiver(post_delete, sender=Comment)
+def unscore_comment(sender, instance, *args, **kwargs):
+    """Signal removes a deleted comment from the trending score"""
+    trending.remove_comment(instance)
+
+
+@receiver(pre_delete, sender=Tag)
+@receiver(pre_save, sender=Tag)
+def collect_tag_blogs(sender, instance, *args, **kwargs):
+    """Signal keeps the blogs of a tag, to invalidate them after it"""
+    if instance.pk:
+        instance._tag_blog_ids = list(
+            instance.tag_blogs.values_list('id', flat=True)
+        )
+
+
+@receiver(post_save, sender=Tag)
+@receiver(post_delete, sender=Tag)
+def invalidate_tag_cache(sender, instance, *args, **kwargs):
+    """Signal invalidates the cached responses of the tag blogs"""
+    blog_ids = getattr(instance, '_tag_blog_ids', ())
+
+    if blog_ids:
+        Blog.objects.filter(pk__in=blog_ids).update(
+            updated_at=timezone.now()
+        )
+
+    bump_generations(blog_ids)
+
+
+@receiver(post_save, sender=Tag)
+@receiver(post_delete, sender=Tag)
+@receiver(tags_created, sender=Tag)
+def invalidate_tag_index(sender, *args, **kwargs):
+    """Signal drops the tag autocomplete index of the processes"""
+    autocomplete.invalidate()
+
+
+@receiver(post_save, sender=get_user_model())
+def invalidate_author_cache(sender, instance, created, update_fields=None,
+                            *args, **kwargs):
+    """
+    Signal invalidates the cached responses showing the username of a
+    saved user, touching its blogs and comments, as their updated_at is
+    the validator of their conditional requests
+    """
+    if created or (update_fields is not None
+                   and 'username' not in update_fields):
+        return
+
+    now = timezone.now()
+    Blog.objects.filter(author=instance).update(updated_at=now)
+    Comment.objects.filter(author=instance).update(updated_at=now)
+
+    blog_ids = set(
+        Blog.objects.filter(author=instance).values_list('id', flat=True)
+    )
+    blog_ids.update(
+        Comment.objects.filter(author=instance).values_list(
+            'blog_id', flat=True
+        )
+    )
+
+    bump_generations(blog_ids, global_generation=True)
+
+
+@receiver(m2m_changed, sender=Blog.tags.through)
+@receiver(m2m_changed, sender=Blog.likes.through)
+def invalidate_blog_relations_cache(sender, instance, action, reverse,
+                                    pk_set, *args, **kwargs):
+    """Signal invalidates the cached responses when blog relations change"""
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+
+    bump_generations(
+        changed_ids(instance, action, reverse, pk_set),
+        global_generation=True
+    )
+
+
+@receiver(m2m_changed, sender=Comment.likes.through)
+def invalidate_comment_likes_cache(sender, instance, action, reverse,
+                                   pk_set, *args, **kwargs):
+    """Signal invalidates the cached comments when their likes change"""
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+
+    if not reverse:
+        blog_ids = [instance.blog_id]
+    else:
+        blog_ids = Comment.objects.filter(
+            pk__in=changed_ids(instance, action, reverse, pk_set)
+        ).values_list('blog_id', flat=True).distinct()
+
+    bump_generations(blog_ids)
+
+
+@receiver(like_changed, sender=Blog)
+def invalidate_blog_like_cache(sender, object_id, *args, **kwargs):
+    """Signal invalidates the cached responses of a liked blog"""
+    bump_generations([object_id], global_generation=True)
+
+
+@receiver(like_changed, sender=Comment)
+def invalidate_comment_like_cache(sender, object_id, *args, **kwargs):
+    """Signal invalidates the cached comments of a liked comment"""
+    blog_ids = Comment.objects.filter(
+        pk=object_id
+    ).values_list('blog_id', flat=True)
+
+    bump_generations(blog_ids)
@@ -0,0 +1,136 @@
+import asyncio
+
+from django.test import TransactionTestCase, AsyncClient
+from django.conf import settings
+from django.core.handlers.asgi import ASGIHandler
+from django.core.cache import cache
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from blogs.models import Blog, Comment, Tag
+
+
+BLOGS_URL = reverse('blogs:blog-list')
+ASYNC_BLOGS_URL = reverse('blogs-async:blog-list')
+
+
+def detail_url(blog_slug, namespace='blogs'):
+    """Return blog detail URL"""
+    return reverse('%s:blog-detail' % namespace, args=[blog_slug])
+
+
+def retrieve_comments_url(blog_slug, namespace='blogs'):
+    """Return retrieve comment URL"""
+    return reverse('%s:comment-list' % namespace, args=[blog_slug])
+
+
+def blog_tags_url(blog_slug, namespace='blogs'):
+    """Return blog tags URL"""
+    return reverse('%s:blog-tags' % namespace, args=[blog_slug])
+
+
+class AsyncReadViewsTest(TransactionTestCase):
+    """
+    Test the async read views, which query from worker threads and so
+    only see committed rows
+    """
+
+    # Out of a transaction, reads may go to the replicas mirroring it
+    databases = '__all__'
+
+    def setUp(self):
+        cache.clear()
+
+        self.user = get_user_model().objects.create_user(
+            username='testusername',
+            password='testpassword'
+        )
+        self.token = Token.objects.create(user=self.user)
+        self.auth = 'Token ' + self.token.key
+
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=self.auth)
+
+        self.blog = Blog.objects.create(
+            author=self.user,
+            title='Some funny title',
+            content='Lorem ipsum dolor sit amet'
+        )
+        self.blog.tags.add(Tag.objects.create(content='django'))
+        self.blog.likes.add(self.user)
+        Comment.objects.create(
+            author=self.user,
+            blog=self.blog,
+            content='Funny content'
+        )
+
+    def test_auth_required(self):
+        """Test the async views require authentication"""
+        res = APIClient().get(ASYNC_BLOGS_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_same_payloads_as_sync_views(self):
+        """Test the async views answer the payloads of the sync views"""
+        slug = self.blog.slug
+
+        for url in (detail_url, retrieve_comments_url, blog_tags_url):
+            sync_res = self.client.get(url(slug))
+            async_res = self.client.get(url(slug, namespace='blogs-async'))
+
+            self.assertEqual(async_res.status_code, status.HTTP_200_OK)
+            self.assertEqual(async_res.json(), sync_res.json())
+
+        sync_res = self.client.get(BLOGS_URL)
+        async_res = self.client.get(ASYNC_BLOGS_URL)
+
+        self.assertEqual(
+            async_res.json()['results'],
+            sync_res.json()['results']
+        )
+        self.assertTrue(async_res.json()['results'][0]['user_has_liked'])
+
+    def test_write_methods_not_allowed(self):
+        """Test the async views are read only"""
+        res = self.client.delete(detail_url(self.blog.slug, 'blogs-async'))
+
+        self.assertEqual(res.status_code, status.HTTP_405_METHOD_NOT_ALLOWED)
+        self.assertTrue(Blog.objects.filter(id=self.blog.id).exists())
+
+    async def test_served_by_asgi_handler(self):
+        """Test the async views are served by the ASGI request handler"""
+        client = AsyncClient()
+
+        res = await client.get(
+            detail_url(self.blog.slug, 'blogs-async'),
+            headers=[
+                (b'host', b'testserver'),
+                (b'authorization', self.auth.encode()),
+            ]
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.json()['slug'], self.blog.slug)
+        self.assertGreater(int(res['X-Query-Count']), 0)
+
+    def test_middleware_chain_async(self):
+        """
+        Test every middleware runs in async mode under ASGI, so requests
+        reach the async views without the thread sync code runs in
+        """
+        handler = ASGIHandler()._middleware_chain
+        middleware = []
+
+        # Down to the handler, each middleware is wrapped as it is unless
+        # a sync one is adapted to the chain
+        while hasattr(getattr(handler, '__wrapped__', None), 'get_response'):
+            middleware.append(handler.__wrapped__)
+            handler = handler.__wrapped__.get_response
+
+        self.assertEqual(len(middleware), len(settings.MIDDLEWARE))
+        for instance in middleware:
+            self.assertTrue(asyncio.iscoroutinefunction(instance), instance)
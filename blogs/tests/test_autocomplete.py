@@ -0,0 +1,183 @@
+from unittest import mock
+
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.core.cache import cache
+from django.db import connection
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from blogs.models import Tag, Blog
+from blogs import autocomplete
+
+
+AUTOCOMPLETE_URL = reverse('blogs:tag-autocomplete')
+
+
+def sample_blog(author, tags, **params):
+    """Create and return a sample blog with the tags"""
+    defaults = {
+        'title': 'Some funny title',
+        'content': 'Lorem ipsum dolor sit amet, consectetur adipiscing elit'
+    }
+    defaults.update(params)
+
+    blog = Blog.objects.create(author=author, **defaults)
+    blog.tags.add(*tags)
+
+    return blog
+
+
+class PublicTagAutocompleteAPITest(TestCase):
+    """Test unauthenticated tag autocomplete API access"""
+
+    def test_auth_required(self):
+        """Test that authentication is required"""
+        res = APIClient().get(AUTOCOMPLETE_URL, {'prefix': 'dj'})
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class PrivateTagAutocompleteAPITest(TestCase):
+    """Test the tag autocomplete API"""
+
+    def setUp(self):
+        cache.clear()
+
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            username='testusername',
+            password='testpassword'
+        )
+        self.client.force_authenticate(self.user)
+
+        self.django = Tag.objects.create(content='django')
+        self.djangorest = Tag.objects.create(content='djangorest')
+        self.docker = Tag.objects.create(content='docker')
+        self.dj = Tag.objects.create(content='dj')
+
+        sample_blog(self.user, [self.djangorest, self.docker])
+        sample_blog(self.user, [self.djangorest, self.django])
+        sample_blog(self.user, [self.djangorest])
+
+    def get(self, **params):
+        return self.client.get(AUTOCOMPLETE_URL, params)
+
+    def test_most_used_first(self):
+        """Test the tags starting with the prefix, most used first"""
+        res = self.get(prefix='Dj')
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data, [
+            {'id': self.djangorest.id, 'content': 'djangorest',
+             'blogs_count': 3},
+            {'id': self.django.id, 'content': 'django', 'blogs_count': 1},
+            {'id': self.dj.id, 'content': 'dj', 'blogs_count': 0},
+        ])
+
+    def test_limit(self):
+        """Test the number of tags is limited with ?limit="""
+        res = self.get(prefix='d', limit=2)
+
+        self.assertEqual(
+            [tag['content'] for tag in res.data],
+            ['djangorest', 'django']
+        )
+
+    def test_prefix_required(self):
+        """Test a prefix is required"""
+        res = self.get(prefix=' ')
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_invalid_limit(self):
+        """Test a non integer limit is a bad request"""
+        res = self.get(prefix='d', limit='many')
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_index_reused(self):
+        """Test the index answers searches without querying tags"""
+        self.get(prefix='d')
+
+        with CaptureQueriesContext(connection) as queries:
+            res = self.get(prefix='doc')
+
+        self.assertEqual([tag['content'] for tag in res.data], ['docker'])
+        self.assertFalse(
+            any('blogs_tag' in query['sql'] for query in queries)
+        )
+
+    def test_invalidated_on_save_and_delete(self):
+        """Test saved and deleted tags are answered by the next search"""
+        self.get(prefix='d')
+
+        Tag.objects.create(content='Djinn')
+        self.docker.delete()
+
+        res = self.get(prefix='d')
+
+        self.assertIn('djinn', [tag['content'] for tag in res.data])
+        self.assertNotIn('docker', [tag['content'] for tag in res.data])
+
+    def test_invalidated_on_tag_names(self):
+        """Test tags upserted by a blog tag_names are answered"""
+        self.get(prefix='d')
+
+        res = self.client.post(reverse('blogs:blog-list'), {
+            'title': 'Another title',
+            'content': 'Some content',
+            'tag_names': ['djinn'],
+        }, format='json')
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+
+        res = self.get(prefix='dji')
+
+        self.assertEqual(res.data[0]['content'], 'djinn')
+        self.assertEqual(res.data[0]['blogs_count'], 1)
+
+    def test_not_invalidated_by_existing_tag_names(self):
+        """Test tag_names of existing tags keep the index"""
+        self.get(prefix='d')
+        generation = cache.get(autocomplete.GENERATION_KEY)
+
+        res = self.client.post(reverse('blogs:blog-list'), {
+            'title': 'Another title',
+            'content': 'Some content',
+            'tag_names': ['Django', 'docker'],
+        }, format='json')
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+
+        self.assertEqual(cache.get(autocomplete.GENERATION_KEY), generation)
+
+    def test_database_while_building(self):
+        """Test the database answers while another thread builds"""
+        with mock.patch.object(autocomplete, '_index', None), \
+                mock.patch.object(autocomplete, '_lock') as lock:
+            lock.acquire.return_value = False
+            res = self.get(prefix='Dj')
+
+        self.assertEqual(
+            [tag['content'] for tag in res.data],
+            ['djangorest', 'django', 'dj']
+        )
+
+    @override_settings(TAG_AUTOCOMPLETE_INDEX=False)
+    def test_database_fallback(self):
+        """Test the database answers with the index disabled"""
+        with CaptureQueriesContext(connection) as queries:
+            res = self.get(prefix='djang')
+
+        self.assertEqual(
+            res.data,
+            [
+                {'id': self.djangorest.id, 'content': 'djangorest',
+                 'blogs_count': 3},
+                {'id': self.django.id, 'content': 'django',
+                 'blogs_count': 1},
+            ]
+        )
+        self.assertIn('LIKE', queries[-1]['sql'])
@@ -1,4 +1,7 @@
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.db import connection
+from django.core.cache import cache
 from django.contrib.auth import get_user_model
 from django.urls import reverse
 from django.utils.text import slugify
@@ -78,8 +81,8 @@ class PrivateBlogAPITest(TestCase):
         res = self.client.get(BLOGS_URL)
 
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        self.assertEqual(res.data[0], blog2.data)
-        self.assertEqual(res.data[1], blog1.data)
+        self.assertEqual(res.data['results'][0], blog2.data)
+        self.assertEqual(res.data['results'][1], blog1.data)
 
     def test_create_minimum_blog(self):
         """Test creating blog"""
@@ -234,8 +237,8 @@ class PrivateBlogAPITest(TestCase):
         serializer = MyBlogSerializer(blogs, many=True)
 
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(res.data), 1)
-        self.assertEqual(res.data, serializer.data)
+        self.assertEqual(len(res.data['results']), 1)
+        self.assertEqual(res.data['results'], serializer.data)
 
     def test_create_blog_with_tags_successfully(self):
         """Test create blog with existent tags successfully"""
@@ -277,3 +280,134 @@ class PrivateBlogAPITest(TestCase):
         res = self.client.post(BLOGS_URL, payload)
 
         self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_retrieve_blogs_constant_queries(self):
+        """Test the blog list query count does not grow with the blogs"""
+        user2 = get_user_model().objects.create_user(
+            username='testqueries',
+            password='testpassword'
+        )
+        tag = create_tag('Tech')
+
+        def create_blogs(start, end):
+            slugs = ['blog-%d' % number for number in range(start, end)]
+            Blog.objects.bulk_create([
+                Blog(
+                    author=user2,
+                    title=slug,
+                    content='Lorem ipsum dolor sit amet',
+                    slug=slug,
+                    likes_count=1
+                )
+                for slug in slugs
+            ])
+            ids = Blog.objects.filter(
+                slug__in=slugs
+            ).values_list('id', flat=True)
+
+            Blog.likes.through.objects.bulk_create([
+                Blog.likes.through(blog_id=id, vibloguser_id=self.user.id)
+                for id in ids
+            ])
+            Blog.tags.through.objects.bulk_create([
+                Blog.tags.through(blog_id=id, tag_id=tag.id)
+                for id in ids
+            ])
+            # bulk inserts do not send the cache invalidation signals
+            cache.clear()
+
+        create_blogs(0, 1)
+        with CaptureQueriesContext(connection) as one_blog:
+            res = self.client.get(BLOGS_URL, {'page_size': 100})
+        self.assertEqual(len(res.data['results']), 1)
+
+        create_blogs(1, 500)
+        with CaptureQueriesContext(connection) as many_blogs:
+            res = self.client.get(BLOGS_URL, {'page_size': 100})
+        self.assertEqual(len(res.data['results']), 100)
+
+        self.assertEqual(len(one_blog), len(many_blogs))
+
+        result = res.data['results'][0]
+        self.assertEqual(result['likes_count'], 1)
+        self.assertTrue(result['user_has_liked'])
+        self.assertEqual(result['tags'], [tag.id])
+
+    def test_create_blog_with_tag_names(self):
+        """Test create blog with new and existent tag names"""
+        tag = create_tag('tech')
+
+        payload = {
+            'title': 'Macbook Pro is really Pro?',
+            'content': 'Lorem ipsum dolor sit amet, consectetur',
+            'tag_names': ['Tech', 'Apple', 'apple']
+        }
+
+        res = self.client.post(BLOGS_URL, payload, format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+
+        blog = Blog.objects.get(id=res.data['id'])
+        apple = Tag.objects.get(content='apple')
+
+        self.assertEqual(set(res.data['tags']), {tag.id, apple.id})
+        self.assertEqual(
+            set(blog.tags.values_list('content', flat=True)),
+            {'tech', 'apple'}
+        )
+
+    def test_update_blog_tags(self):
+        """Test updating the blog tags replaces them"""
+        blog = sample_blog(author=self.user)
+        tag1 = create_tag('tech')
+        tag2 = create_tag('apple')
+        blog.tags.add(tag1)
+
+        payload = {
+            'tags': [tag2.id],
+            'tag_names': ['django']
+        }
+
+        self.client.patch(detail_url(blog.slug), payload, format='json')
+
+        self.assertEqual(
+            set(blog.tags.values_list('content', flat=True)),
+            {'apple', 'django'}
+        )
+
+    def test_create_blog_tags_constant_queries(self):
+        """Test the create queries do not grow with the tags"""
+        tags = [create_tag('tag%d' % number) for number in range(20)]
+
+        def create_blog(count):
+            payload = {
+                'title': 'Blog with %d tags' % count,
+                'content': 'Lorem ipsum dolor sit amet, consectetur',
+                'tags': [tag.id for tag in tags[:count]],
+                'tag_names': ['name%d' % number for number in range(count)]
+            }
+
+            with CaptureQueriesContext(connection) as queries:
+                res = self.client.post(BLOGS_URL, payload, format='json')
+
+            self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+            self.assertEqual(len(res.data['tags']), count * 2)
+
+            return len(queries)
+
+        self.assertEqual(create_blog(1), create_blog(20))
+
+    def test_create_blog_with_unknown_tags(self):
+        """Test every tag id is validated"""
+        tag = create_tag('tech')
+
+        payload = {
+            'title': 'Macbook Pro is really Pro?',
+            'content': 'Lorem ipsum dolor sit amet, consectetur',
+            'tags': [tag.id, 999]
+        }
+
+        res = self.client.post(BLOGS_URL, payload, format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('999', str(res.data['tags']))
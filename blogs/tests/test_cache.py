@@ -0,0 +1,164 @@
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.db import connection
+from django.core.cache import cache
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+
+from rest_framework.test import APIClient
+
+from blogs.models import Blog, Comment, Tag
+
+
+BLOGS_URL = reverse('blogs:blog-list')
+
+
+def detail_url(blog_slug):
+    """Return blog detail URL"""
+    return reverse('blogs:blog-detail', args=[blog_slug])
+
+
+def retrieve_comments_url(blog_slug):
+    """Return retrieve comment URL"""
+    return reverse('blogs:comment-list', args=[blog_slug])
+
+
+def blog_tags_url(blog_slug):
+    """Return blog tags URL"""
+    return reverse('blogs:blog-tags', args=[blog_slug])
+
+
+def blog_likes_url(blog_id):
+    """Return liked blog url"""
+    return reverse('blogs:blog-like', args=[blog_id])
+
+
+class ResponseCacheTest(TestCase):
+    """Test the versioned response cache of the read endpoints"""
+
+    def setUp(self):
+        cache.clear()
+
+        self.client = APIClient()
+
+        self.user = get_user_model().objects.create_user(
+            username='testusername',
+            password='testpassword'
+        )
+        self.user2 = get_user_model().objects.create_user(
+            username='testcache',
+            password='testpassword'
+        )
+
+        self.client.force_authenticate(self.user)
+
+        self.blog = Blog.objects.create(
+            author=self.user,
+            title='Some funny title',
+            content='Lorem ipsum dolor sit amet'
+        )
+
+    def test_cached_blog_list(self):
+        """Test the second blog list is served from the cache"""
+        with CaptureQueriesContext(connection) as first_queries:
+            first = self.client.get(BLOGS_URL)
+
+        with CaptureQueriesContext(connection) as queries:
+            second = self.client.get(BLOGS_URL)
+
+        self.assertEqual(first.data, second.data)
+        self.assertLess(len(queries), len(first_queries))
+
+    def test_user_has_liked_is_overlaid(self):
+        """Test a cached payload shows the like state of each user"""
+        self.blog.likes.add(self.user2)
+        self.client.get(detail_url(self.blog.slug))
+
+        res = self.client.get(detail_url(self.blog.slug))
+        self.assertFalse(res.data['user_has_liked'])
+
+        self.client.force_authenticate(self.user2)
+        res = self.client.get(detail_url(self.blog.slug))
+        self.assertTrue(res.data['user_has_liked'])
+        self.assertEqual(res.data['likes_count'], 1)
+
+    def test_like_invalidates_blog_cache(self):
+        """Test liking a blog invalidates its list and detail"""
+        self.client.get(BLOGS_URL)
+        self.client.get(detail_url(self.blog.slug))
+
+        self.client.post(blog_likes_url(self.blog.id))
+
+        res = self.client.get(BLOGS_URL)
+        self.assertEqual(res.data['results'][0]['likes_count'], 1)
+        res = self.client.get(detail_url(self.blog.slug))
+        self.assertEqual(res.data['likes_count'], 1)
+
+    def test_update_invalidates_blog_cache(self):
+        """Test updating a blog invalidates its detail"""
+        self.client.get(detail_url(self.blog.slug))
+
+        self.client.patch(detail_url(self.blog.slug), {'title': 'Updated'})
+
+        res = self.client.get(detail_url(self.blog.slug))
+        self.assertEqual(res.data['title'], 'Updated')
+
+    def test_comment_invalidates_comment_cache(self):
+        """Test new comments and comment likes invalidate the comments"""
+        url = retrieve_comments_url(self.blog.slug)
+        self.client.get(url)
+
+        comment = Comment.objects.create(
+            author=self.user2,
+            content='Some content blabla',
+            blog=self.blog
+        )
+        res = self.client.get(url)
+        self.assertEqual(len(res.data['results']), 1)
+
+        self.user.liked_comments.add(comment)
+        res = self.client.get(url)
+        self.assertEqual(res.data['results'][0]['likes_count'], 1)
+
+    def test_username_change_invalidates_author_cache(self):
+        """Test renaming a user invalidates the payloads showing it"""
+        Comment.objects.create(
+            author=self.user2,
+            content='Some content blabla',
+            blog=self.blog
+        )
+        urls = (
+            BLOGS_URL,
+            detail_url(self.blog.slug),
+            retrieve_comments_url(self.blog.slug),
+        )
+        for url in urls:
+            self.client.get(url)
+
+        for user in (self.user, self.user2):
+            user.username += 'renamed'
+            user.save()
+
+        res = self.client.get(BLOGS_URL)
+        self.assertEqual(res.data['results'][0]['author'], self.user.username)
+        res = self.client.get(detail_url(self.blog.slug))
+        self.assertEqual(res.data['author'], self.user.username)
+        res = self.client.get(retrieve_comments_url(self.blog.slug))
+        self.assertEqual(
+            res.data['results'][0]['author'],
+            self.user2.username
+        )
+
+    def test_tags_invalidate_blog_tags_cache(self):
+        """Test changing the blog tags invalidates its tags"""
+        tag = Tag.objects.create(content='Tech')
+        url = blog_tags_url(self.blog.slug)
+        self.client.get(url)
+
+        tag.tag_blogs.add(self.blog)
+        res = self.client.get(url)
+        self.assertEqual(len(res.data), 1)
+
+        tag.delete()
+        res = self.client.get(url)
+        self.assertEqual(len(res.data), 0)
@@ -1,4 +1,9 @@
+from unittest import mock
+
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.db import connection, IntegrityError
+from django.core.cache import cache
 from django.contrib.auth import get_user_model
 from django.urls import reverse
 
@@ -6,6 +11,7 @@ from rest_framework import status
 from rest_framework.test import APIClient
 
 from blogs.models import Blog, Comment
+from blogs.serializers import CommentSerializer
 
 
 def create_comment_url(blog_slug):
@@ -91,6 +97,34 @@ class PrivateBlogAPITest(TestCase):
 
         self.assertTrue(comment_exist)
 
+    def test_create_comment_twice_not_allowed(self):
+        """Test an author may only comment a blog once"""
+        blog = sample_blog(author=self.user)
+
+        payload = {
+            'content': 'viblog funny comment'
+        }
+
+        url = create_comment_url(blog.slug)
+
+        self.client.post(url, payload)
+        res = self.client.post(url, payload)
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(blog.comments.count(), 1)
+
+    def test_create_comment_other_integrity_error_raised(self):
+        """Test integrity errors other than a second comment are raised"""
+        blog = sample_blog(author=self.user)
+
+        with mock.patch.object(CommentSerializer, 'save',
+                               side_effect=IntegrityError('NOT NULL')):
+            with self.assertRaises(IntegrityError):
+                self.client.post(
+                    create_comment_url(blog.slug),
+                    {'content': 'viblog funny comment'}
+                )
+
     def test_retrieve_blog_comments(self):
         """Test retrieving a blog comments"""
         blog = sample_blog(author=self.user)
@@ -101,8 +135,13 @@ class PrivateBlogAPITest(TestCase):
             blog=blog
         )
 
+        user2 = get_user_model().objects.create_user(
+            username='testretrieve',
+            password='testpassword'
+        )
+
         comment2 = Comment.objects.create(
-            author=self.user,
+            author=user2,
             content='Blabla content some',
             blog=blog
         )
@@ -112,8 +151,8 @@ class PrivateBlogAPITest(TestCase):
         res = self.client.get(url)
 
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        self.assertEqual(res.data[0]['content'], comment2.content)
-        self.assertEqual(res.data[1]['content'], comment1.content)
+        self.assertEqual(res.data['results'][0]['content'], comment2.content)
+        self.assertEqual(res.data['results'][1]['content'], comment1.content)
 
     def test_blog_detail_view(self):
         """Test viewing a blog detail"""
@@ -272,3 +311,48 @@ class PrivateBlogAPITest(TestCase):
 
         self.assertEqual(res.data['likes_count'], 1)
         self.assertEqual(res.data['user_has_liked'], True)
+
+    def test_retrieve_blog_comments_constant_queries(self):
+        """Test the comment list query count does not grow with comments"""
+        blog = sample_blog(author=self.user)
+        url = retrieve_comments_url(blog.slug)
+
+        def create_comments(start, end):
+            usernames = ['testcomments%d' % number
+                         for number in range(start, end)]
+            get_user_model().objects.bulk_create([
+                get_user_model()(username=username)
+                for username in usernames
+            ])
+            authors = get_user_model().objects.filter(
+                username__in=usernames
+            )
+            Comment.objects.bulk_create([
+                Comment(author=author, content='Some content', blog=blog,
+                        likes_count=1)
+                for author in authors
+            ])
+            Comment.likes.through.objects.bulk_create([
+                Comment.likes.through(comment_id=id,
+                                      vibloguser_id=self.user.id)
+                for id in blog.comments.values_list('id', flat=True)
+            ], ignore_conflicts=True)
+            # bulk inserts do not send the cache invalidation signals
+            cache.clear()
+
+        create_comments(0, 1)
+        with CaptureQueriesContext(connection) as one_comment:
+            res = self.client.get(url, {'page_size': 100})
+        self.assertEqual(len(res.data['results']), 1)
+
+        create_comments(1, 100)
+        with CaptureQueriesContext(connection) as many_comments:
+            res = self.client.get(url, {'page_size': 100})
+        self.assertEqual(len(res.data['results']), 100)
+
+        self.assertEqual(len(one_comment), len(many_comments))
+
+        result = res.data['results'][0]
+        self.assertEqual(result['blog_slug'], blog.slug)
+        self.assertEqual(result['likes_count'], 1)
+        self.assertTrue(result['user_has_liked'])
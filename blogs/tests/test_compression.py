@@ -0,0 +1,109 @@
+import gzip
+import json
+from unittest import mock, skipIf
+
+from django.test import TestCase
+from django.core.cache import cache
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from blogs.models import Blog
+from core import compression
+
+
+BLOGS_URL = reverse('blogs:blog-list')
+
+
+def detail_url(blog_slug):
+    """Return blog detail URL"""
+    return reverse('blogs:blog-detail', args=[blog_slug])
+
+
+class CompressionTest(TestCase):
+    """Test the compression of the API JSON responses"""
+
+    def setUp(self):
+        cache.clear()
+
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            username='testusername',
+            password='testpassword'
+        )
+        self.client.force_authenticate(self.user)
+
+        self.blog = Blog.objects.create(
+            author=self.user,
+            title='Some funny title',
+            content='Lorem ipsum dolor sit amet ' * 200
+        )
+
+    def get(self, url, encoding='gzip', **extra):
+        return self.client.get(url, HTTP_ACCEPT_ENCODING=encoding, **extra)
+
+    def test_gzip_response(self):
+        """Test large responses are gzipped for clients accepting it"""
+        with mock.patch.object(compression, 'brotli', None):
+            res = self.get(BLOGS_URL, 'gzip, deflate, br')
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res['Content-Encoding'], 'gzip')
+        self.assertIn('Accept-Encoding', res['Vary'])
+        self.assertEqual(int(res['Content-Length']), len(res.content))
+
+        payload = json.loads(gzip.decompress(res.content))
+        self.assertEqual(payload['results'][0]['id'], self.blog.id)
+
+    @skipIf(compression.brotli is None, 'brotli is not installed')
+    def test_brotli_preferred(self):
+        """Test Brotli is preferred when the client accepts it"""
+        res = self.get(BLOGS_URL, 'gzip, deflate, br')
+
+        self.assertEqual(res['Content-Encoding'], 'br')
+        payload = json.loads(compression.brotli.decompress(res.content))
+        self.assertEqual(payload['results'][0]['id'], self.blog.id)
+
+    def test_not_accepted(self):
+        """Test responses are not compressed for other clients"""
+        res = self.get(BLOGS_URL, 'identity')
+
+        self.assertNotIn('Content-Encoding', res)
+        self.assertEqual(res.json()['results'][0]['id'], self.blog.id)
+
+    def test_small_response(self):
+        """Test responses under the minimum size are not compressed"""
+        res = self.get(reverse('blogs:tag-list'))
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertNotIn('Content-Encoding', res)
+        self.assertIn('Accept-Encoding', res['Vary'])
+
+    def test_cached_response_compressed_once(self):
+        """Test the compressed bytes of a cached response are reused"""
+        with mock.patch.object(compression, 'brotli', None), \
+                mock.patch.object(
+                    compression,
+                    'gzip_compress',
+                    wraps=compression.gzip_compress
+                ) as gzip_compress:
+            first = self.get(BLOGS_URL)
+            second = self.get(BLOGS_URL)
+
+        self.assertEqual(gzip_compress.call_count, 1)
+        self.assertEqual(first.content, second.content)
+
+    def test_weak_etag(self):
+        """Test compressed responses have a weak ETag still validating"""
+        res = self.get(detail_url(self.blog.slug))
+
+        self.assertTrue(res['ETag'].startswith('W/"'))
+
+        res = self.get(
+            detail_url(self.blog.slug),
+            HTTP_IF_NONE_MATCH=res['ETag']
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
@@ -0,0 +1,182 @@
+from datetime import timedelta
+
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.db import connection
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from django.utils import timezone
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from blogs.models import Blog, Comment
+
+
+BLOGS_URL = reverse('blogs:blog-list')
+
+
+def detail_url(blog_slug):
+    """Return blog detail URL"""
+    return reverse('blogs:blog-detail', args=[blog_slug])
+
+
+def retrieve_comments_url(blog_slug):
+    """Return retrieve comment URL"""
+    return reverse('blogs:comment-list', args=[blog_slug])
+
+
+def blog_likes_url(blog_id):
+    """Return liked blog url"""
+    return reverse('blogs:blog-like', args=[blog_id])
+
+
+def comment_likes_url(comment_id):
+    """Return liked comment url"""
+    return reverse('blogs:comment-like', args=[comment_id])
+
+
+class ConditionalGetTest(TestCase):
+    """Test the ETag and Last-Modified of the read endpoints"""
+
+    def setUp(self):
+        self.client = APIClient()
+
+        self.user = get_user_model().objects.create_user(
+            username='testusername',
+            password='testpassword'
+        )
+
+        self.client.force_authenticate(self.user)
+
+        self.blog = Blog.objects.create(
+            author=self.user,
+            title='Some funny title',
+            content='Lorem ipsum dolor sit amet'
+        )
+
+    def assertNotModified(self, url):
+        """Assert the url answers 304 to its own ETag, in one query"""
+        res = self.client.get(url)
+        self.assertIn('Last-Modified', res)
+
+        with CaptureQueriesContext(connection) as queries:
+            res = self.client.get(url, HTTP_IF_NONE_MATCH=res['ETag'])
+
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(res.content, b'')
+        self.assertEqual(len(queries), 1)
+
+    def test_blog_list_not_modified(self):
+        """Test the blog list answers 304 to a matching ETag"""
+        self.assertNotModified(BLOGS_URL)
+
+    def test_blog_list_validators_not_counted(self):
+        """Test the blog list validators are read without counting blogs"""
+        res = self.client.get(BLOGS_URL)
+
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(BLOGS_URL, HTTP_IF_NONE_MATCH=res['ETag'])
+
+        self.assertNotIn('COUNT', queries[0]['sql'])
+
+    def test_delete_changes_blog_list_etag(self):
+        """Test deleting a blog changes the blog list ETag"""
+        Blog.objects.create(
+            author=self.user,
+            title='Another title',
+            content='Some content'
+        )
+        etag = self.client.get(BLOGS_URL)['ETag']
+
+        # The last modification time is the one of the other blog
+        self.blog.delete()
+        res = self.client.get(BLOGS_URL, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(res['ETag'], etag)
+
+    def test_blog_detail_not_modified(self):
+        """Test the blog detail answers 304 to a matching ETag"""
+        self.assertNotModified(detail_url(self.blog.slug))
+
+    def test_comment_list_not_modified(self):
+        """Test the comment list answers 304 to a matching ETag"""
+        Comment.objects.create(
+            author=self.user,
+            content='Some content blabla',
+            blog=self.blog
+        )
+
+        self.assertNotModified(retrieve_comments_url(self.blog.slug))
+
+    def test_like_changes_blog_etag(self):
+        """Test liking a blog changes the list and detail ETags"""
+        for url in (BLOGS_URL, detail_url(self.blog.slug)):
+            etag = self.client.get(url)['ETag']
+
+            self.client.post(blog_likes_url(self.blog.id))
+            res = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+            self.client.delete(blog_likes_url(self.blog.id))
+
+    def test_comment_like_changes_comment_list_etag(self):
+        """Test liking a comment changes the comment list ETag"""
+        comment = Comment.objects.create(
+            author=self.user,
+            content='Some content blabla',
+            blog=self.blog
+        )
+        url = retrieve_comments_url(self.blog.slug)
+        etag = self.client.get(url)['ETag']
+
+        self.client.post(comment_likes_url(comment.id))
+        res = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['results'][0]['likes_count'], 1)
+
+    def test_username_change_changes_validators(self):
+        """Test renaming the author changes the ETags and Last-Modified"""
+        Comment.objects.create(
+            author=self.user,
+            content='Some content blabla',
+            blog=self.blog
+        )
+        # Last-Modified is to the second
+        an_hour_ago = timezone.now() - timedelta(hours=1)
+        Blog.objects.update(updated_at=an_hour_ago)
+        Comment.objects.update(updated_at=an_hour_ago)
+        urls = (
+            BLOGS_URL,
+            detail_url(self.blog.slug),
+            retrieve_comments_url(self.blog.slug),
+        )
+        validators = [self.client.get(url) for url in urls]
+
+        self.user.username = 'renamedusername'
+        self.user.save()
+
+        for url, res in zip(urls, validators):
+            for header, value in (
+                ('HTTP_IF_NONE_MATCH', res['ETag']),
+                ('HTTP_IF_MODIFIED_SINCE', res['Last-Modified']),
+            ):
+                res_again = self.client.get(url, **{header: value})
+                self.assertEqual(res_again.status_code, status.HTTP_200_OK)
+
+    def test_etag_differs_by_user(self):
+        """Test other users do not share the ETag"""
+        etag = self.client.get(detail_url(self.blog.slug))['ETag']
+
+        user2 = get_user_model().objects.create_user(
+            username='testetag',
+            password='testpassword'
+        )
+        self.client.force_authenticate(user2)
+        res = self.client.get(
+            detail_url(self.blog.slug), HTTP_IF_NONE_MATCH=etag
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
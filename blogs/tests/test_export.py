@@ -0,0 +1,115 @@
+import json
+import os
+import tempfile
+from io import StringIO
+
+from django.test import TestCase
+from django.core.management import call_command
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from blogs.export import export_lines
+from blogs.models import Blog, Comment, Tag
+
+
+EXPORT_URL = reverse('blogs:blog-export')
+
+
+def sample_blog(author, **params):
+    """Create and return a sample blog"""
+    defaults = {
+        'title': 'Some funny title',
+        'content': 'Lorem ipsum dolor sit amet, consectetur adipiscing elit'
+    }
+    defaults.update(params)
+
+    return Blog.objects.create(author=author, **defaults)
+
+
+class BlogExportTest(TestCase):
+    """Test the newline-delimited JSON export of the blogs"""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            username='testusername',
+            password='testpassword'
+        )
+        self.user2 = get_user_model().objects.create_user(
+            username='testexport',
+            password='testpassword'
+        )
+
+        self.blog = sample_blog(author=self.user)
+        self.blog.tags.add(Tag.objects.create(content='django'))
+        self.blog.likes.add(self.user, self.user2)
+        Comment.objects.create(
+            author=self.user2,
+            blog=self.blog,
+            content='Funny content'
+        )
+        sample_blog(author=self.user2, title='Another title')
+
+    def test_export_requires_admin(self):
+        """Test only admins can export the blogs"""
+        self.client.force_authenticate(self.user)
+
+        res = self.client.get(EXPORT_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_export_streams_blogs(self):
+        """Test the endpoint streams a JSON line per blog"""
+        self.user.is_staff = True
+        self.user.save()
+        self.client.force_authenticate(self.user)
+
+        res = self.client.get(EXPORT_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertTrue(res.streaming)
+        self.assertEqual(res['Content-Type'], 'application/x-ndjson')
+
+        records = [
+            json.loads(line)
+            for line in b''.join(res.streaming_content).splitlines()
+        ]
+
+        self.assertEqual(len(records), 2)
+        self.assertEqual(records[0]['slug'], self.blog.slug)
+        self.assertEqual(records[0]['tags'], ['django'])
+        self.assertEqual(records[0]['likes_count'], 2)
+        self.assertEqual(records[0]['comments'][0]['author'], 'testexport')
+        self.assertEqual(records[1]['comments'], [])
+
+    def test_export_queries_per_chunk(self):
+        """Test the export runs the same queries for every chunk"""
+        for i in range(4):
+            blog = sample_blog(author=self.user, title='Title %d' % i)
+            Comment.objects.create(author=self.user, blog=blog, content='x')
+
+        # A single blogs query, and the tags and comments of each chunk
+        with self.assertNumQueries(1 + 2 * 3):
+            lines = list(export_lines(chunk_size=2))
+
+        self.assertEqual(len(lines), 6)
+
+    def test_export_command(self):
+        """Test the command writes the export to stdout or a file"""
+        out = StringIO()
+        call_command('export_blogs', stdout=out)
+
+        self.assertEqual(len(out.getvalue().splitlines()), 2)
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'blogs.ndjson')
+            out = StringIO()
+            call_command('export_blogs', output=path, stdout=out)
+
+            with open(path) as export:
+                self.assertEqual(len(export.readlines()), 2)
+
+        self.assertIn('Exported 2 blogs', out.getvalue())
@@ -0,0 +1,161 @@
+from datetime import timedelta
+from types import SimpleNamespace
+
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.db import connection
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from django.utils import timezone
+
+from rest_framework.test import APIClient
+
+from blogs.models import Tag, Blog, Comment
+from blogs.serializers import (
+    BlogSerializer,
+    MyBlogSerializer,
+    CommentSerializer
+)
+from blogs.fast_serializers import (
+    BlogValuesSerializer,
+    MyBlogValuesSerializer,
+    CommentValuesSerializer
+)
+
+
+BLOGS_URL = reverse('blogs:blog-list')
+MY_BLOGS_URL = reverse('blogs:blog-me')
+
+
+def retrieve_comments_url(blog_slug):
+    """Return retrieve comment URL"""
+    return reverse('blogs:comment-list', args=[blog_slug])
+
+
+def view_context(blog_slug):
+    """Return the serializer context of a view of the blog URL"""
+    return {'view': SimpleNamespace(kwargs={'slug': blog_slug})}
+
+
+class ValuesSerializerEquivalenceTest(TestCase):
+    """Test the values serializers give the model serializers output"""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            username='testusername',
+            password='testpassword'
+        )
+        self.other = get_user_model().objects.create_user(
+            username='otherusername',
+            password='testpassword'
+        )
+        self.client.force_authenticate(self.user)
+
+        tags = [Tag.objects.create(content='tag%d' % i) for i in range(3)]
+        now = timezone.now()
+
+        for i in range(6):
+            blog = Blog.objects.create(
+                author=self.user if i % 2 else self.other,
+                title='Some funny title %d' % i,
+                content='Lorem ipsum dolor sit amet %d' % i
+            )
+            blog.tags.set(tags[:i % 4])
+            if i % 3:
+                blog.likes.add(self.user)
+
+            Blog.objects.filter(pk=blog.pk).update(
+                created_at=now - timedelta(days=i, hours=i)
+            )
+
+            for author in (self.user, self.other)[:i % 3]:
+                comment = Comment.objects.create(
+                    author=author,
+                    blog=blog,
+                    content='Some content %d' % i
+                )
+                comment.likes.add(self.other)
+
+        self.blog = Blog.objects.filter(comments__isnull=False).first()
+
+    def assertSameOutput(self, serializer_class, values_class, queryset,
+                         context=None):
+        """Assert both serializers give the same output for the queryset"""
+        expected = serializer_class(
+            list(queryset),
+            many=True,
+            context=context or {}
+        ).data
+        values = queryset.prefetch_related(None).values(
+            *values_class.lookups()
+        )
+
+        self.assertTrue(expected)
+        self.assertEqual(
+            values_class(values, context=context).data,
+            expected
+        )
+
+    def test_blog_values_serializer(self):
+        """Test the blog values serializer output"""
+        self.assertSameOutput(
+            BlogSerializer,
+            BlogValuesSerializer,
+            Blog.objects.with_likes(self.user).order_by('-created_at')
+        )
+
+    def test_my_blog_values_serializer(self):
+        """Test the user blog values serializer output"""
+        self.assertSameOutput(
+            MyBlogSerializer,
+            MyBlogValuesSerializer,
+            Blog.objects.filter(
+                author=self.user
+            ).with_likes(self.user).order_by('created_at')
+        )
+
+    def test_comment_values_serializer(self):
+        """Test the comment values serializer output"""
+        self.assertSameOutput(
+            CommentSerializer,
+            CommentValuesSerializer,
+            Comment.objects.filter(blog=self.blog).select_related(
+                'blog'
+            ).with_likes(self.user).order_by('-created_at'),
+            view_context(self.blog.slug)
+        )
+
+    def test_comment_list_without_blog_columns(self):
+        """Test the comment list reads no column of the blogs"""
+        with CaptureQueriesContext(connection) as queries:
+            res = self.client.get(retrieve_comments_url(self.blog.slug))
+
+        self.assertEqual(res.data['results'][0]['blog_slug'], self.blog.slug)
+        for query in queries:
+            if 'FROM "blogs_comment"' in query['sql']:
+                columns = query['sql'].split(' FROM ')[0]
+                self.assertNotIn('blogs_blog', columns)
+
+    def test_list_endpoints_output(self):
+        """Test the list endpoints answer the model serializers output"""
+        cases = (
+            (BLOGS_URL, BlogSerializer, Blog.objects.with_likes(
+                self.user
+            ).order_by('-created_at', '-id')),
+            (MY_BLOGS_URL, MyBlogSerializer, Blog.objects.filter(
+                author=self.user
+            ).with_likes(self.user).order_by('created_at', 'id')),
+            (retrieve_comments_url(self.blog.slug), CommentSerializer,
+             Comment.objects.filter(blog=self.blog).select_related(
+                 'blog'
+             ).with_likes(self.user).order_by('-created_at', '-id')),
+        )
+
+        for url, serializer_class, queryset in cases:
+            res = self.client.get(url)
+
+            self.assertEqual(
+                res.data['results'],
+                serializer_class(queryset, many=True).data
+            )
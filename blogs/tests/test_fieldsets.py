@@ -0,0 +1,166 @@
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.core.cache import cache
+from django.db import connection
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from blogs.models import Blog, Comment
+
+
+BLOGS_URL = reverse('blogs:blog-list')
+MY_BLOGS_URL = reverse('blogs:blog-me')
+
+LONG_CONTENT = 'Lorem ipsum dolor sit amet,\n\nconsectetur elit. ' * 20
+
+
+def detail_url(blog_slug):
+    """Return blog detail URL"""
+    return reverse('blogs:blog-detail', args=[blog_slug])
+
+
+def retrieve_comments_url(blog_slug):
+    """Return retrieve comment URL"""
+    return reverse('blogs:comment-list', args=[blog_slug])
+
+
+class SparseFieldsetTest(TestCase):
+    """Test the fields and omit parameters of the blog endpoints"""
+
+    def setUp(self):
+        cache.clear()
+
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            username='testusername',
+            password='testpassword'
+        )
+        self.client.force_authenticate(self.user)
+
+        self.blog = Blog.objects.create(
+            author=self.user,
+            title='Some funny title',
+            content=LONG_CONTENT
+        )
+        Comment.objects.create(
+            author=self.user,
+            blog=self.blog,
+            content='Some content blabla'
+        )
+
+    def get(self, url, **params):
+        """Return the response and the SQL of the queries it ran"""
+        with CaptureQueriesContext(connection) as queries:
+            res = self.client.get(url, params)
+
+        return res, ' '.join(query['sql'] for query in queries)
+
+    def test_blog_list_fields(self):
+        """Test only the fields asked for, and the id, are answered"""
+        res, sql = self.get(BLOGS_URL, fields='title,slug')
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            list(res.data['results'][0]),
+            ['id', 'slug', 'title']
+        )
+        self.assertNotIn('"blogs_blog"."content"', sql)
+
+    def test_blog_list_omit(self):
+        """Test the omitted fields are not answered nor read"""
+        res, sql = self.get(BLOGS_URL, omit='content,user_has_liked')
+
+        blog = res.data['results'][0]
+
+        self.assertNotIn('content', blog)
+        self.assertNotIn('user_has_liked', blog)
+        self.assertEqual(blog['excerpt'], self.blog.excerpt)
+        self.assertNotIn('"blogs_blog"."content"', sql)
+
+    def test_cached_blog_list_omit(self):
+        """Test cached lists without user_has_liked are not overlaid"""
+        self.get(BLOGS_URL, omit='user_has_liked')
+        res, sql = self.get(BLOGS_URL, omit='user_has_liked')
+
+        self.assertNotIn('user_has_liked', res.data['results'][0])
+        self.assertNotIn('blogs_blog_likes', sql)
+
+    def test_blog_detail_defers_content(self):
+        """Test the blog detail defers the content it does not answer"""
+        res, sql = self.get(detail_url(self.blog.slug), fields='title')
+
+        self.assertEqual(
+            res.data,
+            {'id': self.blog.id, 'title': self.blog.title}
+        )
+        self.assertNotIn('"blogs_blog"."content"', sql)
+
+    def test_my_blogs_fields(self):
+        """Test the user blogs answer the fields asked for"""
+        res, _ = self.get(MY_BLOGS_URL, fields='excerpt,tags')
+
+        self.assertEqual(
+            res.data['results'][0],
+            {'id': self.blog.id, 'excerpt': self.blog.excerpt, 'tags': []}
+        )
+
+    def test_comment_list_fields(self):
+        """Test the blog comments answer the fields asked for"""
+        res, sql = self.get(
+            retrieve_comments_url(self.blog.slug),
+            fields='author,likes_count'
+        )
+
+        self.assertEqual(
+            list(res.data['results'][0]),
+            ['id', 'author', 'likes_count']
+        )
+        self.assertNotIn('"blogs_comment"."content"', sql)
+
+    def test_unknown_fields(self):
+        """Test asking for unknown fields is a bad request"""
+        res, _ = self.get(BLOGS_URL, fields='title,password')
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('password', str(res.data['fields']))
+
+
+class BlogExcerptTest(TestCase):
+    """Test the blog excerpts are kept on save"""
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            username='testusername',
+            password='testpassword'
+        )
+
+    def test_excerpt_of_long_content(self):
+        """Test the excerpt is a truncated single line of the content"""
+        blog = Blog.objects.create(
+            author=self.user,
+            title='Some funny title',
+            content=LONG_CONTENT
+        )
+
+        self.assertLessEqual(len(blog.excerpt), 200)
+        self.assertTrue(blog.excerpt.endswith('…'))
+        self.assertNotIn('\n', blog.excerpt)
+        self.assertTrue(blog.excerpt.startswith('Lorem ipsum dolor sit amet,'))
+
+    def test_excerpt_follows_content(self):
+        """Test the excerpt is updated with the content"""
+        blog = Blog.objects.create(
+            author=self.user,
+            title='Some funny title',
+            content='Short content'
+        )
+        self.assertEqual(blog.excerpt, 'Short content')
+
+        blog.content = 'Updated content'
+        blog.save()
+        blog.refresh_from_db()
+
+        self.assertEqual(blog.excerpt, 'Updated content')
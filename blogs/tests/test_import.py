@@ -0,0 +1,187 @@
+import json
+import os
+import tempfile
+from io import StringIO
+
+from django.test import TestCase
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+
+from blogs.models import Tag, Blog, Comment
+from blogs import search
+
+
+class ImportViblogTest(TestCase):
+    """Test the bulk import command"""
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def write(self, name, content):
+        """Write a file to import and return its path"""
+        path = os.path.join(self.directory.name, name)
+        with open(path, 'w') as output:
+            output.write(content)
+
+        return path
+
+    def write_records(self, name, records):
+        """Write records as newline-delimited JSON and return the path"""
+        return self.write(
+            name,
+            ''.join(json.dumps(record) + '\n' for record in records)
+        )
+
+    def test_import_ndjson(self):
+        """Test every record type is imported from a JSON lines file"""
+        path = self.write_records('viblog.ndjson', [
+            {'type': 'user', 'username': 'alice'},
+            {'type': 'user', 'username': 'bob'},
+            {'type': 'tag', 'content': 'Django'},
+            {
+                'type': 'blog',
+                'id': 10,
+                'author': 'alice',
+                'title': 'Imported title',
+                'content': 'Imported content',
+                'created_at': '2020-01-02T03:04:05Z',
+                'tags': ['django', 'Python'],
+            },
+            {
+                'type': 'comment',
+                'id': 20,
+                'blog': 10,
+                'author': 'bob',
+                'content': 'Imported comment',
+            },
+            {'type': 'blog_like', 'blog': 10, 'user': 'alice'},
+            {'type': 'blog_like', 'blog': 10, 'user': 'bob'},
+            {'type': 'comment_like', 'comment': 20, 'user': 'alice'},
+            {'type': 'blog_like', 'blog': 10, 'user': 'nobody'},
+        ])
+
+        out = StringIO()
+        call_command('import_viblog', path, '--batch-size', '2', stdout=out)
+
+        blog = Blog.objects.get(id=10)
+        comment = Comment.objects.get(id=20)
+
+        self.assertTrue(blog.slug.startswith('imported-title-'))
+        self.assertEqual(blog.excerpt, 'Imported content')
+        self.assertEqual(blog.created_at.year, 2020)
+        self.assertEqual(blog.author.username, 'alice')
+        self.assertEqual(
+            sorted(blog.tags.values_list('content', flat=True)),
+            ['django', 'python']
+        )
+        self.assertEqual(Tag.objects.count(), 2)
+        self.assertEqual(blog.likes_count, 2)
+        self.assertEqual(comment.blog, blog)
+        self.assertEqual(comment.likes_count, 1)
+        self.assertIn('blog_like: 2 imported, 1 skipped', out.getvalue())
+        self.assertIn('rows/s', out.getvalue())
+
+        if search.is_supported():
+            matches = search.search('imported', 10)
+            self.assertEqual([id for id, _ in matches], [10])
+
+    def test_import_csv(self):
+        """Test CSV files are imported as the type they are named after"""
+        get_user_model().objects.create_user(
+            username='alice',
+            password='testpassword'
+        )
+        blogs = self.write(
+            'blogs.csv',
+            'author,title,content,tags\n'
+            'alice,First title,First content,news|django\n'
+            'alice,Second title,Second content,\n'
+        )
+        comments = self.write(
+            'comments.csv',
+            'blog,author,content\n'
+            'unknown-slug,alice,Lost comment\n'
+        )
+
+        out = StringIO()
+        call_command('import_viblog', blogs, comments, stdout=out)
+
+        self.assertEqual(Blog.objects.count(), 2)
+        self.assertEqual(
+            Blog.objects.get(title='First title').tags.count(),
+            2
+        )
+        self.assertEqual(Comment.objects.count(), 0)
+        self.assertIn('comment: 0 imported, 1 skipped', out.getvalue())
+
+    def test_import_conflicts_skipped(self):
+        """Test conflicting records are skipped with their tags"""
+        user = get_user_model().objects.create_user(
+            username='alice',
+            password='testpassword'
+        )
+        blog = Blog.objects.create(
+            author=user,
+            title='Existing title',
+            content='Existing content',
+            slug='existing-slug'
+        )
+        path = self.write_records('viblog.ndjson', [
+            {'type': 'user', 'username': 'alice'},
+            {
+                'type': 'blog',
+                'author': 'alice',
+                'slug': 'existing-slug',
+                'title': 'Colliding title',
+                'content': 'Colliding content',
+                'tags': ['colliding'],
+            },
+            {'type': 'comment', 'blog': 'existing-slug', 'author': 'alice',
+             'content': 'First comment'},
+            {'type': 'comment', 'blog': 'existing-slug', 'author': 'alice',
+             'content': 'Second comment'},
+        ])
+
+        out = StringIO()
+        call_command('import_viblog', path, stdout=out)
+
+        blog.refresh_from_db()
+        self.assertEqual(blog.title, 'Existing title')
+        self.assertEqual(blog.tags.count(), 0)
+        self.assertFalse(Tag.objects.filter(content='colliding').exists())
+        self.assertEqual(
+            list(blog.comments.values_list('content', flat=True)),
+            ['First comment']
+        )
+        self.assertIn('user: 0 imported, 1 skipped', out.getvalue())
+        self.assertIn('blog: 0 imported, 1 skipped', out.getvalue())
+        self.assertIn('comment: 1 imported, 1 skipped', out.getvalue())
+
+        if search.is_supported():
+            self.assertEqual(search.search('colliding', 10), [])
+
+    def test_import_passwords(self):
+        """Test passwords are hashed unless they already are"""
+        hashed = make_password('hashedpassword')
+        path = self.write_records('viblog.ndjson', [
+            {'type': 'user', 'username': 'alice', 'password': 'plain'},
+            {'type': 'user', 'username': 'bob', 'password': hashed},
+        ])
+
+        call_command('import_viblog', path, stdout=StringIO())
+
+        User = get_user_model()
+        alice = User.objects.get(username='alice')
+        self.assertNotEqual(alice.password, 'plain')
+        self.assertTrue(alice.check_password('plain'))
+        self.assertEqual(User.objects.get(username='bob').password, hashed)
+
+    def test_import_unknown_type(self):
+        """Test records of an unknown type fail the import"""
+        path = self.write_records('viblog.ndjson', [{'type': 'post'}])
+
+        with self.assertRaises(CommandError):
+            call_command('import_viblog', path, stdout=StringIO())
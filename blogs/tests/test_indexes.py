@@ -0,0 +1,93 @@
+from unittest import skipUnless
+
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.db import connection
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+
+from rest_framework.test import APIClient
+
+from blogs.models import Blog, Comment
+
+
+BLOGS_URL = reverse('blogs:blog-list')
+MY_BLOGS_URL = reverse('blogs:blog-me')
+
+
+def retrieve_comments_url(blog_slug):
+    """Return retrieve comment URL"""
+    return reverse('blogs:comment-list', args=[blog_slug])
+
+
+def query_plan(sql):
+    """Return the SQLite query plan of a captured query"""
+    with connection.cursor() as cursor:
+        cursor.execute('EXPLAIN QUERY PLAN ' + sql)
+        return ' '.join(row[-1] for row in cursor.fetchall())
+
+
+@skipUnless(connection.vendor == 'sqlite', 'EXPLAIN QUERY PLAN is SQLite')
+class IndexUsageTest(TestCase):
+    """Test the list endpoints are served from their indexes"""
+
+    def setUp(self):
+        self.client = APIClient()
+
+        self.user = get_user_model().objects.create_user(
+            username='testusername',
+            password='testpassword'
+        )
+
+        self.client.force_authenticate(self.user)
+
+        self.blog = Blog.objects.create(
+            author=self.user,
+            title='Some funny title',
+            content='Lorem ipsum dolor sit amet'
+        )
+        Comment.objects.create(
+            author=self.user,
+            content='Some content blabla',
+            blog=self.blog
+        )
+
+    def assertListUsesIndex(self, url, table, index):
+        """Assert the list query of the url is an ordered index scan"""
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(url)
+
+        sql = next(
+            query['sql'] for query in queries.captured_queries
+            if query['sql'].startswith('SELECT "%s"' % table)
+        )
+        plan = query_plan(sql)
+
+        self.assertIn('USING INDEX %s' % index, plan)
+        self.assertNotIn('TEMP B-TREE', plan)
+
+    def test_blog_list_uses_index(self):
+        """Test the blog list is read from the created_at index"""
+        self.assertListUsesIndex(BLOGS_URL, 'blogs_blog', 'blog_created_idx')
+
+    def test_my_blogs_uses_index(self):
+        """Test the user blogs are read from the author index"""
+        self.assertListUsesIndex(
+            MY_BLOGS_URL, 'blogs_blog', 'blog_author_created_idx'
+        )
+
+    def test_comment_list_uses_index(self):
+        """Test the blog comments are read from the blog index"""
+        self.assertListUsesIndex(
+            retrieve_comments_url(self.blog.slug),
+            'blogs_comment',
+            'comment_blog_created_idx'
+        )
+
+    def test_trending_blogs_uses_index(self):
+        """Test the trending blogs are read from the trending index"""
+        self.assertListUsesIndex(
+            reverse('blogs:blog-trending'),
+            'blogs_blog',
+            'blog_trending_idx'
+        )
@@ -0,0 +1,127 @@
+import uuid
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from io import BytesIO
+from unittest import mock, skipIf
+
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from django.utils.translation import gettext_lazy
+
+from rest_framework import renderers, status
+from rest_framework.exceptions import ParseError
+from rest_framework.test import APIClient
+
+from core import parsers as core_parsers
+from core import renderers as core_renderers
+
+
+BLOGS_URL = reverse('blogs:blog-list')
+
+PAYLOAD = {
+    'id': 1,
+    'title': 'Some funny title — café \U0001f600',
+    'content': 'Line\u2028separated\u2029paragraphs',
+    'created_at': datetime(2020, 11, 3, 20, 29, 1, 123456, timezone.utc),
+    'published_on': date(2020, 11, 3),
+    'score': Decimal('12.50'),
+    'uuid': uuid.UUID('12345678-1234-5678-1234-567812345678'),
+    'lazy': gettext_lazy('Lazy string'),
+    'errors': {0: ['This field is required.']},
+    'tags': [1, 2, 3],
+    'user_has_liked': False,
+    'parent': None,
+}
+
+
+@skipIf(core_renderers.orjson is None, 'orjson is not installed')
+class JSONRendererTest(TestCase):
+    """Test the orjson renderer renders what the DRF one renders"""
+
+    def assertSameRender(self, data, accepted_media_type='application/json'):
+        expected = renderers.JSONRenderer().render(data, accepted_media_type)
+        rendered = core_renderers.JSONRenderer().render(
+            data, accepted_media_type
+        )
+
+        self.assertEqual(rendered, expected)
+
+    def test_same_render(self):
+        """Test the render of every type the DRF encoder handles"""
+        self.assertSameRender(PAYLOAD)
+        self.assertSameRender([PAYLOAD, PAYLOAD])
+        self.assertSameRender(None)
+
+    def test_indented_render(self):
+        """Test indented renders fall back to the stdlib encoder"""
+        self.assertSameRender(PAYLOAD, 'application/json; indent=4')
+
+    def test_render_without_orjson(self):
+        """Test the stdlib encoder renders when orjson is not installed"""
+        with mock.patch.object(core_renderers, 'orjson', None):
+            self.assertSameRender(PAYLOAD)
+
+    def test_api_response(self):
+        """Test the API answers JSON rendered by the orjson renderer"""
+        client = APIClient()
+        user = get_user_model().objects.create_user(
+            username='testusername',
+            password='testpassword'
+        )
+        client.force_authenticate(user)
+
+        res = client.get(BLOGS_URL, HTTP_ACCEPT='application/json')
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertIsInstance(
+            res.accepted_renderer,
+            core_renderers.JSONRenderer
+        )
+        self.assertEqual(res.json()['results'], [])
+
+
+class JSONParserTest(TestCase):
+    """Test the orjson parser parses what the DRF one parses"""
+
+    def parse(self, body, encoding='utf-8'):
+        return core_parsers.JSONParser().parse(
+            BytesIO(body),
+            'application/json',
+            {'encoding': encoding}
+        )
+
+    def test_parse(self):
+        """Test parsing UTF-8 JSON bodies"""
+        data = self.parse('{"title": "café", "tags": [1, 2]}'.encode())
+
+        self.assertEqual(data, {'title': 'café', 'tags': [1, 2]})
+
+    def test_parse_other_encoding(self):
+        """Test bodies in other encodings are parsed by the stdlib"""
+        data = self.parse('{"title": "café"}'.encode('latin-1'), 'latin-1')
+
+        self.assertEqual(data, {'title': 'café'})
+
+    def test_parse_error(self):
+        """Test invalid JSON is a parse error"""
+        with self.assertRaises(ParseError):
+            self.parse(b'{"title": ')
+
+    def test_api_request(self):
+        """Test the API parses JSON bodies with the orjson parser"""
+        client = APIClient()
+        user = get_user_model().objects.create_user(
+            username='testusername',
+            password='testpassword'
+        )
+        client.force_authenticate(user)
+
+        res = client.post(
+            BLOGS_URL,
+            '{"title": "Some funny title", "content": "Lorem ipsum"}',
+            content_type='application/json'
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(res.data['title'], 'Some funny title')
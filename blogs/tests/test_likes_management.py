@@ -1,4 +1,7 @@
+from io import StringIO
+
 from django.test import TestCase
+from django.core.management import call_command
 from django.contrib.auth import get_user_model
 from django.urls import reverse
 
@@ -184,3 +187,133 @@ class PrivateBlogAPITest(TestCase):
         likes = comment.likes.count()
 
         self.assertEqual(likes, 0)
+
+    def test_like_a_blog_twice_counts_once(self):
+        """Test the blog likes counter only moves on a new like"""
+        url = blog_likes_url(self.blog.id)
+
+        self.client.post(url)
+        res = self.client.post(url)
+
+        self.blog.refresh_from_db()
+
+        self.assertEqual(self.blog.likes_count, 1)
+        self.assertEqual(res.data['likes_count'], 1)
+
+    def test_unlike_a_not_liked_blog_keeps_count(self):
+        """Test unliking a blog that was not liked keeps the counter"""
+        url = blog_likes_url(self.blog.id)
+
+        self.client.delete(url)
+
+        self.blog.refresh_from_db()
+
+        self.assertEqual(self.blog.likes_count, 0)
+
+    def test_like_and_unlike_a_comment_updates_count(self):
+        """Test the comment likes counter follows likes and unlikes"""
+        comment = sample_comment(author=self.user, blog=self.blog)
+        url = comment_likes_url(comment.id)
+
+        self.client.post(url)
+        comment.refresh_from_db()
+        self.assertEqual(comment.likes_count, 1)
+
+        self.client.delete(url)
+        comment.refresh_from_db()
+        self.assertEqual(comment.likes_count, 0)
+
+    def test_related_manager_likes_update_count(self):
+        """Test likes changed through the related managers keep counters"""
+        user2 = get_user_model().objects.create_user(
+            username='testcounter',
+            password='testpassword'
+        )
+        blog2 = sample_blog(author=self.user)
+
+        self.blog.likes.add(self.user, user2)
+        user2.liked_blogs.add(self.blog, blog2)
+        self.blog.refresh_from_db()
+        blog2.refresh_from_db()
+        self.assertEqual(self.blog.likes_count, 2)
+        self.assertEqual(blog2.likes_count, 1)
+
+        self.blog.likes.remove(self.user)
+        self.blog.refresh_from_db()
+        self.assertEqual(self.blog.likes_count, 1)
+
+        user2.liked_blogs.clear()
+        self.blog.refresh_from_db()
+        blog2.refresh_from_db()
+        self.assertEqual(self.blog.likes_count, 0)
+        self.assertEqual(blog2.likes_count, 0)
+
+    def test_rebuild_likes_count_command(self):
+        """Test the command fixes and reports the drifted counters"""
+        comment = sample_comment(author=self.user, blog=self.blog)
+        comment.likes.add(self.user)
+        Blog.objects.filter(id=self.blog.id).update(likes_count=7)
+        Comment.objects.filter(id=comment.id).update(likes_count=0)
+
+        out = StringIO()
+        call_command('rebuild_likes_count', stdout=out)
+
+        self.blog.refresh_from_db()
+        comment.refresh_from_db()
+
+        self.assertEqual(self.blog.likes_count, 0)
+        self.assertEqual(comment.likes_count, 1)
+        self.assertIn('Blog: 1 drifted counters rebuilt', out.getvalue())
+        self.assertIn('Comment: 1 drifted counters rebuilt', out.getvalue())
+
+    def test_like_returns_compact_body(self):
+        """Test liking and unliking answer the liked flag and the count"""
+        url = blog_likes_url(self.blog.id)
+
+        res = self.client.post(url)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data, {'liked': True, 'likes_count': 1})
+
+        res = self.client.delete(url)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data, {'liked': False, 'likes_count': 0})
+
+    def test_like_full_representation(self):
+        """Test the full blog or comment is returned when asked for"""
+        comment = sample_comment(author=self.user, blog=self.blog)
+
+        res = self.client.post(blog_likes_url(self.blog.id) + '?full=true')
+
+        self.assertEqual(res.data['slug'], self.blog.slug)
+        self.assertEqual(res.data['likes_count'], 1)
+        self.assertTrue(res.data['user_has_liked'])
+
+        res = self.client.post(comment_likes_url(comment.id) + '?full=1')
+
+        self.assertEqual(res.data['blog_slug'], self.blog.slug)
+        self.assertTrue(res.data['user_has_liked'])
+
+    def test_like_missing_object_not_found(self):
+        """Test liking or unliking a missing blog or comment is a 404"""
+        for url in (blog_likes_url(9999), comment_likes_url(9999)):
+            self.assertEqual(
+                self.client.post(url).status_code,
+                status.HTTP_404_NOT_FOUND
+            )
+            self.assertEqual(
+                self.client.delete(url).status_code,
+                status.HTTP_404_NOT_FOUND
+            )
+
+    def test_repeated_like_is_idempotent(self):
+        """Test liking again writes nothing and keeps the counter"""
+        url = blog_likes_url(self.blog.id)
+        self.client.post(url)
+
+        with self.assertNumQueries(4):
+            res = self.client.post(url)
+
+        self.assertEqual(res.data, {'liked': True, 'likes_count': 1})
+        self.assertEqual(self.blog.likes.count(), 1)
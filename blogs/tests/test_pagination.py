@@ -0,0 +1,98 @@
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from django.utils import timezone
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from blogs.models import Blog
+
+
+BLOGS_URL = reverse('blogs:blog-list')
+MY_BLOGS_URL = reverse('blogs:blog-me')
+
+
+def sample_blogs(author, count):
+    """Create blogs sharing the same created_at, to exercise the id key"""
+    created_at = timezone.now()
+
+    for number in range(count):
+        Blog.objects.create(
+            author=author,
+            title='Blog %d' % number,
+            content='Lorem ipsum dolor sit amet'
+        )
+
+    Blog.objects.update(created_at=created_at)
+
+    return list(Blog.objects.order_by('-created_at', '-id'))
+
+
+class KeysetPaginationTest(TestCase):
+    """Test the keyset pagination of the list endpoints"""
+
+    def setUp(self):
+        self.client = APIClient()
+
+        self.user = get_user_model().objects.create_user(
+            username='testusername',
+            password='testpassword'
+        )
+
+        self.client.force_authenticate(self.user)
+
+    def test_walk_all_pages_forward(self):
+        """Test following the next cursors returns every blog once"""
+        blogs = sample_blogs(self.user, 7)
+
+        res = self.client.get(BLOGS_URL, {'page_size': 3})
+        self.assertIsNone(res.data['previous'])
+
+        slugs = []
+        while True:
+            slugs += [blog['slug'] for blog in res.data['results']]
+            if res.data['next'] is None:
+                break
+            res = self.client.get(res.data['next'])
+
+        self.assertEqual(slugs, [blog.slug for blog in blogs])
+
+    def test_previous_cursor(self):
+        """Test the previous cursor returns the previous page"""
+        sample_blogs(self.user, 7)
+
+        first = self.client.get(BLOGS_URL, {'page_size': 3})
+        second = self.client.get(first.data['next'])
+        back = self.client.get(second.data['previous'])
+
+        self.assertEqual(back.data['results'], first.data['results'])
+        self.assertIsNone(back.data['previous'])
+        self.assertIsNotNone(back.data['next'])
+
+    def test_my_blogs_oldest_first(self):
+        """Test the user blogs are paginated from the oldest one"""
+        blogs = sample_blogs(self.user, 4)
+
+        res = self.client.get(MY_BLOGS_URL, {'page_size': 2})
+        res = self.client.get(res.data['next'])
+
+        self.assertEqual(
+            [blog['slug'] for blog in res.data['results']],
+            [blog.slug for blog in reversed(blogs[:2])]
+        )
+        self.assertIsNone(res.data['next'])
+
+    def test_page_size_is_capped(self):
+        """Test the page size can not go over the maximum"""
+        sample_blogs(self.user, 101)
+
+        res = self.client.get(BLOGS_URL, {'page_size': 1000})
+
+        self.assertEqual(len(res.data['results']), 100)
+
+    def test_invalid_cursor(self):
+        """Test an invalid cursor returns not found"""
+        res = self.client.get(BLOGS_URL, {'cursor': 'invalid'})
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
@@ -0,0 +1,155 @@
+import marshal
+import time
+
+from django.test import TestCase, override_settings
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from blogs.models import Blog
+from core import profiling
+
+
+PROFILE_LIST_URL = reverse('profiles:profile-list')
+PROFILE_TOKEN_URL = reverse('profiles:profile-token')
+
+
+def blog_likes_url(blog_id):
+    """Return liked blog url"""
+    return reverse('blogs:blog-like', args=[blog_id])
+
+
+class RequestProfilingTest(TestCase):
+    """Test the on-demand profiling of requests by staff users"""
+
+    def setUp(self):
+        profiling.profiles.clear()
+
+        self.client = APIClient()
+        self.staff = get_user_model().objects.create_user(
+            username='teststaff',
+            password='testpassword',
+            is_staff=True
+        )
+        self.user = get_user_model().objects.create_user(
+            username='testusername',
+            password='testpassword'
+        )
+        self.blog = Blog.objects.create(
+            author=self.user,
+            title='Some funny title',
+            content='Lorem ipsum dolor sit amet'
+        )
+        self.client.force_authenticate(self.user)
+
+    def mint_token(self, mode):
+        """Return a profile token minted from the admin by the staff user"""
+        admin = APIClient()
+        admin.force_login(self.staff)
+
+        return admin.get(PROFILE_TOKEN_URL, {'mode': mode}).json()['token']
+
+    def download(self, profile_id):
+        admin = APIClient()
+        admin.force_login(self.staff)
+
+        return admin.get(
+            reverse('profiles:profile-download', args=[profile_id])
+        )
+
+    def test_cprofile_request(self):
+        """Test a request with a cProfile token keeps its pstats dump"""
+        token = self.mint_token(profiling.CPROFILE)
+
+        res = self.client.post(
+            blog_likes_url(self.blog.id),
+            HTTP_X_PROFILE=token
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+        download = self.download(res['X-Profile-Id'])
+        stats = marshal.loads(download.content)
+        functions = {function for _, _, function in stats}
+
+        self.assertIn('add_like', functions)
+        self.assertIn('attachment', download['Content-Disposition'])
+
+    @override_settings(PROFILER_SAMPLE_INTERVAL=0.0001)
+    def test_sampled_request(self):
+        """Test a request with a sample token keeps collapsed stacks"""
+        token = self.mint_token(profiling.SAMPLE)
+
+        res = self.client.get(reverse('blogs:blog-list'), HTTP_X_PROFILE=token)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+        download = self.download(res['X-Profile-Id'])
+
+        self.assertEqual(download.status_code, status.HTTP_200_OK)
+        self.assertTrue(download['Content-Type'].startswith('text/plain'))
+
+    def test_stack_sampler_collapsed_stacks(self):
+        """Test the sampler counts the collapsed stacks of the thread"""
+        with profiling.StackSampler(0.001) as sampler:
+            time.sleep(0.05)
+
+        lines = sampler.collapsed().splitlines()
+
+        self.assertTrue(lines)
+        stack, count = lines[0].rsplit(' ', 1)
+        self.assertGreater(int(count), 0)
+        self.assertIn('test_stack_sampler_collapsed_stacks', stack)
+
+    def test_token_of_non_staff_ignored(self):
+        """Test tokens of users who are not staff profile nothing"""
+        token = profiling.make_token(self.user, profiling.CPROFILE)
+
+        res = self.client.get(reverse('blogs:blog-list'), HTTP_X_PROFILE=token)
+
+        self.assertNotIn('X-Profile-Id', res)
+        self.assertEqual(profiling.profiles.list(), [])
+
+    def test_query_param_token_ignored(self):
+        """Test tokens out of the query string profile nothing"""
+        token = self.mint_token(profiling.CPROFILE)
+
+        res = self.client.get(reverse('blogs:blog-list'), {'profile': token})
+
+        self.assertNotIn('X-Profile-Id', res)
+        self.assertEqual(profiling.profiles.list(), [])
+
+    def test_forged_token_ignored(self):
+        """Test tokens with a bad signature profile nothing"""
+        token = self.mint_token(profiling.CPROFILE)[:-1] + 'x'
+
+        res = self.client.get(reverse('blogs:blog-list'), HTTP_X_PROFILE=token)
+
+        self.assertNotIn('X-Profile-Id', res)
+
+    def test_profile_list_staff_only(self):
+        """Test the profiles are only listed to staff users"""
+        client = APIClient()
+        client.force_login(self.user)
+
+        res = client.get(PROFILE_LIST_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_302_FOUND)
+
+        client.force_login(self.staff)
+        res = client.get(PROFILE_LIST_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.json(), {'profiles': []})
+
+    def test_profile_ring_is_bounded(self):
+        """Test the ring only keeps the last profiles"""
+        ring = profiling.ProfileRing(size=2)
+
+        for id in ('a', 'b', 'c'):
+            ring.add(profiling.Profile(id, *[None] * 10))
+
+        self.assertEqual([profile.id for profile in ring.list()], ['c', 'b'])
+        self.assertIsNone(ring.get('a'))
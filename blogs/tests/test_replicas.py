@@ -0,0 +1,169 @@
+import time
+from unittest import mock
+
+from django.test import SimpleTestCase, RequestFactory, override_settings
+from django.core.cache import cache
+from django.db import transaction
+from django.contrib.auth.models import AnonymousUser
+from django.http import HttpResponse
+
+from rest_framework.response import Response
+
+from blogs.models import Blog
+from blogs.cache import cached_response
+from core import replicas
+from core.conditional import conditional
+
+
+REPLICAS = ['replica1', 'replica2']
+
+
+@override_settings(DATABASE_REPLICAS=REPLICAS)
+class ReplicaRouterTest(SimpleTestCase):
+    """Test the reads are routed to the replicas only when allowed"""
+
+    databases = {'default'}
+
+    def setUp(self):
+        self.router = replicas.ReplicaRouter()
+
+    def test_primary_by_default(self):
+        """Test reads out of a safe request go to the primary"""
+        self.assertEqual(self.router.db_for_read(Blog), 'default')
+
+    def test_replica_reads(self):
+        """Test allowed reads go to a replica and writes to the primary"""
+        with replicas.replica_reads():
+            self.assertIn(self.router.db_for_read(Blog), REPLICAS)
+            self.assertEqual(self.router.db_for_write(Blog), 'default')
+
+            with replicas.primary_reads():
+                self.assertEqual(self.router.db_for_read(Blog), 'default')
+
+    def test_primary_in_transaction(self):
+        """Test reads inside a transaction go to the primary"""
+        with replicas.replica_reads(), transaction.atomic():
+            self.assertEqual(self.router.db_for_read(Blog), 'default')
+
+    def test_select_for_update_on_primary(self):
+        """Test select_for_update is routed as a write"""
+        with replicas.replica_reads():
+            self.assertIn(Blog.objects.all().db, REPLICAS)
+            self.assertEqual(
+                Blog.objects.select_for_update().db,
+                'default'
+            )
+
+    @override_settings(DATABASE_REPLICAS=[])
+    def test_without_replicas(self):
+        """Test every read goes to the primary without replicas"""
+        with replicas.replica_reads():
+            self.assertEqual(self.router.db_for_read(Blog), 'default')
+
+    def test_no_migrations_on_replicas(self):
+        """Test the replicas are not migrated"""
+        self.assertTrue(self.router.allow_migrate('default', 'blogs'))
+        self.assertFalse(self.router.allow_migrate('replica1', 'blogs'))
+
+
+@override_settings(DATABASE_REPLICAS=REPLICAS, REPLICA_PIN_SECONDS=5)
+class ReplicaMiddlewareTest(SimpleTestCase):
+    """Test the requests reading from the replicas and the pinning"""
+
+    def setUp(self):
+        self.factory = RequestFactory()
+        self.router = replicas.ReplicaRouter()
+        self.middleware = replicas.ReplicaMiddleware(self.view)
+        self.read_from = None
+
+    def view(self, request):
+        self.read_from = self.router.db_for_read(Blog)
+        return HttpResponse()
+
+    def request(self, method):
+        """
+        Run a request through the middleware, keeping its cookies like a
+        client, and return the alias its view read from
+        """
+        response = self.middleware(getattr(self.factory, method)('/'))
+        for name, morsel in response.cookies.items():
+            self.factory.cookies[name] = morsel.value
+
+        return self.read_from
+
+    def test_safe_request_reads_replica(self):
+        """Test the reads of a safe request go to a replica"""
+        self.assertIn(self.request('get'), REPLICAS)
+        self.assertEqual(self.router.db_for_read(Blog), 'default')
+
+    def test_unsafe_request_reads_primary(self):
+        """Test the reads of a write request go to the primary"""
+        self.assertEqual(self.request('post'), 'default')
+
+    def test_pinned_after_write(self):
+        """Test a client reads from the primary after writing"""
+        self.request('patch')
+
+        self.assertEqual(self.request('get'), 'default')
+
+        self.factory.cookies.clear()
+        self.assertIn(self.request('get'), REPLICAS)
+
+    def test_unpinned_after_pin_seconds(self):
+        """Test a client reads from the replicas again after the pin"""
+        self.request('delete')
+
+        with mock.patch('django.core.signing.time.time',
+                        return_value=time.time() + 10):
+            self.assertIn(self.request('get'), REPLICAS)
+
+    def test_forged_pin_ignored(self):
+        """Test an unsigned pin cookie is not taken"""
+        self.factory.cookies[replicas.PIN_COOKIE] = '1'
+
+        self.assertIn(self.request('get'), REPLICAS)
+
+
+@override_settings(DATABASE_REPLICAS=REPLICAS)
+class CachedReadsOnPrimaryTest(SimpleTestCase):
+    """Test what is cached under a generation is read from the primary"""
+
+    def setUp(self):
+        cache.clear()
+
+        self.router = replicas.ReplicaRouter()
+        self.request = RequestFactory().get('/')
+        self.request.user = AnonymousUser()
+        self.read_from = None
+
+    def read(self):
+        self.read_from = self.router.db_for_read(Blog)
+
+    def test_cached_response_built_on_primary(self):
+        """Test a response cache miss is built from the primary"""
+        def build():
+            self.read()
+            return Response({'id': 1})
+
+        with replicas.replica_reads():
+            cached_response(self.request, 'test:replicas', build)
+            self.assertIn(self.router.db_for_read(Blog), REPLICAS)
+
+        self.assertEqual(self.read_from, 'default')
+
+    def test_validators_read_on_primary(self):
+        """Test the conditional request validators are read from primary"""
+        def validators(request, *args, **kwargs):
+            self.read()
+            return ('parts',), None
+
+        class View:
+            @conditional(validators)
+            def get(self, request):
+                return HttpResponse()
+
+        with replicas.replica_reads():
+            response = View().get(self.request)
+
+        self.assertTrue(response.has_header('ETag'))
+        self.assertEqual(self.read_from, 'default')
@@ -0,0 +1,125 @@
+from io import StringIO
+
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.db import connection
+from django.core.management import call_command
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from blogs.models import Blog
+from blogs import search
+
+
+SEARCH_URL = reverse('blogs:blog-search')
+
+
+def sample_blog(author, **params):
+    """Create and return a sample blog"""
+    defaults = {
+        'title': 'Some funny title',
+        'content': 'Lorem ipsum dolor sit amet, consectetur adipiscing elit'
+    }
+    defaults.update(params)
+
+    return Blog.objects.create(author=author, **defaults)
+
+
+class BlogSearchAPITest(TestCase):
+    """Test the blogs full-text search"""
+
+    def setUp(self):
+        self.client = APIClient()
+
+        self.user = get_user_model().objects.create_user(
+            username='testusername',
+            password='testpassword'
+        )
+
+        self.client.force_authenticate(self.user)
+
+    def search(self, query, **params):
+        """Return the slugs found by a search query"""
+        res = self.client.get(SEARCH_URL, dict(q=query, **params))
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+        return [blog['slug'] for blog in res.data['results']]
+
+    def test_search_requires_query(self):
+        """Test a search without query is a bad request"""
+        res = self.client.get(SEARCH_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_search_ranks_title_matches_first(self):
+        """Test blogs matching in the title rank over content matches"""
+        content_match = sample_blog(
+            self.user,
+            title='Weekend notes',
+            content='We talked about databases and normalization'
+        )
+        title_match = sample_blog(
+            self.user,
+            title='Normalize databases',
+            content='Lorem ipsum dolor sit amet'
+        )
+        sample_blog(self.user, title='Django REST')
+
+        self.assertEqual(
+            self.search('databases'),
+            [title_match.slug, content_match.slug]
+        )
+
+    def test_search_stems_and_quotes_terms(self):
+        """Test terms are stemmed and never read as query syntax"""
+        blog = sample_blog(self.user, title='Normalizing "the" database')
+
+        self.assertEqual(self.search('normalize'), [blog.slug])
+        self.assertEqual(self.search('database"  OR *'), [])
+
+    def test_search_index_follows_updates_and_deletes(self):
+        """Test the index is kept in sync by the blog signals"""
+        blog = sample_blog(self.user, title='Old title')
+
+        blog.title = 'Brand new title'
+        blog.save()
+        self.assertEqual(self.search('old'), [])
+        self.assertEqual(self.search('brand'), [blog.slug])
+
+        blog.delete()
+        self.assertEqual(self.search('brand'), [])
+
+    def test_search_pages(self):
+        """Test search pages follow the cursors with constant queries"""
+        for number in range(5):
+            sample_blog(self.user, title='Database %d' % number)
+
+        res = self.client.get(SEARCH_URL, {'q': 'database', 'page_size': 2})
+        slugs = [blog['slug'] for blog in res.data['results']]
+
+        while res.data['next']:
+            with CaptureQueriesContext(connection) as queries:
+                res = self.client.get(res.data['next'])
+            slugs += [blog['slug'] for blog in res.data['results']]
+            self.assertLessEqual(len(queries), 3)
+
+        self.assertEqual(len(set(slugs)), 5)
+
+        previous = self.client.get(res.data['previous'])
+        self.assertEqual(
+            [blog['slug'] for blog in previous.data['results']],
+            slugs[2:4]
+        )
+
+    def test_rebuild_search_index_command(self):
+        """Test the command backfills blogs missing from the index"""
+        blog = sample_blog(self.user, title='Backfilled blog')
+        search.clear_index()
+        self.assertEqual(self.search('backfilled'), [])
+
+        call_command('rebuild_search_index', stdout=StringIO())
+
+        self.assertEqual(self.search('backfilled'), [blog.slug])
@@ -0,0 +1,107 @@
+import json
+
+from django.test import TestCase, override_settings
+from django.core.cache import cache
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from blogs.models import Blog
+from core.middleware import ServerTimingMiddleware
+
+
+BLOGS_URL = reverse('blogs:blog-list')
+
+
+def server_timing(response):
+    """Return the durations of the Server-Timing metrics of a response"""
+    durations = {}
+    for metric in response['Server-Timing'].split(', '):
+        name, duration = metric.split(';')[:2]
+        durations[name] = float(duration[len('dur='):])
+
+    return durations
+
+
+class ServerTimingTest(TestCase):
+    """Test the request timing headers and log lines"""
+
+    def setUp(self):
+        cache.clear()
+
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            username='testusername',
+            password='testpassword'
+        )
+        self.client.force_authenticate(self.user)
+
+        Blog.objects.create(
+            author=self.user,
+            title='Some funny title',
+            content='Lorem ipsum dolor sit amet'
+        )
+
+    def test_timing_headers(self):
+        """Test the timings and query count are sent in headers"""
+        res = self.client.get(BLOGS_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+        metrics = [
+            metric.split(';')[0] for metric in res['Server-Timing'].split(', ')
+        ]
+
+        self.assertEqual(
+            metrics,
+            ['db', 'view', 'serialize', 'render', 'total']
+        )
+        self.assertIn('queries"', res['Server-Timing'])
+        self.assertGreater(int(res['X-Query-Count']), 0)
+
+    def test_serialization_timed(self):
+        """Test serializing is timed apart, and not for cached responses"""
+        for i in range(20):
+            Blog.objects.create(
+                author=self.user,
+                title='Blog %d' % i,
+                content='Lorem ipsum dolor sit amet'
+            )
+
+        first = self.client.get(BLOGS_URL)
+        cached = self.client.get(BLOGS_URL)
+
+        self.assertGreater(server_timing(first)['serialize'], 0)
+        self.assertEqual(server_timing(cached)['serialize'], 0)
+
+    def test_query_count_follows_queries(self):
+        """Test X-Query-Count counts the queries of the request"""
+        first = self.client.get(BLOGS_URL)
+        cached = self.client.get(BLOGS_URL)
+
+        self.assertLess(
+            int(cached['X-Query-Count']),
+            int(first['X-Query-Count'])
+        )
+
+    @override_settings(SERVER_TIMING_LOG_SAMPLE_RATE=1.0)
+    def test_sampled_log_line(self):
+        """Test a JSON log line is written for sampled requests"""
+        with self.assertLogs('viblog.requests', 'INFO') as logs:
+            res = self.client.get(BLOGS_URL)
+
+        line = json.loads(logs.records[0].getMessage())
+
+        self.assertEqual(line['path'], BLOGS_URL)
+        self.assertEqual(line['status'], status.HTTP_200_OK)
+        self.assertEqual(line['user'], self.user.pk)
+        self.assertEqual(line['queries'], int(res['X-Query-Count']))
+        self.assertIn('serialize_ms', line)
+
+    def test_not_sampled_by_default(self):
+        """Test no log line is written when the sample rate is zero"""
+        middleware = ServerTimingMiddleware(lambda request: None)
+
+        self.assertEqual(middleware.sample_rate, 0.0)
@@ -0,0 +1,100 @@
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from blogs.models import Blog, Comment
+
+
+STATS_URL = reverse('blogs:blog-me-stats')
+
+
+def sample_blog(author, **params):
+    """Create and return a sample blog"""
+    defaults = {
+        'title': 'Some funny title',
+        'content': 'Lorem ipsum dolor sit amet, consectetur adipiscing elit'
+    }
+    defaults.update(params)
+
+    return Blog.objects.create(author=author, **defaults)
+
+
+class PublicAuthorStatsAPITest(TestCase):
+    """Test unauthenticated author stats API access"""
+
+    def test_auth_required(self):
+        """Test that authentication is required"""
+        res = APIClient().get(STATS_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class PrivateAuthorStatsAPITest(TestCase):
+    """Test the author stats API"""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            username='testusername',
+            password='testpassword'
+        )
+        self.client.force_authenticate(self.user)
+
+        self.readers = [
+            get_user_model().objects.create_user(
+                username='reader%d' % i,
+                password='testpassword'
+            )
+            for i in range(3)
+        ]
+
+    def test_author_stats(self):
+        """Test the totals and per blog counts of the user blogs"""
+        first = sample_blog(author=self.user, title='First blog')
+        second = sample_blog(author=self.user, title='Second blog')
+        other = sample_blog(author=self.readers[0], title='Other blog')
+
+        first.likes.add(*self.readers)
+        second.likes.add(self.readers[0])
+        other.likes.add(self.user)
+        for reader in self.readers[:2]:
+            Comment.objects.create(author=reader, blog=first, content='Hi')
+        Comment.objects.create(author=self.user, blog=other, content='Hi')
+
+        with self.assertNumQueries(1):
+            res = self.client.get(STATS_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['blogs_count'], 2)
+        self.assertEqual(res.data['likes_count'], 4)
+        self.assertEqual(res.data['comments_count'], 2)
+        self.assertEqual(res.data['blogs'], [
+            {
+                'id': first.id,
+                'slug': first.slug,
+                'title': 'First blog',
+                'likes_count': 3,
+                'comments_count': 2,
+            },
+            {
+                'id': second.id,
+                'slug': second.slug,
+                'title': 'Second blog',
+                'likes_count': 1,
+                'comments_count': 0,
+            },
+        ])
+
+    def test_author_without_blogs(self):
+        """Test the stats of a user without blogs are empty"""
+        res = self.client.get(STATS_URL)
+
+        self.assertEqual(res.data, {
+            'blogs_count': 0,
+            'likes_count': 0,
+            'comments_count': 0,
+            'blogs': [],
+        })
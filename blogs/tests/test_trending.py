@@ -0,0 +1,259 @@
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.test import TestCase, override_settings
+from django.core.cache import cache
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.management import call_command
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from django.utils import timezone
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from blogs.models import Blog, Comment, TrendingState
+from blogs import trending
+
+
+TRENDING_URL = reverse('blogs:blog-trending')
+
+
+def blog_likes_url(blog_id):
+    """Return liked blog url"""
+    return reverse('blogs:blog-like', args=[blog_id])
+
+
+def sample_blog(author, **params):
+    """Create and return a sample blog"""
+    defaults = {
+        'title': 'Some funny title',
+        'content': 'Lorem ipsum dolor sit amet, consectetur adipiscing elit'
+    }
+    defaults.update(params)
+
+    return Blog.objects.create(author=author, **defaults)
+
+
+def trending_score(blog):
+    """Return the stored trending score of the blog"""
+    blog.refresh_from_db(fields=['trending_score'])
+    return blog.trending_score
+
+
+@override_settings(
+    TRENDING_HALF_LIFE=3600,
+    TRENDING_LIKE_WEIGHT=1.0,
+    TRENDING_COMMENT_WEIGHT=3.0
+)
+class TrendingScoreTest(TestCase):
+    """Test the trending scores are kept by likes and comments"""
+
+    def setUp(self):
+        cache.delete(trending.EPOCH_KEY)
+        TrendingState.objects.create(pk=1, epoch=timezone.now())
+
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            username='testusername',
+            password='testpassword'
+        )
+        self.client.force_authenticate(self.user)
+
+    def test_like_and_unlike_score(self):
+        """Test liking scores the blog and unliking takes it back"""
+        blog = sample_blog(author=self.user)
+
+        self.client.post(blog_likes_url(blog.id))
+
+        self.assertAlmostEqual(trending_score(blog), 1.0, places=2)
+
+        self.client.delete(blog_likes_url(blog.id))
+
+        self.assertAlmostEqual(trending_score(blog), 0.0, places=2)
+
+    def test_unlike_later_takes_back_its_like(self):
+        """Test unliking later takes back what the like gave, no more"""
+        blog = sample_blog(author=self.user)
+        Comment.objects.create(
+            author=self.user,
+            blog=blog,
+            content='Some content'
+        )
+
+        self.client.post(blog_likes_url(blog.id))
+        self.assertAlmostEqual(trending_score(blog), 4.0, places=2)
+
+        later = timezone.now() + timedelta(hours=3)
+        with mock.patch('django.utils.timezone.now', return_value=later):
+            self.client.delete(blog_likes_url(blog.id))
+
+        self.assertAlmostEqual(trending_score(blog), 3.0, places=2)
+
+    def test_undated_like_taken_back_as_of_blog(self):
+        """Test unliking an undated like takes back its blog age score"""
+        blog = sample_blog(author=self.user)
+        blog.likes.add(self.user)
+        trending.rebuild_scores(Blog.objects.filter(id=blog.id))
+
+        later = timezone.now() + timedelta(hours=3)
+        with mock.patch('django.utils.timezone.now', return_value=later):
+            self.client.delete(blog_likes_url(blog.id))
+
+        self.assertAlmostEqual(trending_score(blog), 0.0, places=2)
+
+    def test_repeated_like_scores_once(self):
+        """Test a like that was already there does not score again"""
+        blog = sample_blog(author=self.user)
+
+        self.client.post(blog_likes_url(blog.id))
+        self.client.post(blog_likes_url(blog.id))
+
+        self.assertAlmostEqual(trending_score(blog), 1.0, places=2)
+
+    def test_comment_scores_blog(self):
+        """Test commenting scores the blog and deleting takes it back"""
+        blog = sample_blog(author=self.user)
+
+        comment = Comment.objects.create(
+            author=self.user,
+            blog=blog,
+            content='Some content'
+        )
+
+        self.assertAlmostEqual(trending_score(blog), 3.0, places=2)
+
+        comment.delete()
+
+        self.assertAlmostEqual(trending_score(blog), 0.0, places=6)
+
+    def test_score_never_negative(self):
+        """Test unliking never leaves a negative score"""
+        blog = sample_blog(author=self.user)
+        blog.likes.add(self.user)
+
+        self.client.delete(blog_likes_url(blog.id))
+
+        self.assertEqual(trending_score(blog), 0.0)
+
+    def test_events_decay(self):
+        """Test an event weighs twice one a half life older"""
+        now = timezone.now()
+
+        self.assertAlmostEqual(
+            trending.event_score(1.0, now) / trending.event_score(
+                1.0, now - timedelta(hours=1)
+            ),
+            2.0
+        )
+
+    def test_rebase_keeps_order(self):
+        """Test rebasing scales the scores down and keeps their order"""
+        older = sample_blog(author=self.user, title='Older blog')
+        newer = sample_blog(author=self.user, title='Newer blog')
+        Blog.objects.filter(pk=older.pk).update(trending_score=4096.0)
+        Blog.objects.filter(pk=newer.pk).update(trending_score=8192.0)
+        state = TrendingState.objects.get()
+
+        factor = trending.rebase(state.epoch + timedelta(hours=10))
+
+        self.assertAlmostEqual(factor, 2 ** -10)
+        self.assertAlmostEqual(trending_score(older), 4.0)
+        self.assertAlmostEqual(trending_score(newer), 8.0)
+        self.assertEqual(
+            TrendingState.objects.get().epoch,
+            state.epoch + timedelta(hours=10)
+        )
+
+    def test_score_after_rebase_by_another_process(self):
+        """Test events are scored against an epoch rebased elsewhere"""
+        trending.get_epoch()
+        state = TrendingState.objects.get()
+
+        # The command process has a cache of its own
+        with mock.patch.object(trending, 'cache', LocMemCache('rebase', {})):
+            trending.rebase(state.epoch + timedelta(hours=10))
+
+        self.assertEqual(cache.get(trending.EPOCH_KEY), state.epoch_timestamp)
+
+        blog = sample_blog(author=self.user)
+        Comment.objects.create(author=self.user, blog=blog, content='Some')
+
+        self.assertAlmostEqual(
+            trending_score(blog) / (3.0 * 2 ** -10), 1.0, places=2
+        )
+
+    def test_rebuild_scores(self):
+        """Test rebuilding gives back the scores of the comments"""
+        blog = sample_blog(author=self.user)
+        Comment.objects.create(author=self.user, blog=blog, content='Some')
+        score = trending_score(blog)
+        Blog.objects.update(trending_score=0)
+
+        trending.rebuild_scores(Blog.objects.all())
+
+        self.assertAlmostEqual(trending_score(blog), score)
+
+    def test_rebase_command(self):
+        """Test the command rebases and rebuilds the scores"""
+        blog = sample_blog(author=self.user)
+        Comment.objects.create(author=self.user, blog=blog, content='Some')
+        Blog.objects.update(trending_score=0)
+        out = StringIO()
+
+        call_command('rebase_trending_scores', '--rebuild', stdout=out)
+
+        self.assertAlmostEqual(trending_score(blog), 3.0, places=2)
+        self.assertIn('1 trending scores rebuilt', out.getvalue())
+
+
+class TrendingBlogsAPITest(TestCase):
+    """Test the trending blogs API"""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            username='testusername',
+            password='testpassword'
+        )
+        self.client.force_authenticate(self.user)
+
+    def test_auth_required(self):
+        """Test that authentication is required"""
+        res = APIClient().get(TRENDING_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_trending_blogs_order(self):
+        """Test the blogs are ranked by trending score, ties newest first"""
+        quiet = sample_blog(author=self.user, title='Quiet blog')
+        liked = sample_blog(author=self.user, title='Liked blog')
+        commented = sample_blog(author=self.user, title='Commented blog')
+        Blog.objects.filter(pk=liked.pk).update(trending_score=1.0)
+        Blog.objects.filter(pk=commented.pk).update(trending_score=3.0)
+        newer_quiet = sample_blog(author=self.user, title='Newer quiet')
+
+        res = self.client.get(TRENDING_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [blog['id'] for blog in res.data],
+            [commented.id, liked.id, newer_quiet.id, quiet.id]
+        )
+        self.assertNotIn('trending_score', res.data[0])
+
+    def test_trending_blogs_limit(self):
+        """Test the number of blogs is limited with ?limit="""
+        for i in range(3):
+            sample_blog(author=self.user, title='Blog %d' % i)
+
+        res = self.client.get(TRENDING_URL, {'limit': 2})
+
+        self.assertEqual(len(res.data), 2)
+
+    def test_trending_blogs_invalid_limit(self):
+        """Test a limit that is not an integer is rejected"""
+        res = self.client.get(TRENDING_URL, {'limit': 'many'})
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
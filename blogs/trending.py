@@ -0,0 +1,237 @@
+"""
+Time-decayed trending scores of the blogs.
+
+Every like and comment of a blog adds its weight times
+2 ** (age / half-life) to the blog trending_score, where age is the
+time from the epoch of the TrendingState to the event. Newer events
+weigh exponentially more, so ordering by the stored score is ordering
+by the likes and comments decayed by their age, and a score is only
+ever changed by the event itself, never recomputed.
+
+The weights grow with time, so rebase() moves the epoch to now and
+scales every score down by the same factor, which keeps their order.
+It is run periodically by the rebase_trending_scores command, at least
+once every few hundred half-lives, before the weights overflow.
+
+The TrendingState epoch is the only source of truth. Processes cache it
+for EPOCH_TIMEOUT seconds, and each scoring update rescales the weight
+computed against the cached epoch by the epoch read in the statement
+itself, so events scored after a rebase run by another process are
+relative to the new epoch all the same.
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F, FloatField, Subquery, Value
+from django.db.models.functions import Coalesce, Greatest, Power
+from django.utils import timezone
+
+from blogs.models import Blog, BlogLike, Comment, TrendingState
+
+
+EPOCH_KEY = 'blogs:trending:epoch'
+EPOCH_TIMEOUT = 60
+
+BATCH_SIZE = 1000
+
+
+def half_life():
+    """Return the seconds after which an event weighs half a new one"""
+    return getattr(settings, 'TRENDING_HALF_LIFE', 60 * 60 * 24)
+
+
+def like_weight():
+    return getattr(settings, 'TRENDING_LIKE_WEIGHT', 1.0)
+
+
+def comment_weight():
+    return getattr(settings, 'TRENDING_COMMENT_WEIGHT', 3.0)
+
+
+def read_epoch():
+    """Return the timestamp of the stored epoch, creating it the first time"""
+    state, _ = TrendingState.objects.get_or_create(
+        pk=1,
+        defaults={'epoch': timezone.now()}
+    )
+
+    return state.epoch_timestamp
+
+
+def get_epoch():
+    """Return the timestamp of the epoch, cached for EPOCH_TIMEOUT"""
+    epoch = cache.get(EPOCH_KEY)
+
+    if epoch is None:
+        epoch = read_epoch()
+        cache.set(EPOCH_KEY, epoch, EPOCH_TIMEOUT)
+
+    return epoch
+
+
+def event_score(weight, when=None, epoch=None):
+    """Return the score of an event of the weight, at when or now"""
+    when = when or timezone.now()
+    epoch = get_epoch() if epoch is None else epoch
+
+    return weight * 2 ** ((when.timestamp() - epoch) / half_life())
+
+
+def _float(value):
+    return Value(float(value), output_field=FloatField())
+
+
+def event_change(weight, when=None):
+    """
+    Return the expression of the score of an event, computed against
+    the cached epoch and rescaled to the stored one
+    """
+    epoch = get_epoch()
+    stored_epoch = Subquery(
+        TrendingState.objects.filter(pk=1).values('epoch_timestamp')[:1],
+        output_field=FloatField()
+    )
+    # 2 ** 0 unless the epoch was rebased since it was cached
+    rescale = Power(
+        _float(2),
+        (_float(epoch) - Coalesce(stored_epoch, _float(epoch)))
+        / _float(half_life())
+    )
+
+    return _float(event_score(weight, when, epoch)) * rescale
+
+
+def score_update(weight, when=None):
+    """
+    Return the expression adding the score of an event to the trending
+    score, never below zero for a negative weight, as the likes added
+    before they were dated are taken back as of their blog
+    """
+    change = event_change(weight, when)
+
+    if weight >= 0:
+        return F('trending_score') + change
+
+    return Greatest(F('trending_score') + change, _float(0))
+
+
+def like_updates(model, step, when):
+    """
+    Return the field updates of likes added at when, or removed with a
+    negative step, to the model objects, which only score blogs
+    """
+    if model is not Blog:
+        return {}
+
+    return {'trending_score': score_update(step * like_weight(), when)}
+
+
+def liked_at(model, likes):
+    """
+    Return when the like of the likes queryset was scored: when it was
+    added, or as of its blog when it is not dated, as rebuild_scores
+    scores it. None for the models without scores or a missing like.
+    """
+    if model is not Blog:
+        return None
+
+    row = likes.values_list('created_at', 'blog__created_at').first()
+    if row is None:
+        return None
+
+    created_at, blog_created_at = row
+    return created_at or blog_created_at
+
+
+def add_comment(comment):
+    """Score a new comment on its blog"""
+    Blog.objects.filter(pk=comment.blog_id).update(
+        trending_score=score_update(comment_weight(), comment.created_at)
+    )
+
+
+def remove_comment(comment):
+    """Remove the score a deleted comment gave to its blog"""
+    Blog.objects.filter(pk=comment.blog_id).update(
+        trending_score=score_update(-comment_weight(), comment.created_at)
+    )
+
+
+def trending(queryset, limit):
+    """
+    Return the top blogs of the queryset by trending score, read in
+    one scan of the trending index
+    """
+    return queryset.order_by('-trending_score', '-id')[:limit]
+
+
+def _set_epoch(epoch):
+    cache.set(EPOCH_KEY, epoch, EPOCH_TIMEOUT)
+
+
+def rebase(now=None):
+    """
+    Move the epoch to now and scale the scores to it, returning the
+    factor they were multiplied by
+    """
+    now = now or timezone.now()
+
+    with transaction.atomic():
+        state, created = TrendingState.objects.select_for_update(
+        ).get_or_create(pk=1, defaults={'epoch': now})
+
+        factor = 2 ** ((state.epoch - now).total_seconds() / half_life())
+        if not created:
+            Blog.objects.filter(trending_score__gt=0).update(
+                trending_score=F('trending_score') * factor
+            )
+            state.epoch = now
+            state.save(update_fields=['epoch', 'epoch_timestamp'])
+
+        epoch = state.epoch_timestamp
+        _set_epoch(epoch)
+        transaction.on_commit(lambda: _set_epoch(epoch))
+
+    return factor
+
+
+def rebuild_scores(queryset):
+    """
+    Recompute the scores of the queryset blogs from their comments and
+    likes, for rows written without going through the scored paths.
+    Likes are scored as of when they were added, or of their blog when
+    they are not dated.
+    """
+    epoch = read_epoch()
+    scores = {
+        id: event_score(like_weight() * likes_count, created_at, epoch)
+        for id, created_at, likes_count in queryset.values_list(
+            'id', 'created_at', 'likes_count'
+        ).iterator(chunk_size=BATCH_SIZE)
+    }
+
+    dated_likes = BlogLike.objects.filter(
+        blog__in=queryset.values('id'),
+        created_at__isnull=False
+    ).values_list('blog_id', 'created_at', 'blog__created_at')
+    for blog_id, created_at, blog_created_at in dated_likes.iterator(
+        chunk_size=BATCH_SIZE
+    ):
+        scores[blog_id] += (
+            event_score(like_weight(), created_at, epoch)
+            - event_score(like_weight(), blog_created_at, epoch)
+        )
+
+    comments = Comment.objects.filter(
+        blog__in=queryset.values('id')
+    ).values_list('blog_id', 'created_at')
+    for blog_id, created_at in comments.iterator(chunk_size=BATCH_SIZE):
+        scores[blog_id] += event_score(comment_weight(), created_at, epoch)
+
+    Blog.objects.bulk_update(
+        [Blog(id=id, trending_score=score) for id, score in scores.items()],
+        ['trending_score'],
+        batch_size=BATCH_SIZE
+    )
+
+    return len(scores)
@@ -18,6 +18,36 @@ urlpatterns = [
         name='blog-me'
     ),
 
+    path(
+        'blogs/me/stats/',
+        BlogViews.AuthorStatsAPIView.as_view(),
+        name='blog-me-stats'
+    ),
+
+    path(
+        'blogs/search/',
+        BlogViews.BlogSearchAPIView.as_view(),
+        name='blog-search'
+    ),
+
+    path(
+        'blogs/trending/',
+        BlogViews.BlogTrendingAPIView.as_view(),
+        name='blog-trending'
+    ),
+
+    path(
+        'blogs/export/',
+        BlogViews.BlogExportAPIView.as_view(),
+        name='blog-export'
+    ),
+
+    path(
+        'tags/autocomplete/',
+        BlogViews.TagAutocompleteAPIView.as_view(),
+        name='tag-autocomplete'
+    ),
+
     path(
         '',
         include(router.urls)
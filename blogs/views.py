@@ -1,37 +1,179 @@
+from functools import partial
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count
+from django.http import StreamingHttpResponse
+
 from rest_framework import viewsets, mixins, generics, status
 from rest_framework.views import APIView
 from rest_framework.generics import get_object_or_404
 from rest_framework.response import Response
-from rest_framework.permissions import IsAuthenticated
-from rest_framework.exceptions import ValidationError
-from rest_framework.authentication import (
-    TokenAuthentication,
-    SessionAuthentication
+from rest_framework.permissions import (
+    SAFE_METHODS,
+    IsAuthenticated,
+    IsAdminUser
 )
+from rest_framework.exceptions import ValidationError, APIException, NotFound
+from rest_framework.authentication import SessionAuthentication
 
 from blogs.serializers import (
     TagSerializer,
     BlogSerializer,
     MyBlogSerializer,
-    CommentSerializer
+    CommentSerializer,
+    readable_fields
+)
+from blogs.fast_serializers import (
+    BlogValuesSerializer,
+    MyBlogValuesSerializer,
+    CommentValuesSerializer
 )
 from blogs.models import Tag, Blog, Comment
 from blogs.permissions import IsAuthorOrReadOnly
+from blogs.pagination import (
+    KeysetPagination,
+    OldestFirstKeysetPagination,
+    SearchPagination
+)
+from blogs.likes import add_like, remove_like
+from blogs.conditional import (
+    blog_list_validators,
+    blog_detail_validators,
+    comment_list_validators
+)
+from blogs import cache as blog_cache
+from blogs import autocomplete, search, trending
+from blogs.export import export_lines
+from core.authentication import CachedTokenAuthentication
+from core.conditional import conditional
+
+
+def _field_names(value):
+    return [name.strip() for name in value.split(',') if name.strip()]
+
+
+class SparseFieldsetMixin:
+    """
+    Answer reads with only the fields asked for with ?fields=, or with
+    all of them but those of ?omit=, and always the id. The deferred
+    fields are not read from the database when they are not answered.
+    """
+    deferred_fields = ('content',)
+
+    def get_fieldset(self):
+        """Return the names of the fields to answer, or None for all"""
+        if self.request.method not in SAFE_METHODS:
+            return None
+
+        params = self.request.query_params
+        fields = _field_names(params.get('fields', ''))
+        omit = _field_names(params.get('omit', ''))
+        if not fields and not omit:
+            return None
+
+        readable = readable_fields(self.get_serializer_class())
+        unknown = [name for name in fields + omit if name not in readable]
+        if unknown:
+            raise ValidationError({
+                'fields': "Unknown fields: %s." % ', '.join(unknown)
+            })
+
+        return [
+            name for name in readable
+            if name == 'id' or (
+                (not fields or name in fields) and name not in omit
+            )
+        ]
+
+    def get_serializer(self, *args, **kwargs):
+        kwargs.setdefault('fields', self.get_fieldset())
+        return super().get_serializer(*args, **kwargs)
+
+    def filter_queryset(self, queryset):
+        """Defer the deferred fields that are not answered"""
+        queryset = super().filter_queryset(queryset)
+        fieldset = self.get_fieldset()
+
+        if fieldset is None:
+            return queryset
+
+        deferred = [
+            name for name in self.deferred_fields if name not in fieldset
+        ]
+
+        return queryset.defer(*deferred) if deferred else queryset
+
+
+class ValuesListMixin:
+    """
+    List the rows as values() dicts serialized by values_serializer_class,
+    the read-only fast path of the serializer_class output
+    """
+    values_serializer_class = None
+
+    def list_values(self, request, *args, **kwargs):
+        """Retrieve the page of rows read with values()"""
+        serializer_class = self.values_serializer_class
+        fieldset = self.get_fieldset()
+
+        # The pagination reads its ordering fields, answered or not
+        lookups = serializer_class.lookups(fieldset) + tuple(
+            field.lstrip('-') for field in self.paginator.ordering
+        )
+        queryset = self.filter_queryset(
+            self.get_queryset()
+        ).prefetch_related(None).values(*dict.fromkeys(lookups))
+
+        page = self.paginate_queryset(queryset)
+        serializer = serializer_class(
+            page,
+            fields=fieldset,
+            context=self.get_serializer_context()
+        )
+
+        return self.get_paginated_response(serializer.data)
 
 
 class CreateListTagAPIViewSet(viewsets.GenericViewSet,
                               mixins.ListModelMixin,
                               mixins.CreateModelMixin):
     """List and Create a new Tag"""
-    authentication_classes = (TokenAuthentication, SessionAuthentication)
+    authentication_classes = (CachedTokenAuthentication, SessionAuthentication)
     permission_classes = (IsAuthenticated,)
     serializer_class = TagSerializer
     queryset = Tag.objects.all().order_by('content')
 
 
+class TagAutocompleteAPIView(APIView):
+    """Retrieve the most used tags starting with a prefix"""
+    authentication_classes = (CachedTokenAuthentication, SessionAuthentication)
+    permission_classes = (IsAuthenticated,)
+    default_limit = 10
+    max_limit = 50
+
+    def get_limit(self):
+        """Return the number of tags asked for with ?limit="""
+        try:
+            limit = int(self.request.query_params.get(
+                'limit', self.default_limit
+            ))
+        except ValueError:
+            raise ValidationError({'limit': "A valid integer is required."})
+
+        return max(1, min(limit, self.max_limit))
+
+    def get(self, request, *args, **kwargs):
+        """Retrieve the tags starting with the 'prefix' query parameter"""
+        prefix = request.query_params.get('prefix', '').strip()
+        if not prefix:
+            raise ValidationError({'prefix': "A prefix is required."})
+
+        return Response(autocomplete.autocomplete(prefix, self.get_limit()))
+
+
 class ListBlogTagsAPIView(generics.ListAPIView):
     """Retrieve blog tags"""
-    authentication_classes = (TokenAuthentication, SessionAuthentication)
+    authentication_classes = (CachedTokenAuthentication, SessionAuthentication)
     permission_classes = (IsAuthenticated,)
     serializer_class = TagSerializer
     queryset = Tag.objects.all().order_by('content')
@@ -41,69 +183,242 @@ class ListBlogTagsAPIView(generics.ListAPIView):
         kwarg_slug = self.kwargs.get("slug")
         return self.queryset.filter(tag_blogs__slug=kwarg_slug)
 
+    def list(self, request, *args, **kwargs):
+        """Retrieve blog tags from the response cache"""
+        blog_id = blog_cache.blog_id_for_slug(self.kwargs.get("slug"))
+        if blog_id is None:
+            return super().list(request, *args, **kwargs)
 
-class BlogViewSet(viewsets.ModelViewSet):
+        key = blog_cache.response_key('blog-tags', request, blog_id)
+        build = partial(super().list, request, *args, **kwargs)
+
+        return blog_cache.cached_response(request, key, build)
+
+
+class BlogViewSet(SparseFieldsetMixin, ValuesListMixin,
+                  viewsets.ModelViewSet):
     """Retrieve, update and delete Blogs"""
-    authentication_classes = (TokenAuthentication, SessionAuthentication)
+    authentication_classes = (CachedTokenAuthentication, SessionAuthentication)
     permission_classes = (IsAuthenticated, IsAuthorOrReadOnly)
     serializer_class = BlogSerializer
+    values_serializer_class = BlogValuesSerializer
     queryset = Blog.objects.all().order_by('-created_at')
     lookup_field = 'slug'
+    pagination_class = KeysetPagination
+
+    def get_queryset(self):
+        """Retrieve blogs with their likes and tags already loaded"""
+        return self.queryset.with_likes(self.request.user)
+
+    @conditional(blog_list_validators)
+    def list(self, request, *args, **kwargs):
+        """Retrieve blogs from the response cache"""
+        key = blog_cache.response_key('blog-list', request)
+        build = partial(self.list_values, request, *args, **kwargs)
+
+        return blog_cache.cached_response(request, key, build, Blog)
+
+    @conditional(blog_detail_validators)
+    def retrieve(self, request, *args, **kwargs):
+        """Retrieve a blog from the response cache"""
+        blog_id = blog_cache.blog_id_for_slug(self.kwargs.get("slug"))
+        if blog_id is None:
+            return super().retrieve(request, *args, **kwargs)
+
+        key = blog_cache.response_key('blog-detail', request, blog_id)
+        build = partial(super().retrieve, request, *args, **kwargs)
+
+        return blog_cache.cached_response(request, key, build, Blog)
 
     def perform_create(self, serializer):
         serializer.save(author=self.request.user)
 
 
-class MyblogsAPIView(generics.ListAPIView):
+class MyblogsAPIView(SparseFieldsetMixin, ValuesListMixin,
+                     generics.ListAPIView):
     """Retrieve user blogs"""
-    authentication_classes = (TokenAuthentication, SessionAuthentication)
+    authentication_classes = (CachedTokenAuthentication, SessionAuthentication)
     permission_classes = (IsAuthenticated,)
     serializer_class = MyBlogSerializer
+    values_serializer_class = MyBlogValuesSerializer
     queryset = Blog.objects.all().order_by('created_at')
+    pagination_class = OldestFirstKeysetPagination
 
     def get_queryset(self):
         """Retrieve blogs for the authenticated user"""
-        return self.queryset.filter(author=self.request.user)
+        return self.queryset.filter(
+            author=self.request.user
+        ).with_likes(self.request.user)
 
+    def list(self, request, *args, **kwargs):
+        return self.list_values(request, *args, **kwargs)
 
-class BlogLikeAPIView(APIView):
-    """Blog likes management"""
+
+class AuthorStatsAPIView(APIView):
+    """Retrieve the likes and comments received by the user blogs"""
+    authentication_classes = (CachedTokenAuthentication, SessionAuthentication)
+    permission_classes = (IsAuthenticated,)
+
+    def get(self, request):
+        """Return the totals and the counts of every blog, in one query"""
+        blogs = list(
+            Blog.objects.filter(author=request.user).annotate(
+                comments_count=Count('comments')
+            ).order_by('created_at', 'id').values(
+                'id', 'slug', 'title', 'likes_count', 'comments_count'
+            )
+        )
+
+        return Response({
+            'blogs_count': len(blogs),
+            'likes_count': sum(blog['likes_count'] for blog in blogs),
+            'comments_count': sum(blog['comments_count'] for blog in blogs),
+            'blogs': blogs,
+        })
+
+
+class BlogSearchAPIView(generics.ListAPIView):
+    """Full-text search of blogs, best matches first"""
+    authentication_classes = (CachedTokenAuthentication, SessionAuthentication)
+    permission_classes = (IsAuthenticated,)
     serializer_class = BlogSerializer
-    authentication_classes = (TokenAuthentication, SessionAuthentication)
+    queryset = Blog.objects.all()
+    pagination_class = SearchPagination
+
+    def get_queryset(self):
+        """Retrieve blogs with their likes and tags already loaded"""
+        return self.queryset.with_likes(self.request.user)
+
+    def list(self, request, *args, **kwargs):
+        """Retrieve the blogs matching the 'q' query parameter"""
+        query = request.query_params.get('q', '').strip()
+        if not query:
+            raise ValidationError({'q': "A search query is required."})
+
+        if not search.is_supported():
+            raise APIException("Search is not available.")
+
+        page = self.paginator.paginate_search(
+            partial(search.search, query),
+            self.get_queryset(),
+            request,
+            view=self
+        )
+        serializer = self.get_serializer(page, many=True)
+
+        return self.get_paginated_response(serializer.data)
+
+
+class BlogTrendingAPIView(generics.ListAPIView):
+    """Retrieve the top blogs by time-decayed likes and comments"""
+    authentication_classes = (CachedTokenAuthentication, SessionAuthentication)
     permission_classes = (IsAuthenticated,)
+    serializer_class = BlogSerializer
+    queryset = Blog.objects.all()
+    pagination_class = None
+    default_limit = 20
+    max_limit = 100
+
+    def get_limit(self):
+        """Return the number of blogs asked for with ?limit="""
+        try:
+            limit = int(self.request.query_params.get(
+                'limit', self.default_limit
+            ))
+        except ValueError:
+            raise ValidationError({'limit': "A valid integer is required."})
+
+        return max(1, min(limit, self.max_limit))
 
-    def post(self, request, id):
-        """Likes a blog"""
-        blog = get_object_or_404(Blog, id=id)
-        user = request.user
+    def get_queryset(self):
+        """Retrieve the trending blogs with their likes and tags loaded"""
+        return trending.trending(
+            self.queryset.with_likes(self.request.user),
+            self.get_limit()
+        )
+
+
+class BlogExportAPIView(APIView):
+    """Stream every blog as newline-delimited JSON, for admins"""
+    authentication_classes = (CachedTokenAuthentication, SessionAuthentication)
+    permission_classes = (IsAdminUser,)
+
+    def get(self, request):
+        """Export blogs with their tags, comments and likes count"""
+        response = StreamingHttpResponse(
+            export_lines(),
+            content_type='application/x-ndjson'
+        )
+        response['Content-Disposition'] = 'attachment; filename="blogs.ndjson"'
+
+        return response
+
+
+class LikeAPIView(APIView):
+    """
+    Likes management of the model objects.
+
+    Liking and unliking answer the compact {liked, likes_count} body,
+    or the full object representation when ?full=true is given.
+    """
+    model = None
+    serializer_class = None
+    authentication_classes = (CachedTokenAuthentication, SessionAuthentication)
+    permission_classes = (IsAuthenticated,)
 
-        blog.likes.add(user)
-        blog.save()
+    def get_queryset(self):
+        """Retrieve the objects with the likes of the user already loaded"""
+        return self.model.objects.with_likes(self.request.user)
+
+    def wants_full(self):
+        """Return if the full representation was asked for"""
+        return self.request.query_params.get('full', '').lower() in (
+            '1', 'true', 'yes'
+        )
+
+    def like_response(self, id, liked, likes_count):
+        """Return the likes of the object or its full representation"""
+        if likes_count is None:
+            raise NotFound()
+
+        if self.wants_full():
+            instance = get_object_or_404(self.get_queryset(), id=id)
+            serializer = self.serializer_class(
+                instance,
+                context={'request': self.request, 'view': self}
+            )
+
+            return Response(serializer.data, status=status.HTTP_200_OK)
+
+        return Response(
+            {'liked': liked, 'likes_count': likes_count},
+            status=status.HTTP_200_OK
+        )
 
-        serializer_context = {'request': request}
-        serializer = self.serializer_class(blog, context=serializer_context)
+    def post(self, request, id):
+        """Likes an object"""
+        likes_count = add_like(self.model, id, request.user)
 
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        return self.like_response(id, True, likes_count)
 
     def delete(self, request, id):
-        """Unlikes a blog"""
-        blog = get_object_or_404(Blog, id=id)
-        user = request.user
+        """Unlikes an object"""
+        likes_count = remove_like(self.model, id, request.user)
 
-        blog.likes.remove(user)
-        blog.save()
+        return self.like_response(id, False, likes_count)
 
-        serializer_context = {'request': request}
-        serializer = self.serializer_class(blog, context=serializer_context)
 
-        return Response(serializer.data, status=status.HTTP_200_OK)
+class BlogLikeAPIView(LikeAPIView):
+    """Blog likes management"""
+    model = Blog
+    serializer_class = BlogSerializer
 
 
 class CommentCreateAPIView(generics.CreateAPIView):
     """Create a new comment"""
     queryset = Comment.objects.all()
     serializer_class = CommentSerializer
-    authentication_classes = (TokenAuthentication, SessionAuthentication)
+    authentication_classes = (CachedTokenAuthentication, SessionAuthentication)
     permission_classes = (IsAuthenticated,)
 
     def perform_create(self, serializer):
@@ -111,18 +426,25 @@ class CommentCreateAPIView(generics.CreateAPIView):
         kwarg_slug = self.kwargs.get("slug")
         blog = get_object_or_404(Blog, slug=kwarg_slug)
 
-        if blog.comments.filter(author=request_user).exists():
-            raise ValidationError("You have already commented this Blog!")
-
-        serializer.save(author=request_user, blog=blog)
+        try:
+            with transaction.atomic():
+                serializer.save(author=request_user, blog=blog)
+        except IntegrityError:
+            # Only the one comment per author and blog is the user's error
+            if Comment.objects.filter(blog=blog, author=request_user).exists():
+                raise ValidationError("You have already commented this Blog!")
+            raise
 
 
-class CommentListAPIView(generics.ListAPIView):
+class CommentListAPIView(SparseFieldsetMixin, ValuesListMixin,
+                         generics.ListAPIView):
     """Retrieve a blog comments"""
     queryset = Comment.objects.all()
     serializer_class = CommentSerializer
-    authentication_classes = (TokenAuthentication, SessionAuthentication)
+    values_serializer_class = CommentValuesSerializer
+    authentication_classes = (CachedTokenAuthentication, SessionAuthentication)
     permission_classes = (IsAuthenticated,)
+    pagination_class = KeysetPagination
 
     def get_queryset(self):
         """Retrieve blog comments"""
@@ -130,7 +452,19 @@ class CommentListAPIView(generics.ListAPIView):
 
         return self.queryset.filter(
             blog__slug=kwarg_slug
-        ).order_by('-created_at')
+        ).with_likes(self.request.user).order_by('-created_at')
+
+    @conditional(comment_list_validators)
+    def list(self, request, *args, **kwargs):
+        """Retrieve blog comments from the response cache"""
+        blog_id = blog_cache.blog_id_for_slug(self.kwargs.get('slug'))
+        if blog_id is None:
+            return self.list_values(request, *args, **kwargs)
+
+        key = blog_cache.response_key('comment-list', request, blog_id)
+        build = partial(self.list_values, request, *args, **kwargs)
+
+        return blog_cache.cached_response(request, key, build, Comment)
 
 
 class CommentRetrieveUpdateDestroyAPIView(
@@ -139,38 +473,21 @@ class CommentRetrieveUpdateDestroyAPIView(
     """Comments detail view"""
     queryset = Comment.objects.all()
     serializer_class = CommentSerializer
-    authentication_classes = (TokenAuthentication, SessionAuthentication)
+    authentication_classes = (CachedTokenAuthentication, SessionAuthentication)
     permission_classes = (IsAuthenticated, IsAuthorOrReadOnly)
 
+    def get_queryset(self):
+        """Retrieve comments with their blog and likes already loaded"""
+        return self.queryset.select_related(
+            'blog'
+        ).with_likes(self.request.user)
+
 
-class CommentLikeAPIView(APIView):
+class CommentLikeAPIView(LikeAPIView):
     """Comment likes management"""
+    model = Comment
     serializer_class = CommentSerializer
-    authentication_classes = (TokenAuthentication, SessionAuthentication)
-    permission_classes = (IsAuthenticated,)
-
-    def post(self, request, id):
-        """Likes a comment"""
-        comment = get_object_or_404(Comment, id=id)
-        user = request.user
-
-        comment.likes.add(user)
-        comment.save()
 
-        serializer_context = {'request': request}
-        serializer = self.serializer_class(comment, context=serializer_context)
-
-        return Response(serializer.data, status=status.HTTP_200_OK)
-
-    def delete(self, request, id):
-        """Unlikes a comment"""
-        comment = get_object_or_404(Comment, id=id)
-        user = request.user
-
-        comment.likes.remove(user)
-        comment.save()
-
-        serializer_context = {'request': request}
-        serializer = self.serializer_class(comment, context=serializer_context)
-
-        return Response(serializer.data, status=status.HTTP_200_OK)
+    def get_queryset(self):
+        """Retrieve comments with their blog and likes already loaded"""
+        return super().get_queryset().select_related('blog')
@@ -0,0 +1,51 @@
+import asyncio
+
+from asgiref.sync import sync_to_async
+
+from django.db import close_old_connections
+
+
+def database_sync_to_async(func):
+    """
+    Return a coroutine function running func in a worker thread of its
+    own, instead of the single thread Django runs sync code in under
+    ASGI, closing the expired database connections of that thread
+    around the call as the request signals do for sync views
+    """
+    def run(*args, **kwargs):
+        close_old_connections()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            close_old_connections()
+
+    return sync_to_async(run, thread_sensitive=False)
+
+
+class AsyncCapableMiddleware:
+    """
+    Middleware run in the mode of the handler it wraps, so that under
+    ASGI the chain reaches async views without the single thread sync
+    middleware are run in. Subclasses serve the async chain from
+    __acall__, which __call__ hands the requests to then.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = asyncio.iscoroutinefunction(get_response)
+
+        if self.is_async:
+            # Marks the instance as a coroutine function for Django, as
+            # MiddlewareMixin does
+            self._is_coroutine = asyncio.coroutines._is_coroutine
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+
+        return self.get_response(request)
+
+    async def __acall__(self, request):
+        return await self.get_response(request)
@@ -0,0 +1,146 @@
+"""
+Token authentication backed by an in-process token to user cache.
+
+Every worker process keeps its own bounded LRU map of token keys to the
+user and token rows, whose entries expire after a short TTL. Logging
+out, deleting a token or saving a user drops the entries of this
+process right away, other processes notice it within the TTL.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+from rest_framework.authentication import TokenAuthentication
+
+from core.replicas import primary_reads
+
+
+def _freeze(instance):
+    """Return the concrete field values of a model instance"""
+    opts = instance._meta
+
+    return tuple(
+        getattr(instance, field.attname) for field in opts.concrete_fields
+    )
+
+
+def _thaw(model, values):
+    """Return a new model instance out of its frozen field values"""
+    field_names = [field.attname for field in model._meta.concrete_fields]
+
+    return model.from_db(DEFAULT_DB_ALIAS, field_names, values)
+
+
+class TokenCache:
+    """
+    Bounded LRU map of token keys to frozen (user, token) rows, whose
+    entries expire ttl seconds after being set
+    """
+
+    def __init__(self, max_size, ttl, clock=time.monotonic):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Return the cached (user, token) of the key, or None"""
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is None or entry[0] <= self.clock():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            _, _, user_model, user, token_model, token = entry
+
+        # Every request gets its own instances, so nothing set on them
+        # leaks into other requests or threads.
+        user = _thaw(user_model, user)
+        token = _thaw(token_model, token)
+        token.user = user
+
+        return user, token
+
+    def set(self, key, user, token):
+        """Cache the (user, token) of the key"""
+        entry = (
+            self.clock() + self.ttl,
+            user.pk,
+            type(user), _freeze(user),
+            type(token), _freeze(token),
+        )
+
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, key):
+        """Drop the entry of a token key"""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def invalidate_user(self, user_id):
+        """Drop every entry of a user"""
+        with self._lock:
+            keys = [
+                key for key, entry in self._entries.items()
+                if entry[1] == user_id
+            ]
+            for key in keys:
+                del self._entries[key]
+
+    def clear(self):
+        """Drop every entry and reset the counters"""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+    def stats(self):
+        """Return the hit and miss counters and the number of entries"""
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'size': len(self._entries),
+                'max_size': self.max_size,
+                'ttl': self.ttl,
+            }
+
+
+token_cache = TokenCache(
+    max_size=getattr(settings, 'TOKEN_CACHE_MAX_SIZE', 10000),
+    ttl=getattr(settings, 'TOKEN_CACHE_TTL', 60)
+)
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """
+    Token authentication that reads the token and its user from the
+    token cache before querying them, on the primary, so a token just
+    created is never missing from a lagging replica
+    """
+
+    def authenticate_credentials(self, key):
+        cached = token_cache.get(key)
+        if cached is not None:
+            return cached
+
+        with primary_reads():
+            user, token = super().authenticate_credentials(key)
+        token_cache.set(key, user, token)
+
+        return user, token
@@ -0,0 +1,178 @@
+"""
+Compression of the API JSON responses with Brotli, when it is installed
+and accepted, or gzip.
+
+Only responses of COMPRESSION_MIN_SIZE bytes or more are compressed.
+Responses marked with the cache key of their payload, as the cached
+responses of the blogs are, keep their compressed bytes in the cache
+under that key and the digest of their content, which differs between
+users, so a cache hit is not compressed again.
+"""
+import gzip
+import hashlib
+import re
+
+from asgiref.sync import sync_to_async
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.cache import patch_vary_headers
+
+from core.asynchronous import AsyncCapableMiddleware
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+COMPRESSED_KEY = 'compressed:%s:%s:%s:%s'
+
+ACCEPTS_BROTLI = re.compile(r'\bbr\b')
+ACCEPTS_GZIP = re.compile(r'\bgzip\b')
+
+
+def gzip_compress(content, level):
+    # A fixed mtime keeps the output of the same content the same
+    return gzip.compress(content, compresslevel=level, mtime=0)
+
+
+def brotli_compress(content, quality):
+    return brotli.compress(content, quality=quality)
+
+
+def encodings():
+    """
+    Return the (name, compress, level, accept pattern) of the available
+    encodings, by preference
+    """
+    available = [(
+        'gzip',
+        gzip_compress,
+        getattr(settings, 'COMPRESSION_GZIP_LEVEL', 6),
+        ACCEPTS_GZIP,
+    )]
+
+    if brotli is not None:
+        available.insert(0, (
+            'br',
+            brotli_compress,
+            getattr(settings, 'COMPRESSION_BROTLI_QUALITY', 5),
+            ACCEPTS_BROTLI,
+        ))
+
+    return available
+
+
+def choose_encoding(accept_encoding):
+    """Return the preferred (name, compress, level) the client accepts"""
+    for name, compress, level, accepts in encodings():
+        if accepts.search(accept_encoding):
+            return name, compress, level
+
+    return None
+
+
+def compressed_key(cache_key, encoding, level, content):
+    """Return the cache key of the compressed content of a response"""
+    digest = hashlib.sha1(content).hexdigest()
+
+    return COMPRESSED_KEY % (cache_key, encoding, level, digest)
+
+
+def compress(content, encoding, compress_func, level, cache_key=None):
+    """
+    Return the content compressed, from the cache when the cache key of
+    the response payload is given
+    """
+    if cache_key is None:
+        return compress_func(content, level)
+
+    key = compressed_key(cache_key, encoding, level, content)
+    compressed = cache.get(key)
+
+    if compressed is None:
+        compressed = compress_func(content, level)
+        cache.set(key, compressed)
+
+    return compressed
+
+
+def is_compressible(response):
+    content_type = response.get('Content-Type', '')
+
+    return (
+        not response.streaming
+        and not response.has_header('Content-Encoding')
+        and content_type.startswith('application/json')
+    )
+
+
+class CompressionMiddleware(AsyncCapableMiddleware):
+    """
+    Compress the JSON responses with the encoding preferred among those
+    the client accepts
+    """
+
+    def __init__(self, get_response):
+        super().__init__(get_response)
+        self.min_size = getattr(settings, 'COMPRESSION_MIN_SIZE', 1024)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+
+        return self.process_response(request, self.get_response(request))
+
+    async def __acall__(self, request):
+        response = await self.get_response(request)
+
+        if not is_compressible(response):
+            return response
+
+        # Compressing, and reading the cache, would hold up the event loop
+        process_response = sync_to_async(
+            self.process_response,
+            thread_sensitive=False
+        )
+
+        return await process_response(request, response)
+
+    def process_response(self, request, response):
+        if not is_compressible(response):
+            return response
+
+        # The response depends on Accept-Encoding whatever its size
+        patch_vary_headers(response, ('Accept-Encoding',))
+
+        if len(response.content) < self.min_size:
+            return response
+
+        encoding = choose_encoding(
+            request.META.get('HTTP_ACCEPT_ENCODING', '')
+        )
+        if encoding is None:
+            return response
+
+        name, compress_func, level = encoding
+        compressed = compress(
+            response.content,
+            name,
+            compress_func,
+            level,
+            getattr(response, 'compression_cache_key', None)
+        )
+
+        if len(compressed) >= len(response.content):
+            return response
+
+        response.content = compressed
+        response['Content-Length'] = str(len(compressed))
+        response['Content-Encoding'] = name
+
+        # The compressed bytes are not the ones a strong ETag validates
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response['ETag'] = 'W/' + etag
+
+        return response
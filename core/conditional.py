@@ -0,0 +1,59 @@
+import hashlib
+
+from django.utils.decorators import method_decorator
+from django.views.decorators.http import condition
+
+from core.replicas import primary_reads
+
+
+def make_etag(*parts):
+    """Return a strong ETag digest of the given parts"""
+    digest = hashlib.sha1()
+
+    for part in parts:
+        digest.update(str(part).encode())
+        digest.update(b'\0')
+
+    return digest.hexdigest()
+
+
+def conditional(validators):
+    """
+    Decorate a view method to answer conditional GET requests.
+
+    validators(request, *args, **kwargs) returns the ETag parts of the
+    resource, or None when it does not exist, and its last modification
+    time, both taken from a single cheap query. The ETag also varies by
+    user, URL and accepted media type, so a 304 is only returned for
+    the representation the client already has, before serializing it.
+    The validators are read from the primary, like the cached responses
+    they stand for.
+    """
+    def get_validators(request, *args, **kwargs):
+        if not hasattr(request, '_conditional_validators'):
+            with primary_reads():
+                request._conditional_validators = validators(
+                    request, *args, **kwargs
+                )
+
+        return request._conditional_validators
+
+    def etag(request, *args, **kwargs):
+        parts, _ = get_validators(request, *args, **kwargs)
+        if parts is None:
+            return None
+
+        return make_etag(
+            request.user.pk,
+            request.get_full_path(),
+            request.META.get('HTTP_ACCEPT', ''),
+            *parts
+        )
+
+    def last_modified(request, *args, **kwargs):
+        _, modified_at = get_validators(request, *args, **kwargs)
+        return modified_at
+
+    return method_decorator(
+        condition(etag_func=etag, last_modified_func=last_modified)
+    )
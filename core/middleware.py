@@ -0,0 +1,226 @@
+import json
+import logging
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+from core.asynchronous import AsyncCapableMiddleware
+
+
+logger = logging.getLogger('viblog.requests')
+
+
+class QueryTimer:
+    """Database execute wrapper counting the queries and their duration"""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - start
+            self.count += 1
+
+
+_queries = ContextVar('queries', default=None)
+
+
+def time_query(execute, sql, params, many, context):
+    """Execute wrapper counting the query in the timer of its request"""
+    timer = _queries.get()
+    if timer is None:
+        return execute(sql, params, many, context)
+
+    return timer(execute, sql, params, many, context)
+
+
+def install_query_timing(connection):
+    """Count the queries of the connection in the timer of their request"""
+    # First, as execute_wrapper() pops the last wrapper when it exits
+    if time_query not in connection.execute_wrappers:
+        connection.execute_wrappers.insert(0, time_query)
+
+
+@receiver(connection_created)
+def connection_query_timing(sender, connection, **kwargs):
+    install_query_timing(connection)
+
+
+class SerializationTimer:
+    """Time spent serializing the data of a request, out of its queries"""
+
+    def __init__(self, queries):
+        self.queries = queries
+        self.duration = 0.0
+        self.depth = 0
+
+
+_serialization = ContextVar('serialization', default=None)
+
+
+@contextmanager
+def timed_serialization():
+    """
+    Count the block as serialization of the current request, out of the
+    queries it makes, once when blocks nest
+    """
+    timer = _serialization.get()
+    if timer is None or timer.depth:
+        yield
+        return
+
+    timer.depth += 1
+    start = time.perf_counter()
+    db_start = timer.queries.duration
+    try:
+        yield
+    finally:
+        timer.depth -= 1
+        timer.duration += (
+            time.perf_counter() - start
+            - (timer.queries.duration - db_start)
+        )
+
+
+class RequestTimers:
+    """
+    Query, serialization and total timers of a request, the current ones
+    of the threads it runs code in while entered
+    """
+
+    def __init__(self, request):
+        self.queries = QueryTimer()
+        self.serialization = SerializationTimer(self.queries)
+        self.total = 0.0
+        request._render_duration = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        self.tokens = (
+            _queries.set(self.queries),
+            _serialization.set(self.serialization),
+        )
+
+        return self
+
+    def __exit__(self, *exc_info):
+        self.total = time.perf_counter() - self.start
+        queries_token, serialization_token = self.tokens
+        _serialization.reset(serialization_token)
+        _queries.reset(queries_token)
+
+
+class ServerTimingMiddleware(AsyncCapableMiddleware):
+    """
+    Time every request and count its queries, whatever DEBUG is.
+
+    The database time and query count, the view time out of the
+    database and serialization, the serialization time, spent in the
+    serializers data out of their queries, the response rendering time,
+    where DRF encodes the data into JSON, and the total time are sent in
+    a Server-Timing header, with the query count in X-Query-Count. A
+    JSON log line of them is written for a SERVER_TIMING_LOG_SAMPLE_RATE
+    share of the requests.
+
+    The queries are counted in whichever thread the request runs them,
+    the worker threads of async views included, but not those of
+    streamed response bodies, which run after the response is returned.
+    """
+
+    def __init__(self, get_response):
+        super().__init__(get_response)
+        self.headers = getattr(settings, 'SERVER_TIMING_HEADERS', True)
+        self.sample_rate = getattr(
+            settings, 'SERVER_TIMING_LOG_SAMPLE_RATE', 0.0
+        )
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+
+        # Connections opened before the receiver was connected
+        for connection in connections.all():
+            install_query_timing(connection)
+
+        with RequestTimers(request) as timers:
+            response = self.get_response(request)
+
+        return self.finish(request, response, timers)
+
+    async def __acall__(self, request):
+        with RequestTimers(request) as timers:
+            response = await self.get_response(request)
+
+        return self.finish(request, response, timers)
+
+    def finish(self, request, response, timers):
+        """Add the timing headers to the response and log them"""
+        queries = timers.queries
+        total = timers.total
+        render = request._render_duration
+        serialize = timers.serialization.duration
+        timings = {
+            'db': queries.duration,
+            'view': max(total - render - serialize - queries.duration, 0.0),
+            'serialize': serialize,
+            'render': render,
+            'total': total,
+        }
+
+        if self.headers:
+            response['Server-Timing'] = ', '.join(
+                self._metric(name, duration, queries.count)
+                for name, duration in timings.items()
+            )
+            response['X-Query-Count'] = str(queries.count)
+
+        if self.sample_rate and random.random() < self.sample_rate:
+            self.log(request, response, timings, queries.count)
+
+        return response
+
+    @staticmethod
+    def _metric(name, duration, query_count):
+        metric = '%s;dur=%.2f' % (name, duration * 1000)
+        if name == 'db':
+            metric += ';desc="%d queries"' % query_count
+
+        return metric
+
+    def process_template_response(self, request, response):
+        """Time the rendering of the response, which comes next"""
+        start = time.perf_counter()
+
+        def rendered(response):
+            request._render_duration = time.perf_counter() - start
+
+        response.add_post_render_callback(rendered)
+
+        return response
+
+    def log(self, request, response, timings, query_count):
+        """Write a structured log line of the request timings"""
+        user = getattr(request, 'user', None)
+
+        logger.info(json.dumps({
+            'method': request.method,
+            'path': request.path,
+            'status': response.status_code,
+            'user': user.pk if user is not None else None,
+            'queries': query_count,
+            'db_ms': round(timings['db'] * 1000, 2),
+            'view_ms': round(timings['view'] * 1000, 2),
+            'serialize_ms': round(timings['serialize'] * 1000, 2),
+            'render_ms': round(timings['render'] * 1000, 2),
+            'total_ms': round(timings['total'] * 1000, 2),
+        }))
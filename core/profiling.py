@@ -0,0 +1,240 @@
+"""
+On-demand profiling of single requests.
+
+A staff user mints a signed profile token from the admin, and sends it
+in the X-Profile header of the requests to profile, never in the URL,
+which access logs, proxies and Referer headers keep. They run under
+cProfile, whose pstats dump is kept, or under a sampling profiler,
+which reads the request thread stack every few milliseconds and keeps
+the collapsed stacks flame graph tools read.
+The last profiles are kept in a bounded in-memory ring of the process.
+
+Under ASGI, the profiled requests run the rest of the middleware chain
+from a worker thread, which the sync views run in too. The reads of the
+async views, made from worker threads of their own, are not followed.
+"""
+import cProfile
+import marshal
+import sys
+import threading
+import time
+import uuid
+from collections import Counter, OrderedDict, namedtuple
+
+from asgiref.sync import async_to_sync, sync_to_async
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core import signing
+from django.urls import reverse
+from django.utils import timezone
+
+from core.asynchronous import AsyncCapableMiddleware
+
+
+PROFILE_HEADER = 'HTTP_X_PROFILE'
+TOKEN_SALT = 'core.profiling'
+
+CPROFILE = 'cprofile'
+SAMPLE = 'sample'
+MODES = (CPROFILE, SAMPLE)
+
+Profile = namedtuple('Profile', [
+    'id', 'created_at', 'mode', 'user_id', 'method', 'path', 'status',
+    'duration_ms', 'artifact', 'filename', 'content_type',
+])
+
+
+def make_token(user, mode=SAMPLE):
+    """Return a signed profile token of a staff user"""
+    return signing.dumps({'u': user.pk, 'm': mode}, salt=TOKEN_SALT)
+
+
+def read_token(token):
+    """
+    Return the profiling mode of a valid token of a user who is still
+    staff, or None
+    """
+    max_age = getattr(settings, 'PROFILER_TOKEN_MAX_AGE', 3600)
+
+    try:
+        payload = signing.loads(token, salt=TOKEN_SALT, max_age=max_age)
+    except signing.BadSignature:
+        return None
+
+    if payload.get('m') not in MODES:
+        return None
+
+    is_staff = get_user_model().objects.filter(
+        pk=payload.get('u'),
+        is_staff=True,
+        is_active=True
+    ).exists()
+
+    return payload['m'] if is_staff else None
+
+
+class StackSampler:
+    """
+    Sample the stack of the current thread from another thread, and
+    count the collapsed stacks, root first, as flame graph tools read
+    """
+
+    def __init__(self, interval):
+        self.interval = interval
+        self.stacks = Counter()
+        self._stop = threading.Event()
+
+    def __enter__(self):
+        self._thread_id = threading.get_ident()
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+        self._thread.start()
+
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stop.set()
+        self._thread.join()
+
+    def _sample(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self._thread_id)
+            if frame is not None:
+                self.stacks[self._collapse(frame)] += 1
+
+    @staticmethod
+    def _collapse(frame):
+        names = []
+        while frame is not None:
+            names.append('%s.%s' % (
+                frame.f_globals.get('__name__', '?'), frame.f_code.co_name
+            ))
+            frame = frame.f_back
+
+        return ';'.join(reversed(names))
+
+    def collapsed(self):
+        """Return the collapsed stacks and their sample counts"""
+        return ''.join(
+            '%s %d\n' % (stack, count)
+            for stack, count in sorted(self.stacks.items())
+        )
+
+
+def profile_call(mode, call):
+    """
+    Return the result of call() run under the profiler of the mode,
+    with the (artifact, filename extension, content type) it produced
+    """
+    if mode == CPROFILE:
+        profiler = cProfile.Profile()
+        result = profiler.runcall(call)
+        profiler.create_stats()
+
+        artifact = marshal.dumps(profiler.stats)
+        return result, (artifact, 'prof', 'application/octet-stream')
+
+    interval = getattr(settings, 'PROFILER_SAMPLE_INTERVAL', 0.002)
+    with StackSampler(interval) as sampler:
+        result = call()
+
+    artifact = sampler.collapsed().encode()
+    return result, (artifact, 'folded', 'text/plain; charset=utf-8')
+
+
+class ProfileRing:
+    """Bounded in-memory ring of the last profiles, by id"""
+
+    def __init__(self, size):
+        self.size = size
+        self._profiles = OrderedDict()
+        self._lock = threading.Lock()
+
+    def add(self, profile):
+        with self._lock:
+            self._profiles[profile.id] = profile
+
+            while len(self._profiles) > self.size:
+                self._profiles.popitem(last=False)
+
+    def get(self, id):
+        with self._lock:
+            return self._profiles.get(id)
+
+    def list(self):
+        """Return the profiles, newest first"""
+        with self._lock:
+            return list(reversed(self._profiles.values()))
+
+    def clear(self):
+        with self._lock:
+            self._profiles.clear()
+
+
+profiles = ProfileRing(getattr(settings, 'PROFILER_RING_SIZE', 50))
+
+
+def record(mode, request, response, duration, output):
+    """Keep the profile of a request in the ring and return it"""
+    artifact, extension, content_type = output
+    id = uuid.uuid4().hex
+    user = getattr(request, 'user', None)
+
+    profile = Profile(
+        id=id,
+        created_at=timezone.now(),
+        mode=mode,
+        user_id=user.pk if user is not None else None,
+        method=request.method,
+        path=request.get_full_path(),
+        status=response.status_code,
+        duration_ms=round(duration * 1000, 2),
+        artifact=artifact,
+        filename='profile-%s.%s' % (id, extension),
+        content_type=content_type,
+    )
+    profiles.add(profile)
+
+    return profile
+
+
+class ProfilerMiddleware(AsyncCapableMiddleware):
+    """Profile the requests carrying a valid staff profile token"""
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+
+        return self.profile(request, self.get_response)
+
+    async def __acall__(self, request):
+        if not request.META.get(PROFILE_HEADER):
+            return await self.get_response(request)
+
+        # The token is checked with a query and the profilers follow a
+        # single thread, so both happen in a worker thread
+        profile = sync_to_async(self.profile, thread_sensitive=False)
+
+        return await profile(request, async_to_sync(self.get_response))
+
+    def profile(self, request, get_response):
+        """Return the response of get_response, profiled when asked to"""
+        token = request.META.get(PROFILE_HEADER)
+        mode = read_token(token) if token else None
+
+        if mode is None:
+            return get_response(request)
+
+        start = time.perf_counter()
+        response, output = profile_call(
+            mode, lambda: get_response(request)
+        )
+        duration = time.perf_counter() - start
+
+        profile = record(mode, request, response, duration, output)
+        response['X-Profile-Id'] = profile.id
+        response['X-Profile-Url'] = reverse(
+            'profiles:profile-download', args=[profile.id]
+        )
+
+        return response
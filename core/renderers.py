@@ -0,0 +1,69 @@
+"""
+JSON renderer encoding with orjson when it is installed.
+
+The output is the same as DRF JSONRenderer's: datetimes, decimals and
+the other types orjson does not encode as DRF does are handed to the
+DRF encoder, and the renders orjson cannot do, indented ones or ones
+escaping non-ASCII characters, fall back to the stdlib json module.
+Only NaN and infinite floats differ, written as null by orjson where
+the stdlib encoder fails with STRICT_JSON.
+"""
+from rest_framework import renderers
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+LINE_SEPARATORS = (
+    (b'\xe2\x80\xa8', b'\\u2028'),
+    (b'\xe2\x80\xa9', b'\\u2029'),
+)
+
+
+def orjson_options():
+    """Return the orjson options encoding like the DRF encoder does"""
+    return orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+
+
+class JSONRenderer(renderers.JSONRenderer):
+    """Renderer which serializes to JSON with orjson when it can"""
+
+    def can_use_orjson(self, accepted_media_type, renderer_context):
+        return (
+            orjson is not None
+            and self.encoder_class is JSONEncoder
+            and not self.ensure_ascii
+            and self.compact
+            and self.get_indent(accepted_media_type, renderer_context) is None
+        )
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        """Render data into JSON, returning a bytestring"""
+        if data is None:
+            return b''
+
+        renderer_context = renderer_context or {}
+        if not self.can_use_orjson(accepted_media_type, renderer_context):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        encoder = self.encoder_class()
+        try:
+            ret = orjson.dumps(
+                data,
+                default=encoder.default,
+                option=orjson_options()
+            )
+        except TypeError:
+            # Out of the range orjson encodes, e.g. very large integers
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # Escaped like JSONRenderer does, as they are valid JSON but not
+        # valid JavaScript
+        for separator, escaped in LINE_SEPARATORS:
+            if separator in ret:
+                ret = ret.replace(separator, escaped)
+
+        return ret
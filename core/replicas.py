@@ -0,0 +1,148 @@
+"""
+Reads of the safe requests from the read replicas.
+
+ReplicaMiddleware lets the reads of GET, HEAD and OPTIONS requests go to
+the DATABASE_REPLICAS aliases, and ReplicaRouter sends them to one at
+random. Everything else reads from the primary: other requests, code
+out of a request, such as management commands, and any query made
+inside a transaction of the primary. Writes, and select_for_update(),
+which Django routes as a write, always go to the primary. So do the
+reads of the responses cached under a generation and of the validators
+of conditional requests, which primary_reads() wraps, as a replica
+lagging behind a write would cache old rows under its new generation.
+
+Replicas lag behind the primary, so a client is pinned to the primary
+for REPLICA_PIN_SECONDS after each of its writes, and reads what it has
+just written. The pin is a signed cookie set on the responses of writes,
+so it holds whichever worker serves the next request, without a cache
+shared by the workers; clients that drop cookies are not pinned.
+"""
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from core.asynchronous import AsyncCapableMiddleware
+
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+PIN_COOKIE = 'replica_pin'
+PIN_SALT = 'core.replicas.pin'
+
+_replica_reads = ContextVar('replica_reads', default=False)
+
+
+def replicas():
+    """Return the aliases of the read replica databases"""
+    return getattr(settings, 'DATABASE_REPLICAS', ())
+
+
+def pin_seconds():
+    return getattr(settings, 'REPLICA_PIN_SECONDS', 5)
+
+
+@contextmanager
+def replica_reads(enabled=True):
+    """Let, or with enabled False forbid, the reads go to the replicas"""
+    token = _replica_reads.set(enabled)
+    try:
+        yield
+    finally:
+        _replica_reads.reset(token)
+
+
+def primary_reads():
+    """Send the reads to the primary"""
+    return replica_reads(False)
+
+
+class ReplicaRouter:
+    """Route the reads allowed by replica_reads() to a random replica"""
+
+    def db_for_read(self, model, **hints):
+        aliases = replicas()
+
+        if (not aliases or not _replica_reads.get()
+                or connections[DEFAULT_DB_ALIAS].in_atomic_block):
+            return DEFAULT_DB_ALIAS
+
+        return random.choice(aliases)
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        """Replicas hold the same rows, so any of them can be related"""
+        aliases = {DEFAULT_DB_ALIAS, *replicas()}
+
+        return obj1._state.db in aliases and obj2._state.db in aliases
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        """Replicas get their schema from the primary"""
+        return db not in replicas()
+
+
+def is_pinned(request):
+    """Return if the request carries a pin cookie younger than the pin"""
+    return request.get_signed_cookie(
+        PIN_COOKIE,
+        default=None,
+        salt=PIN_SALT,
+        max_age=pin_seconds()
+    ) is not None
+
+
+def pin(response):
+    """Pin the client of the response to the primary"""
+    response.set_signed_cookie(
+        PIN_COOKIE,
+        '1',
+        salt=PIN_SALT,
+        max_age=pin_seconds(),
+        secure=settings.SESSION_COOKIE_SECURE,
+        httponly=True,
+        samesite='Lax'
+    )
+
+
+class ReplicaMiddleware(AsyncCapableMiddleware):
+    """
+    Read from the replicas during the safe requests of the clients which
+    did not write in the last REPLICA_PIN_SECONDS, and pin the clients
+    of the other requests to the primary
+    """
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+
+        if not replicas():
+            return self.get_response(request)
+
+        safe = request.method in SAFE_METHODS
+
+        with replica_reads(safe and not is_pinned(request)):
+            response = self.get_response(request)
+
+        if not safe:
+            pin(response)
+
+        return response
+
+    async def __acall__(self, request):
+        if not replicas():
+            return await self.get_response(request)
+
+        safe = request.method in SAFE_METHODS
+
+        # The context of the request is copied into the threads it reads in
+        with replica_reads(safe and not is_pinned(request)):
+            response = await self.get_response(request)
+
+        if not safe:
+            pin(response)
+
+        return response
@@ -0,0 +1,16 @@
+from rest_framework import serializers
+
+from core.middleware import timed_serialization
+
+
+class TimedSerializerMixin:
+    """Serializer whose data is timed as the request serialization"""
+
+    @property
+    def data(self):
+        with timed_serialization():
+            return super().data
+
+
+class TimedListSerializer(TimedSerializerMixin, serializers.ListSerializer):
+    """List serializer whose data is timed as the request serialization"""
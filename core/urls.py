@@ -0,0 +1,26 @@
+from django.urls import path
+
+from core import views as CoreViews
+
+
+app_name = 'profiles'
+
+urlpatterns = [
+    path(
+        '',
+        CoreViews.profile_list,
+        name='profile-list'
+    ),
+
+    path(
+        'token/',
+        CoreViews.profile_token,
+        name='profile-token'
+    ),
+
+    path(
+        '<str:id>/',
+        CoreViews.profile_download,
+        name='profile-download'
+    ),
+]
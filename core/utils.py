@@ -1,11 +1,24 @@
 import random
 import string
 
+from django.utils.text import Truncator, slugify
+
 
 ALPHANUMERIC_CHARS = string.ascii_lowercase + string.digits
 STRING_LENGTH = 6
+EXCERPT_LENGTH = 200
 
 
 def generate_random_string(chars=ALPHANUMERIC_CHARS, length=STRING_LENGTH):
     """Generates a random string of chars in lowercase and numbers"""
     return "".join(random.choice(chars) for _ in range(length))
+
+
+def generate_slug(text):
+    """Generates a slug of the text ended by a random string"""
+    return slugify(text) + "-" + generate_random_string()
+
+
+def generate_excerpt(text, length=EXCERPT_LENGTH):
+    """Generates an excerpt of the text, in a single line"""
+    return Truncator(" ".join(text.split())).chars(length)
@@ -0,0 +1,64 @@
+from django.contrib.admin.views.decorators import staff_member_required
+from django.http import Http404, HttpResponse, JsonResponse
+from django.urls import reverse
+
+from core import profiling
+
+
+def _profile_summary(profile):
+    return {
+        'id': profile.id,
+        'created_at': profile.created_at,
+        'mode': profile.mode,
+        'user': profile.user_id,
+        'method': profile.method,
+        'path': profile.path,
+        'status': profile.status,
+        'duration_ms': profile.duration_ms,
+        'download': reverse('profiles:profile-download', args=[profile.id]),
+    }
+
+
+@staff_member_required
+def profile_list(request):
+    """List the profiles kept in the ring, newest first"""
+    return JsonResponse({
+        'profiles': [
+            _profile_summary(profile) for profile in profiling.profiles.list()
+        ],
+    })
+
+
+@staff_member_required
+def profile_download(request, id):
+    """Download the pstats dump or collapsed stacks of a profile"""
+    profile = profiling.profiles.get(id)
+    if profile is None:
+        raise Http404("No such profile, or it left the ring.")
+
+    response = HttpResponse(
+        profile.artifact,
+        content_type=profile.content_type
+    )
+    response['Content-Disposition'] = 'attachment; filename="%s"' % (
+        profile.filename
+    )
+
+    return response
+
+
+@staff_member_required
+def profile_token(request):
+    """Mint a profile token of the staff user for the requested mode"""
+    mode = request.GET.get('mode', profiling.SAMPLE)
+    if mode not in profiling.MODES:
+        return JsonResponse(
+            {'mode': "Expected one of: %s" % ', '.join(profiling.MODES)},
+            status=400
+        )
+
+    return JsonResponse({
+        'token': profiling.make_token(request.user, mode),
+        'mode': mode,
+        'header': 'X-Profile',
+    })
@@ -2,12 +2,15 @@ from rest_framework import serializers
 
 from django.contrib.auth import get_user_model
 
+from core.serializers import TimedSerializerMixin, TimedListSerializer
 
-class UserSerializer(serializers.ModelSerializer):
+
+class UserSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     """Serializer for the create user object"""
 
     class Meta:
         model = get_user_model()
+        list_serializer_class = TimedListSerializer
         fields = (
             'username',
             'password'
@@ -27,11 +30,12 @@ class UserSerializer(serializers.ModelSerializer):
         return get_user_model().objects.create_user(**validated_data)
 
 
-class DisplayUserSerializer(serializers.ModelSerializer):
+class DisplayUserSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     """Serializer for display user object"""
 
     class Meta:
         model = get_user_model()
+        list_serializer_class = TimedListSerializer
         fields = (
             'username',
             'age',
@@ -0,0 +1,130 @@
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+
+from rest_framework.test import APIClient
+from rest_framework.authtoken.models import Token
+from rest_framework import status
+
+from core.authentication import TokenCache, token_cache
+
+
+ME_URL = reverse('users:user-me')
+LOGOUT_URL = reverse('users:user-logout')
+TOKEN_CACHE_URL = reverse('users:user-token-cache')
+
+
+def create_user(**params):
+    return get_user_model().objects.create_user(**params)
+
+
+class TokenCacheTests(TestCase):
+    """Test the token to user cache"""
+
+    def setUp(self):
+        self.clock = 0
+        self.cache = TokenCache(max_size=2, ttl=10, clock=lambda: self.clock)
+        self.user = create_user(username='testcache', password='testpass')
+        self.token = Token.objects.create(user=self.user)
+
+    def test_cache_hit_returns_new_instances(self):
+        """Test a hit returns a copy of the cached user and token"""
+        self.cache.set(self.token.key, self.user, self.token)
+
+        user, token = self.cache.get(self.token.key)
+
+        self.assertEqual(user, self.user)
+        self.assertIsNot(user, self.user)
+        self.assertEqual(token.key, self.token.key)
+        self.assertIs(token.user, user)
+        self.assertEqual(self.cache.stats()['hits'], 1)
+
+    def test_cache_entries_expire(self):
+        """Test an entry is a miss once its TTL has passed"""
+        self.cache.set(self.token.key, self.user, self.token)
+
+        self.clock = 10
+
+        self.assertIsNone(self.cache.get(self.token.key))
+        self.assertEqual(self.cache.stats()['misses'], 1)
+        self.assertEqual(self.cache.stats()['size'], 0)
+
+    def test_cache_evicts_least_recently_used(self):
+        """Test the cache keeps at most max_size entries"""
+        self.cache.set('a', self.user, self.token)
+        self.cache.set('b', self.user, self.token)
+        self.cache.get('a')
+        self.cache.set('c', self.user, self.token)
+
+        self.assertIsNotNone(self.cache.get('a'))
+        self.assertIsNone(self.cache.get('b'))
+        self.assertIsNotNone(self.cache.get('c'))
+
+    def test_invalidate_user(self):
+        """Test every entry of a user is dropped"""
+        self.cache.set('a', self.user, self.token)
+        self.cache.set('b', self.user, self.token)
+
+        self.cache.invalidate_user(self.user.pk)
+
+        self.assertEqual(self.cache.stats()['size'], 0)
+
+
+class CachedTokenAuthenticationTests(TestCase):
+    """Test the API token authentication through the token cache"""
+
+    def setUp(self):
+        token_cache.clear()
+        self.client = APIClient()
+        self.user = create_user(
+            username='testauth',
+            password='testpassword',
+            age=20
+        )
+        self.token = Token.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + self.token.key)
+
+    def test_cached_token_skips_auth_query(self):
+        """Test a cached token authenticates without querying"""
+        self.client.get(ME_URL)
+
+        with self.assertNumQueries(0):
+            res = self.client.get(ME_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['username'], self.user.username)
+        self.assertEqual(token_cache.stats()['hits'], 1)
+        self.assertEqual(token_cache.stats()['misses'], 1)
+
+    def test_user_update_invalidates_cache(self):
+        """Test the cached user is dropped when the user is saved"""
+        self.client.get(ME_URL)
+
+        self.client.patch(ME_URL, {'age': 30})
+        res = self.client.get(ME_URL)
+
+        self.assertEqual(res.data['age'], 30)
+
+    def test_logout_invalidates_cache(self):
+        """Test a token is no longer accepted after logging out"""
+        self.client.get(ME_URL)
+
+        self.client.post(LOGOUT_URL)
+        res = self.client.get(ME_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertFalse(Token.objects.filter(key=self.token.key).exists())
+
+    def test_token_cache_stats_admin_only(self):
+        """Test the token cache counters are only shown to admins"""
+        res = self.client.get(TOKEN_CACHE_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+
+        self.user.is_staff = True
+        self.user.save()
+        res = self.client.get(TOKEN_CACHE_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertIn('hits', res.data)
+        self.assertIn('misses', res.data)
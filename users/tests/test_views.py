@@ -119,3 +119,17 @@ class PrivateUserAPITest(TestCase):
         self.assertEqual(self.user.username, payload['username'])
         self.assertEqual(self.user.age, payload['age'])
         self.assertEqual(self.user.biography, payload['biography'])
+
+    def test_retrieve_profile_not_modified(self):
+        """Test the profile answers 304 until the user is updated"""
+        res = self.client.get(ME_URL)
+        etag = res['ETag']
+
+        res = self.client.get(ME_URL, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        self.client.patch(ME_URL, {'age': 22})
+
+        res = self.client.get(ME_URL, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['age'], 22)
@@ -1,6 +1,13 @@
 from django.urls import path
 
-from users.views import CreateUserAPIView, RetrieveUpdateUserAPIView
+from rest_framework.authentication import SessionAuthentication
+
+from users.views import (
+    CreateUserAPIView,
+    RetrieveUpdateUserAPIView,
+    TokenCacheStatsAPIView
+)
+from core.authentication import CachedTokenAuthentication
 
 from rest_auth.views import LoginView, LogoutView
 
@@ -22,7 +29,10 @@ urlpatterns = [
 
     path(
         "logout/",
-        LogoutView.as_view(),
+        LogoutView.as_view(authentication_classes=(
+            CachedTokenAuthentication,
+            SessionAuthentication
+        )),
         name="user-logout"
     ),
 
@@ -31,4 +41,10 @@ urlpatterns = [
         RetrieveUpdateUserAPIView.as_view(),
         name="user-me"
     ),
+
+    path(
+        "token-cache/",
+        TokenCacheStatsAPIView.as_view(),
+        name="user-token-cache"
+    ),
 ]
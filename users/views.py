@@ -1,11 +1,19 @@
 from rest_framework import generics
-from rest_framework.authentication import (
-    TokenAuthentication,
-    SessionAuthentication
-)
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from rest_framework.authentication import SessionAuthentication
+from rest_framework.permissions import IsAuthenticated, IsAdminUser
 
 from users.serializers import UserSerializer, DisplayUserSerializer
+from core.authentication import CachedTokenAuthentication, token_cache
+from core.conditional import conditional
+
+
+def user_validators(request, *args, **kwargs):
+    """Return the displayed fields of the authenticated user"""
+    user = request.user
+
+    return (user.username, user.age, user.biography), None
 
 
 class CreateUserAPIView(generics.CreateAPIView):
@@ -16,9 +24,24 @@ class CreateUserAPIView(generics.CreateAPIView):
 class RetrieveUpdateUserAPIView(generics.RetrieveUpdateAPIView):
     """Retrieve and update user view"""
     serializer_class = DisplayUserSerializer
-    authentication_classes = (TokenAuthentication, SessionAuthentication)
+    authentication_classes = (CachedTokenAuthentication, SessionAuthentication)
     permission_classes = (IsAuthenticated,)
 
     def get_object(self):
         """Retrieve and return authenticated user"""
         return self.request.user
+
+    @conditional(user_validators)
+    def retrieve(self, request, *args, **kwargs):
+        """Retrieve the authenticated user"""
+        return super().retrieve(request, *args, **kwargs)
+
+
+class TokenCacheStatsAPIView(APIView):
+    """Retrieve the token cache counters of this process"""
+    authentication_classes = (CachedTokenAuthentication, SessionAuthentication)
+    permission_classes = (IsAdminUser,)
+
+    def get(self, request):
+        """Retrieve token cache hits, misses and size"""
+        return Response(token_cache.stats())